@@ -4,12 +4,19 @@ Flask app pentru UI de clasificare text
 """
 
 import os
+import io
 import sys
 import json
 import pickle
+import hashlib
+import hmac
+import functools
 import time
-from flask import Flask, render_template, request, jsonify
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 from werkzeug.utils import secure_filename
+from werkzeug.wsgi import get_input_stream
 import pandas as pd
 
 # Import pentru citirea PDF-urilor
@@ -33,11 +40,59 @@ from preprocessing import TextPreprocessor, prepare_data_for_training
 from naive_bayes import NaiveBayesClassifier
 from svm_classifier import SVMClassifier
 from random_forest import RandomForestTextClassifier
+from inference_pipeline import InferencePipeline, ModelsUnavailableError, MODEL_WRAPPERS
+from forest_engine import CompactForest
+from cascade import DEFAULT_THRESHOLDS
+from micro_batching import MicroBatcher
+from prediction_cache import PredictionCache, prediction_cache_key
+from model_bundle import current_bundle_dir, load_bundle
+from model_watcher import ModelWatcher
+from stream_parsing import RowStreamParser, detect_format
+from bulk_jobs import (JobRunner, RESULT_FORMATS, cancel_job, create_job, iter_job_results, job_dir, job_status,
+                       list_jobs, new_upload_path, save_upload)
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['ALLOWED_EXTENSIONS'] = {'txt', 'csv', 'json', 'pdf'}
+app.config['MAX_BATCH_SIZE'] = 10000  # numarul maxim de documente per cerere /api/predict/batch
+# Micro-batching optional pentru cereri /api/predict concurente
+app.config['MICRO_BATCH_ENABLED'] = os.environ.get('MICRO_BATCH_ENABLED', '0') == '1'
+app.config['MICRO_BATCH_WINDOW_MS'] = float(os.environ.get('MICRO_BATCH_WINDOW_MS', '2'))
+app.config['MICRO_BATCH_MAX_SIZE'] = int(os.environ.get('MICRO_BATCH_MAX_SIZE', '32'))
+# Cache pentru rezultate (cheie: textul preprocesat + versiunea modelelor)
+app.config['PREDICTION_CACHE_ENABLED'] = os.environ.get('PREDICTION_CACHE_ENABLED', '1') == '1'
+app.config['PREDICTION_CACHE_MAX_ENTRIES'] = int(os.environ.get('PREDICTION_CACHE_MAX_ENTRIES', '10000'))
+app.config['PREDICTION_CACHE_TTL_SECONDS'] = float(os.environ.get('PREDICTION_CACHE_TTL_SECONDS', '3600'))
+app.config['PREDICTION_MODES'] = ('all', 'cascade')  # 'cascade': NB intai, SVM/RF doar daca nu e sigur
+# Scorarea modelelor in paralel pe un thread pool partajat (0 = modelele ruleaza unul dupa altul)
+app.config['MODEL_THREADS'] = int(os.environ.get('MODEL_THREADS', '0'))
+# Bugetul implicit de latenta per cerere in milisecunde (gol = fara buget); poate fi dat si per cerere (budget_ms)
+app.config['PREDICTION_BUDGET_MS'] = float(os.environ['PREDICTION_BUDGET_MS']) if os.environ.get('PREDICTION_BUDGET_MS') else None
+# Verificarea checksum-urilor bundle-ului de modele la incarcare (models/bundles/CURRENT)
+app.config['MODEL_BUNDLE_VERIFY'] = os.environ.get('MODEL_BUNDLE_VERIFY', '1') == '1'
+# Modelele incarcate la pornire ('all' sau lista separata prin virgula); celelalte se incarca la prima folosire
+app.config['PRELOAD_MODELS'] = os.environ.get('PRELOAD_MODELS', '')
+# Reincarcarea automata a modelelor: intervalul de verificare a directorului models/ in secunde (0 = dezactivata)
+app.config['MODEL_WATCH_INTERVAL'] = float(os.environ.get('MODEL_WATCH_INTERVAL', '0'))
+# Upload in stream (/api/upload/stream): randuri clasificate per batch, lungimea maxima a unui rand,
+# dimensiunea bucatilor citite din cerere; dimensiunea fisierului nu este limitata (memoria ramane constanta)
+app.config['STREAM_BATCH_SIZE'] = int(os.environ.get('STREAM_BATCH_SIZE', '256'))
+app.config['STREAM_MAX_RECORD_BYTES'] = int(os.environ.get('STREAM_MAX_RECORD_BYTES', str(1024 * 1024)))
+app.config['STREAM_CHUNK_SIZE'] = 64 * 1024
+# Joburi de clasificare in masa (/api/jobs): directorul cu arhive, rezultate si checkpoint-uri (disc local),
+# batch-urile procesate in paralel (0 = joburile nu ruleaza in acest proces), documente per batch,
+# dimensiunea maxima a unei arhive, intervalul la care sunt cautate joburi noi (secunde) si cat timp
+# raman rezultatele unui job terminat (secunde, 0 = pastrate oricat)
+app.config['JOBS_FOLDER'] = os.environ.get('JOBS_FOLDER', 'jobs')
+app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', '2'))
+app.config['JOB_BATCH_SIZE'] = int(os.environ.get('JOB_BATCH_SIZE', '256'))
+app.config['JOB_MAX_ARCHIVE_BYTES'] = int(os.environ.get('JOB_MAX_ARCHIVE_BYTES', str(4 * 1024 ** 3)))
+app.config['JOB_POLL_INTERVAL'] = float(os.environ.get('JOB_POLL_INTERVAL', '2'))
+app.config['JOB_RETENTION_SECONDS'] = float(os.environ.get('JOB_RETENTION_SECONDS', str(7 * 24 * 3600)))
+# Token pentru /api/admin/reload (header X-Admin-Token); fara token endpoint-ul este dezactivat
+# (adresa clientului nu este o dovada: in spatele unui reverse proxy toate cererile par locale)
+app.config['ADMIN_TOKEN'] = os.environ.get('ADMIN_TOKEN') or None
 
 # Creeaza directorul pentru uploads
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -46,6 +101,49 @@ os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 models = {}
 vectorizer = None
 category_names = []
+pipeline = None  # Pipeline-ul activ (vectorizer + modele + categorii); inlocuit atomic la reincarcare
+micro_batcher = None  # Grupeaza cererile concurente (daca MICRO_BATCH_ENABLED)
+prediction_cache = None  # Cache LRU/TTL pentru rezultate (daca PREDICTION_CACHE_ENABLED)
+scoring_executor = None  # Thread pool persistent pentru scorarea modelelor (daca MODEL_THREADS > 0)
+model_watcher = None  # Supravegheaza directorul models/ (daca MODEL_WATCH_INTERVAL > 0)
+reload_lock = threading.Lock()  # O singura incarcare de modele odata
+job_runner = None  # Ruleaza joburile de clasificare in masa (un singur proces odata, lock pe disc)
+
+
+# Mapping complet pentru categorii (prioritate pentru mapping-uri complete)
+FULL_CATEGORY_MAP = {
+    'alt.atheism': 'Ateism',
+    'comp.graphics': 'Tehnologie - Grafică',
+    'comp.os.ms-windows.misc': 'Tehnologie - Windows',
+    'comp.sys.ibm.pc.hardware': 'Tehnologie - PC Hardware',
+    'comp.sys.mac.hardware': 'Tehnologie - Mac Hardware',
+    'comp.windows.x': 'Tehnologie - Windows X',
+    'misc.forsale': 'Vânzări',
+    'rec.autos': 'Auto',
+    'rec.motorcycles': 'Motociclete',
+    'rec.sport.baseball': 'Sport - Baseball',
+    'rec.sport.hockey': 'Sport - Hockey',
+    'sci.crypt': 'Stiinta - Criptografie',
+    'sci.electronics': 'Stiinta - Electronica',
+    'sci.med': 'Stiinta - Medicina',
+    'sci.space': 'Stiinta - Spatiu',
+    'soc.religion.christian': 'Religie - Crestinism',
+    'talk.politics.guns': 'Politică - Arme',
+    'talk.politics.mideast': 'Politică - Orientul Mijlociu',
+    'talk.politics.misc': 'Politică - Diverse',
+    'talk.religion.misc': 'Religie - Diverse'
+}
+
+# Mapping pentru prefixe principale
+PREFIX_MAP = {
+    'alt': 'Alte',
+    'comp': 'Tehnologie',
+    'misc': 'Diverse',
+    'rec': 'Recreere',
+    'sci': 'Stiinta',
+    'soc': 'Social',
+    'talk': 'Discuții'
+}
 
 
 def allowed_file(filename):
@@ -59,7 +157,7 @@ def extract_text_from_pdf(filepath):
     Extrage textul dintr-un fisier PDF
     
     Args:
-        filepath: Calea catre fisierul PDF
+        filepath: Calea catre fisierul PDF sau un fisier binar deschis (ex: io.BytesIO)
         
     Returns:
         Textul extras din PDF
@@ -68,10 +166,9 @@ def extract_text_from_pdf(filepath):
     
     try:
         if PDF_LIBRARY == 'PyPDF2':
-            with open(filepath, 'rb') as f:
-                pdf_reader = PyPDF2.PdfReader(f)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
+            pdf_reader = PyPDF2.PdfReader(filepath)
+            for page in pdf_reader.pages:
+                text += page.extract_text() + "\n"
         
         elif PDF_LIBRARY == 'pdfplumber':
             with pdfplumber.open(filepath) as pdf:
@@ -96,54 +193,19 @@ def format_category_name(category):
     Returns:
         Numele formatat (ex: 'Sport - Hockey')
     """
-    # Mapping complet pentru categorii (prioritate pentru mapping-uri complete)
-    full_category_map = {
-        'alt.atheism': 'Ateism',
-        'comp.graphics': 'Tehnologie - Grafică',
-        'comp.os.ms-windows.misc': 'Tehnologie - Windows',
-        'comp.sys.ibm.pc.hardware': 'Tehnologie - PC Hardware',
-        'comp.sys.mac.hardware': 'Tehnologie - Mac Hardware',
-        'comp.windows.x': 'Tehnologie - Windows X',
-        'misc.forsale': 'Vânzări',
-        'rec.autos': 'Auto',
-        'rec.motorcycles': 'Motociclete',
-        'rec.sport.baseball': 'Sport - Baseball',
-        'rec.sport.hockey': 'Sport - Hockey',
-        'sci.crypt': 'Stiinta - Criptografie',
-        'sci.electronics': 'Stiinta - Electronica',
-        'sci.med': 'Stiinta - Medicina',
-        'sci.space': 'Stiinta - Spatiu',
-        'soc.religion.christian': 'Religie - Crestinism',
-        'talk.politics.guns': 'Politică - Arme',
-        'talk.politics.mideast': 'Politică - Orientul Mijlociu',
-        'talk.politics.misc': 'Politică - Diverse',
-        'talk.religion.misc': 'Religie - Diverse'
-    }
-    
     # Verifică dacă există mapping complet
-    if category in full_category_map:
-        return full_category_map[category]
+    if category in FULL_CATEGORY_MAP:
+        return FULL_CATEGORY_MAP[category]
     
     # Dacă nu există mapping complet, formatează manual
     parts = category.split('.')
     
-    # Mapping pentru prefixe principale
-    prefix_map = {
-        'alt': 'Alte',
-        'comp': 'Tehnologie',
-        'misc': 'Diverse',
-        'rec': 'Recreere',
-        'sci': 'Stiinta',
-        'soc': 'Social',
-        'talk': 'Discuții'
-    }
-    
     if len(parts) >= 2:
         prefix = parts[0]
         suffix_parts = parts[1:]
         
         # Formateaza prefixul
-        prefix_name = prefix_map.get(prefix, prefix.capitalize())
+        prefix_name = PREFIX_MAP.get(prefix, prefix.capitalize())
         
         # Formateaza sufixul
         if len(suffix_parts) == 1:
@@ -158,12 +220,226 @@ def format_category_name(category):
     return category.replace('.', ' ').replace('-', ' ').title()
 
 
-def load_models():
-    """Incarca modelele antrenate"""
-    global models, vectorizer, category_names
+def compute_model_version(models_dir):
+    """
+    Calculeaza versiunea setului de modele din numele, dimensiunea si data fisierelor
     
-    base_dir = os.path.dirname(__file__)
-    models_dir = os.path.join(base_dir, 'models')
+    Args:
+        models_dir: Directorul cu modelele
+        
+    Returns:
+        Versiunea (12 caractere hexazecimale)
+    """
+    digest = hashlib.sha256()
+    for root, _, files in sorted(os.walk(models_dir)):
+        for filename in sorted(files):
+            path = os.path.join(root, filename)
+            stat = os.stat(path)
+            digest.update(f'{os.path.relpath(path, models_dir)}:{stat.st_size}:{stat.st_mtime_ns}\n'.encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+def pickled_model_loaders(models_dir):
+    """
+    Functiile de incarcare pentru modelele salvate ca pickle (doar pentru fisierele existente)
+    
+    Args:
+        models_dir: Directorul cu modelele
+        
+    Returns:
+        Dictionar {nume_algoritm: functie -> model}
+    """
+    def pickle_loader(path):
+        def load():
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        return load
+    
+    loaders = {}
+    for name in ('naive_bayes', 'svm'):
+        path = os.path.join(models_dir, f'{name}.pkl')
+        if os.path.exists(path):
+            loaders[name] = pickle_loader(path)
+    
+    # Random Forest: prefera formatul compact (memory-mapped, fara thread pool per cerere)
+    rf_compact_dir = os.path.join(models_dir, 'random_forest_compact')
+    rf_path = os.path.join(models_dir, 'random_forest.pkl')
+    if os.path.isdir(rf_compact_dir):
+        loaders['random_forest'] = lambda: CompactForest.load(rf_compact_dir, mmap=True)
+    elif os.path.exists(rf_path):
+        loaders['random_forest'] = pickle_loader(rf_path)
+    
+    return loaders
+
+
+def load_pickled_models(models_dir):
+    """
+    Incarca vectorizer-ul si categoriile din fisierele pickle (format vechi, fara bundle);
+    modelele sunt incarcate la prima folosire
+    
+    Args:
+        models_dir: Directorul cu modelele
+        
+    Returns:
+        (vectorizer, model_loaders, category_names, token_table)
+    """
+    base_dir = os.path.dirname(models_dir)
+    
+    # Incarca vectorizer
+    with open(os.path.join(models_dir, 'vectorizer.pkl'), 'rb') as f:
+        loaded_vectorizer = pickle.load(f)
+    
+    # Incarca numele categoriilor
+    with open(os.path.join(base_dir, 'data', 'processed', 'category_mapping.json'), 'r', encoding='utf-8') as f:
+        category_mapping = json.load(f)
+        id_to_name = {v: k for k, v in category_mapping.items()}
+        loaded_category_names = [id_to_name[i] for i in sorted(id_to_name.keys())]
+    
+    # Incarca tabela token -> stem (optionala; fara ea se face stemming la fiecare cerere)
+    token_table = None
+    token_table_path = os.path.join(models_dir, 'token_table.pkl')
+    if os.path.exists(token_table_path):
+        with open(token_table_path, 'rb') as f:
+            token_table = pickle.load(f)
+    
+    return loaded_vectorizer, pickled_model_loaders(models_dir), loaded_category_names, token_table
+
+
+def get_models_dir():
+    return os.path.join(os.path.dirname(__file__), 'models')
+
+
+def disk_model_version(models_dir):
+    """
+    Versiunea setului de modele de pe disc (fara sa il incarce)
+    
+    Returns:
+        Versiunea bundle-ului activ (models/bundles/CURRENT) sau, fara bundle, compute_model_version
+    """
+    bundle_dir = current_bundle_dir(os.path.join(models_dir, 'bundles'))
+    if bundle_dir is not None:
+        return os.path.basename(bundle_dir)
+    return compute_model_version(models_dir)
+
+
+def build_pipeline(models_dir, preload=None):
+    """
+    Incarca un set de modele si construieste pipeline-ul incalzit, fara sa modifice
+    starea globala (pipeline-ul activ continua sa serveasca cereri in timpul incarcarii)
+    
+    Args:
+        models_dir: Directorul cu modelele
+        preload: Modelele incarcate acum (None = toate); celelalte se incarca la prima folosire
+        
+    Returns:
+        InferencePipeline gata de folosit
+    """
+    bundle_dir = current_bundle_dir(os.path.join(models_dir, 'bundles'))
+    tuned = None
+    if bundle_dir is not None:
+        # Bundle versionat: vectori .npy mapati in memorie, fara pickle
+        bundle = load_bundle(bundle_dir, mmap=True, verify=app.config['MODEL_BUNDLE_VERIFY'], models=[])
+        loaded_vectorizer = bundle.vectorizer
+        model_loaders = {name: functools.partial(bundle.load_model, name) for name in bundle.model_names}
+        loaded_category_names, token_table = bundle.category_names, bundle.token_table
+        model_version = bundle.version
+        # Pragurile cascadei fac parte din bundle, ca sa fie comutate odata cu modelele
+        tuned = bundle.manifest.get('metadata', {}).get('cascade_thresholds')
+    else:
+        # Versiunea se calculeaza inainte de citire: o rescriere in timpul incarcarii va declansa alta
+        model_version = compute_model_version(models_dir)
+        loaded_vectorizer, model_loaders, loaded_category_names, token_table = load_pickled_models(models_dir)
+    
+    # Pragurile cascadei ajustate pe setul de test (daca exista)
+    info_path = os.path.join(models_dir, 'training_info.json')
+    if tuned is None and os.path.exists(info_path):
+        with open(info_path, 'r', encoding='utf-8') as f:
+            tuned = json.load(f).get('cascade', {}).get('thresholds')
+    
+    # Construieste pipeline-ul de inferenta si il incalzeste inainte de a raporta ca e gata
+    new_pipeline = InferencePipeline(
+        loaded_vectorizer,
+        {},
+        loaded_category_names,
+        display_names=[format_category_name(cat) for cat in loaded_category_names],
+        preprocessor=TextPreprocessor(use_stemming=True, use_stopwords=True, token_table=token_table),
+        version=model_version,
+        executor=scoring_executor,
+        cascade_thresholds=tuned,
+        model_loaders=model_loaders
+    )
+    new_pipeline.ensure_models(preload)
+    new_pipeline.warmup()
+    return new_pipeline
+
+
+def preload_model_names():
+    """Modelele din PRELOAD_MODELS (None = toate)"""
+    setting = app.config['PRELOAD_MODELS'].strip()
+    if setting == 'all':
+        return None
+    return [name.strip() for name in setting.split(',') if name.strip()]
+
+
+def activate_pipeline(new_pipeline):
+    """
+    Face pipeline-ul nou activ dintr-o singura atribuire
+    Cererile citesc `pipeline` o singura data, la inceput: cele in curs termina pe setul vechi,
+    cele noi vad vectorizer-ul, modelele si categoriile noi impreuna
+    """
+    global models, vectorizer, category_names, pipeline
+    
+    pipeline = new_pipeline
+    # Aliasuri pastrate pentru compatibilitate (doar informative; cererile folosesc pipeline)
+    models, vectorizer, category_names = new_pipeline.models, new_pipeline.vectorizer, new_pipeline.category_names
+
+
+def reload_models(force=False):
+    """
+    Reincarca modelele de pe disc in fundal si le activeaza atomic
+    
+    Args:
+        force: Reincarca si daca versiunea de pe disc este cea activa
+        
+    Returns:
+        Dictionar cu 'reloaded', 'model_version', 'previous_version' si 'load_time'
+    """
+    with reload_lock:
+        models_dir = get_models_dir()
+        previous_version = pipeline.version if pipeline is not None else None
+        if not force and disk_model_version(models_dir) == previous_version:
+            return {'reloaded': False, 'model_version': previous_version, 'previous_version': previous_version}
+        
+        # Modelele deja folosite de setul vechi sunt incarcate si in cel nou, inainte de comutare
+        preload = preload_model_names()
+        if preload is not None and pipeline is not None:
+            preload = list(dict.fromkeys(preload + list(pipeline.models)))
+        
+        load_start = time.time()
+        new_pipeline = build_pipeline(models_dir, preload)
+        activate_pipeline(new_pipeline)
+        load_time = time.time() - load_start
+    
+    print(f"Modele reincarcate: {previous_version} -> {new_pipeline.version} ({load_time * 1000:.1f}ms)")
+    return {
+        'reloaded': True,
+        'model_version': new_pipeline.version,
+        'previous_version': previous_version,
+        'load_time': load_time
+    }
+
+
+def load_models(start_workers=True):
+    """
+    Incarca modelele antrenate
+    
+    Args:
+        start_workers: Porneste si thread-urile de fundal (micro-batcher, thread pool); serve.py le
+            porneste separat in fiecare worker, pentru ca thread-urile nu supravietuiesc unui fork
+    """
+    global prediction_cache
+    
+    models_dir = get_models_dir()
     
     # Verifica daca modelele exista
     if not os.path.exists(models_dir):
@@ -171,103 +447,904 @@ def load_models():
         return False
     
     try:
-        # Incarca vectorizer
-        with open(os.path.join(models_dir, 'vectorizer.pkl'), 'rb') as f:
-            vectorizer = pickle.load(f)
-        
-        # Incarca modelele
-        with open(os.path.join(models_dir, 'naive_bayes.pkl'), 'rb') as f:
-            models['naive_bayes'] = pickle.load(f)
-        
-        with open(os.path.join(models_dir, 'svm.pkl'), 'rb') as f:
-            models['svm'] = pickle.load(f)
+        load_start = time.time()
+        with reload_lock:
+            activate_pipeline(build_pipeline(models_dir, preload_model_names()))
         
-        with open(os.path.join(models_dir, 'random_forest.pkl'), 'rb') as f:
-            models['random_forest'] = pickle.load(f)
+        if app.config['PREDICTION_CACHE_ENABLED'] and prediction_cache is None:
+            prediction_cache = PredictionCache(
+                max_entries=app.config['PREDICTION_CACHE_MAX_ENTRIES'],
+                ttl_seconds=app.config['PREDICTION_CACHE_TTL_SECONDS']
+            )
         
-        # Incarca numele categoriilor
-        with open(os.path.join(base_dir, 'data', 'processed', 'category_mapping.json'), 'r', encoding='utf-8') as f:
-            category_mapping = json.load(f)
-            id_to_name = {v: k for k, v in category_mapping.items()}
-            category_names = [id_to_name[i] for i in sorted(id_to_name.keys())]
+        if start_workers:
+            start_background_workers()
         
-        print("Modele incarcate cu succes!")
+        print(f"Modele incarcate cu succes! Versiune {pipeline.version} ({(time.time() - load_start) * 1000:.1f}ms)")
         return True
     except Exception as e:
         print(f"Eroare la incarcarea modelelor: {e}")
         return False
 
 
-def predict_text(text):
-    """Face predictii pentru un text folosind toti algoritmii"""
-    if vectorizer is None or len(models) == 0:
+def start_background_workers(start_jobs=True):
+    """
+    Porneste thread pool-ul de scorare, micro-batcher-ul, supravegherea modelelor si runner-ul de joburi
+    (daca sunt activate)
+    
+    Args:
+        start_jobs: Porneste si runner-ul de joburi (procesele din pool-ul ASGI nu il pornesc)
+    """
+    global scoring_executor, micro_batcher, model_watcher
+    
+    # Thread pool creat o singura data si refolosit de toate cererile
+    if app.config['MODEL_THREADS'] > 0 and scoring_executor is None:
+        scoring_executor = ThreadPoolExecutor(
+            max_workers=app.config['MODEL_THREADS'],
+            thread_name_prefix='model-scoring'
+        )
+    if pipeline is not None:
+        pipeline.executor = scoring_executor
+    
+    if app.config['MICRO_BATCH_ENABLED'] and micro_batcher is None:
+        micro_batcher = MicroBatcher(
+            predict_texts,
+            window_ms=app.config['MICRO_BATCH_WINDOW_MS'],
+            max_batch_size=app.config['MICRO_BATCH_MAX_SIZE']
+        )
+    
+    if app.config['MODEL_WATCH_INTERVAL'] > 0 and model_watcher is None:
+        model_watcher = ModelWatcher(
+            lambda: disk_model_version(get_models_dir()),
+            lambda: pipeline.version if pipeline is not None else None,
+            reload_models,
+            interval=app.config['MODEL_WATCH_INTERVAL']
+        )
+    
+    if start_jobs:
+        start_job_runner()
+
+
+def start_job_runner(process_batch=None):
+    """
+    Porneste runner-ul de joburi (o singura data per proces)
+    
+    Args:
+        process_batch: Functie (members, models) -> (rezultate, versiune); implicit batch-urile
+            sunt clasificate in procesul curent (job_batch_results)
+    """
+    global job_runner
+    
+    if app.config['JOB_WORKERS'] > 0 and job_runner is None:
+        job_runner = JobRunner(
+            app.config['JOBS_FOLDER'],
+            process_batch or job_batch_results,
+            workers=app.config['JOB_WORKERS'],
+            batch_size=app.config['JOB_BATCH_SIZE'],
+            poll_interval=app.config['JOB_POLL_INTERVAL'],
+            retention_seconds=app.config['JOB_RETENTION_SECONDS'] or None
+        ).start()
+
+
+def predict_text(text, mode='all', thresholds=None, budget_ms=None, current_pipeline=None, model_names=None):
+    """
+    Face predictii pentru un text
+    
+    Args:
+        text: Textul de clasificat
+        mode: 'all' (toti algoritmii) sau 'cascade' (NB, apoi SVM/RF doar daca nu e sigur)
+        thresholds: Praguri de marja pentru cascada (peste cele implicite)
+        budget_ms: Bugetul de latenta; modelele care nu ar incapea sunt marcate ca sarite
+        current_pipeline: Pipeline-ul folosit (implicit cel activ); cererea ramane pe el
+            chiar daca modelele sunt reincarcate intre timp
+        model_names: Modelele folosite (implicit toate cele disponibile; incarcate la prima folosire)
+        
+    Returns:
+        (results, performance_metrics) sau None daca modelele nu sunt incarcate
+    """
+    current_pipeline = current_pipeline or pipeline
+    if current_pipeline is None:
+        return None
+    
+    total_start = time.time()
+    if budget_ms is None:
+        budget_ms = app.config['PREDICTION_BUDGET_MS']
+    deadline = total_start + budget_ms / 1000 if budget_ms is not None else None
+    
+    if mode == 'cascade':
+        thresholds = dict(current_pipeline.cascade_thresholds, **(thresholds or {}))
+    
+    if prediction_cache is None:
+        results, performance_metrics = compute_prediction(
+            current_pipeline, text, mode, thresholds, deadline=deadline, model_names=model_names
+        )
+        return results, add_budget_metrics(performance_metrics, budget_ms, total_start)
+    
+    # Cheia se calculeaza pe textul preprocesat: variatiile de formatare dau acelasi rezultat
+    document = current_pipeline.preprocess(text)
+    preprocessing_time = time.time() - total_start
+    # Modul si pragurile fac parte din cheie: cascada poate returna mai putini algoritmi
+    version = current_pipeline.version
+    if mode == 'cascade':
+        version = f"{version}:cascade:{json.dumps(thresholds, sort_keys=True)}"
+    if model_names is not None:
+        version = f"{version}:models:{','.join(model_names)}"
+    key = prediction_cache_key(document, version)
+    
+    if deadline is None:
+        (results, computed_metrics), status = prediction_cache.get_or_compute(
+            key, lambda: compute_prediction(current_pipeline, text, mode, thresholds, document, model_names=model_names)
+        )
+    else:
+        # Cu buget: nu se asteapta dupa calculele altor cereri, iar rezultatele partiale nu intra in cache
+        cached = prediction_cache.get(key)
+        if cached is not None:
+            (results, computed_metrics), status = cached, 'hit'
+        else:
+            results, computed_metrics = compute_prediction(
+                current_pipeline, text, mode, thresholds, document, deadline, model_names
+            )
+            status = 'miss'
+            if not any(result.get('skipped') for result in results.values()) \
+                    and not computed_metrics.get('cascade', {}).get('budget_exhausted'):
+                prediction_cache.put(key, (results, computed_metrics))
+    
+    if status == 'hit':
+        # Fara vectorizare si fara modele
+        performance_metrics = {
+            'preprocessing_time': preprocessing_time,
+            'vectorization_time': 0,
+            'total_time': 0,
+            'algorithms': {}
+        }
+        if 'cascade' in computed_metrics:
+            performance_metrics['cascade'] = computed_metrics['cascade']
+    else:
+        performance_metrics = dict(computed_metrics)
+        # Textul a fost preprocesat aici (pentru cheie), nu in pipeline
+        performance_metrics['preprocessing_time'] = preprocessing_time
+    performance_metrics['cache'] = status
+    performance_metrics['model_version'] = current_pipeline.version
+    
+    return results, add_budget_metrics(performance_metrics, budget_ms, total_start)
+
+
+def compute_prediction(current_pipeline, text, mode='all', thresholds=None, document=None, deadline=None,
+                       model_names=None):
+    """Calculeaza predictia (modul 'all' cu toate modelele si fara buget prin micro-batcher, daca este activ)"""
+    if mode == 'cascade':
+        return current_pipeline.predict_cascade(
+            text, thresholds, document=document, deadline=deadline, models=model_names
+        )
+    
+    # Cererile cu buget sau cu modele alese nu asteapta in fereastra batcher-ului
+    if micro_batcher is not None and deadline is None and model_names is None:
+        return micro_batcher.submit(text, current_pipeline, document)
+    
+    return current_pipeline.predict(text, deadline=deadline, document=document, models=model_names)
+
+
+def add_budget_metrics(performance_metrics, budget_ms, total_start):
+    """Completeaza timpul total si, daca exista buget, cat din el a fost folosit"""
+    performance_metrics['total_time'] = time.time() - total_start
+    if budget_ms is not None:
+        performance_metrics['budget_ms'] = budget_ms
+        performance_metrics['budget_exceeded'] = performance_metrics['total_time'] * 1000 > budget_ms
+    return performance_metrics
+
+
+def parse_budget(values):
+    """
+    Extrage bugetul de latenta (budget_ms) din parametrii cererii
+    
+    Args:
+        values: Dictionar cu parametrii cererii
+        
+    Returns:
+        Bugetul in milisecunde sau None
+    """
+    budget_ms = values.get('budget_ms')
+    if budget_ms in (None, ''):
+        return None
+    try:
+        budget_ms = float(budget_ms)
+    except (TypeError, ValueError):
+        raise ValueError('budget_ms trebuie sa fie un numar')
+    if budget_ms <= 0:
+        raise ValueError('budget_ms trebuie sa fie pozitiv')
+    return budget_ms
+
+
+def parse_prediction_mode(values):
+    """
+    Extrage modul de predictie si pragurile cascadei din parametrii cererii
+    
+    Args:
+        values: Dictionar cu parametrii (JSON pentru /api/predict, formular pentru /api/upload)
+        
+    Returns:
+        (mode, thresholds)
+    """
+    mode = values.get('mode') or 'all'
+    if mode not in app.config['PREDICTION_MODES']:
+        raise ValueError(f"Mod necunoscut: {mode} (permise: {', '.join(app.config['PREDICTION_MODES'])})")
+    
+    thresholds = values.get('thresholds')
+    if thresholds in (None, ''):
+        thresholds = {}
+    elif isinstance(thresholds, str):
+        try:
+            thresholds = json.loads(thresholds)
+        except json.JSONDecodeError:
+            raise ValueError('Pragurile nu sunt un JSON valid')
+    if not isinstance(thresholds, dict):
+        raise ValueError('Pragurile trebuie sa fie un obiect {algoritm: prag}')
+    # Doar etapele care au prag (ultima etapa a cascadei nu are)
+    unknown = [name for name in thresholds if name not in DEFAULT_THRESHOLDS]
+    if unknown:
+        raise ValueError(f"Praguri necunoscute: {', '.join(map(str, unknown))} "
+                         f"(permise: {', '.join(DEFAULT_THRESHOLDS)})")
+    
+    # Si campuri separate: nb_threshold / svm_threshold
+    thresholds = dict(thresholds)
+    for name, field in (('naive_bayes', 'nb_threshold'), ('svm', 'svm_threshold')):
+        if values.get(field) not in (None, ''):
+            thresholds[name] = values.get(field)
+    
+    try:
+        thresholds = {name: float(value) for name, value in thresholds.items()}
+    except (TypeError, ValueError):
+        raise ValueError('Pragurile trebuie sa fie numere')
+    
+    return mode, thresholds
+
+
+def parse_model_selection(values, current_pipeline):
+    """
+    Extrage modelele alese (models) din parametrii cererii
+    
+    Args:
+        values: Dictionar cu parametrii; 'models' este o lista, un JSON sau nume separate prin virgula
+        current_pipeline: Pipeline-ul cererii (pentru modelele disponibile)
+        
+    Returns:
+        Lista de modele in ordinea din raspuns sau None (toate modelele disponibile)
+    """
+    selected = values.get('models')
+    if selected in (None, '', []) or current_pipeline is None:
         return None
+    if isinstance(selected, str):
+        selected = json.loads(selected) if selected.strip().startswith('[') else selected.split(',')
+    if not isinstance(selected, list) or not all(isinstance(name, str) for name in selected):
+        raise ValueError('models trebuie sa fie o lista de nume de algoritmi')
     
-    performance_metrics = {
-        'preprocessing_time': 0,
-        'vectorization_time': 0,
-        'total_time': 0,
-        'algorithms': {}
+    selected = {name.strip() for name in selected}
+    unknown = sorted(selected - set(MODEL_WRAPPERS))
+    if unknown:
+        raise ValueError(f"Algoritmi necunoscuti: {', '.join(unknown)} (permisi: {', '.join(MODEL_WRAPPERS)})")
+    unavailable = sorted(selected - set(current_pipeline.available_models))
+    if unavailable:
+        raise ValueError(f"Modele indisponibile: {', '.join(unavailable)} "
+                         f"(disponibile: {', '.join(current_pipeline.available_models)})")
+    return [name for name in current_pipeline.available_models if name in selected]
+
+
+def predict_texts(texts, current_pipeline=None, documents=None):
+    """
+    Face predictii pentru mai multe texte intr-un singur batch
+    
+    Args:
+        texts: Lista de texte
+        current_pipeline: Pipeline-ul folosit (implicit cel activ)
+        documents: Textele deja preprocesate (optional; None pentru cele nepreprocesate)
+    
+    Returns:
+        (lista de results, performance_metrics) sau None daca modelele nu sunt incarcate
+    """
+    current_pipeline = current_pipeline or pipeline
+    if current_pipeline is None:
+        return None
+    
+    return current_pipeline.predict_batch(texts, documents)
+
+
+def parse_batch_request():
+    """
+    Extrage lista de texte din cererea batch curenta (Flask)
+    
+    Returns:
+        Lista de texte
+    """
+    return parse_batch_payload(request.mimetype, request.get_data())
+
+
+def parse_batch_payload(mimetype, body):
+    """
+    Extrage lista de texte dintr-o cerere batch
+    Accepta JSON ({"texts": [...]} sau o lista) ori NDJSON (un text sau {"text": ...} pe linie)
+    
+    Args:
+        mimetype: Tipul continutului cererii
+        body: Corpul cererii (bytes)
+        
+    Returns:
+        Lista de texte
+    """
+    if mimetype in ('application/x-ndjson', 'application/jsonl', 'application/ndjson'):
+        items = [json.loads(line) for line in body.decode('utf-8').splitlines() if line.strip()]
+    else:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise ValueError('Corpul cererii nu este JSON valid')
+        items = data.get('texts', []) if isinstance(data, dict) else data
+    
+    if not isinstance(items, list):
+        raise ValueError('Campul "texts" trebuie sa fie o lista')
+    
+    return [item.get('text', '') if isinstance(item, dict) else item for item in items]
+
+
+def extract_upload_text(filename, data):
+    """
+    Extrage textul dintr-un fisier incarcat
+    
+    Args:
+        filename: Numele (securizat) al fisierului
+        data: Continutul fisierului (bytes)
+        
+    Returns:
+        Textul extras
+    """
+    if filename.endswith('.txt'):
+        return data.decode('utf-8')
+    
+    if filename.endswith('.csv'):
+        df = pd.read_csv(io.BytesIO(data))
+        # Ia prima coloana sau combina toate coloanele text
+        return ' '.join(df.iloc[:, 0].astype(str).tolist())
+    
+    if filename.endswith('.json'):
+        parsed = json.loads(data.decode('utf-8'))
+        if isinstance(parsed, dict):
+            return ' '.join(str(v) for v in parsed.values() if isinstance(v, str))
+        return str(parsed)
+    
+    if filename.endswith('.pdf'):
+        return extract_text_from_pdf(io.BytesIO(data))
+    
+    raise ValueError(f'Tip de fisier necunoscut: {filename}')
+
+
+def parse_stream_options(values, mimetype, current_pipeline):
+    """
+    Extrage parametrii unui upload in stream (query string)
+    
+    Args:
+        values: Parametrii cererii (format, filename, text_field, id_field, models)
+        mimetype: Tipul continutului cererii
+        current_pipeline: Pipeline-ul cererii (pentru modelele disponibile)
+        
+    Returns:
+        Dictionar {format, text_field, id_field, models}
+    """
+    return {
+        'format': detect_format(values.get('format'), mimetype, values.get('filename')),
+        'text_field': values.get('text_field') or None,
+        'id_field': values.get('id_field') or None,
+        'models': parse_model_selection(values, current_pipeline)
     }
+
+
+def stream_upload_lines(chunks, options, started_at=None):
+    """
+    Clasifica randurile unui fisier pe masura ce sosesc si produce raspunsul NDJSON
+    Fiecare bucata citita este parsata imediat; randurile complete sunt clasificate in batch-uri
+    de maxim STREAM_BATCH_SIZE, deci memoria nu depinde de dimensiunea fisierului.
     
-    total_start = time.time()
+    Args:
+        chunks: Iterabil de bytes (stream-ul cererii)
+        options: Rezultatul parse_stream_options; options['pipeline'] (optional) fixeaza versiunea
+                 modelelor pentru tot raspunsul
+        started_at: Momentul primirii cererii
+        
+    Yields:
+        Linii NDJSON: un rand per document, apoi un rand final cu rezumatul (sau eroarea)
+    """
+    started_at = started_at or time.time()
+    parser = RowStreamParser(options['format'], options['text_field'], options['id_field'],
+                             max_record_bytes=app.config['STREAM_MAX_RECORD_BYTES'])
+    summary = new_stream_summary()
+    
+    try:
+        for chunk in chunks:
+            for lines in classify_stream_rows(parser.feed(chunk), options, summary):
+                yield lines
+        for lines in classify_stream_rows(parser.close(), options, summary):
+            yield lines
+    except (ValueError, RuntimeError) as e:
+        # Raspunsul a inceput deja (200): eroarea este ultimul rand
+        yield stream_error_line(summary, e)
+        return
+    
+    yield stream_summary_line(summary, started_at)
+
+
+def classify_stream_rows(rows, options, summary):
+    """Imparte randurile unei bucati in batch-uri si le clasifica (liniile NDJSON ale fiecarui batch)"""
+    batch_size = app.config['STREAM_BATCH_SIZE']
+    for start in range(0, len(rows), batch_size):
+        payload, status = stream_batch_response(rows[start:start + batch_size], options['models'],
+                                                options.get('pipeline'))
+        if status != 200:
+            raise RuntimeError(payload['error'])
+        update_stream_summary(summary, payload)
+        yield payload['lines']
+
+
+def new_stream_summary():
+    return {'rows': 0, 'classified': 0, 'errors': 0, 'model_version': None, 'model_versions': []}
+
+
+def update_stream_summary(summary, payload):
+    summary['rows'] += payload['rows']
+    summary['classified'] += payload['classified']
+    summary['errors'] += payload['rows'] - payload['classified']
+    summary['model_version'] = payload['model_version']
+    # Fara pipeline fixat (procesele din pool-ul ASGI) batch-urile pot folosi versiuni diferite
+    if payload['model_version'] not in summary['model_versions']:
+        summary['model_versions'].append(payload['model_version'])
+
+
+def stream_error_line(summary, error):
+    """Ultimul rand al raspunsului NDJSON cand fisierul nu poate fi citit pana la capat"""
+    return json.dumps({'done': False, 'error': str(error), **summary}, ensure_ascii=False) + '\n'
+
+
+def stream_summary_line(summary, started_at):
+    """Ultimul rand al raspunsului NDJSON"""
+    total_time = time.time() - started_at
+    return json.dumps({
+        'done': True,
+        **summary,
+        'total_time': total_time,
+        'rows_per_second': summary['rows'] / total_time if total_time > 0 else None
+    }, ensure_ascii=False) + '\n'
+
+
+def job_text(name, data):
+    """
+    Textul unui document dintr-o arhiva
+    
+    Args:
+        name: Calea documentului in arhiva
+        data: Continutul (bytes)
+        
+    Returns:
+        Textul extras
+    """
+    filename = os.path.basename(name).lower()
+    # Fisierele text din arhive (ex: 20 Newsgroups, fara extensie) nu sunt mereu UTF-8 valid
+    if '.' not in filename or filename.endswith('.txt'):
+        return data.decode('utf-8', errors='replace')
+    if filename.endswith('.pdf') and not PDF_SUPPORT:
+        raise ValueError('Suportul pentru PDF nu este disponibil')
+    return extract_upload_text(filename, data)
+
+
+def job_batch_results(members, model_names):
+    """Rezultatele unui batch de job, clasificat in procesul curent (pentru JobRunner)"""
+    payload, status = job_batch_response(members, model_names)
+    if status != 200:
+        raise RuntimeError(payload['error'])
+    return payload['results'], payload['model_version']
+
+
+def job_results_error(job_id, fmt):
+    """Eroarea (payload, status) pentru o cerere de descarcare a rezultatelor sau None"""
+    if fmt not in RESULT_FORMATS:
+        return {'error': f"Format necunoscut: {fmt} (permise: {', '.join(RESULT_FORMATS)})"}, 400
+    if job_dir(app.config['JOBS_FOLDER'], job_id) is None:
+        return {'error': 'Jobul nu exista'}, 404
+    return None
+
+
+# Raspunsurile API-ului ca (payload, status): folosite de rutele Flask si de varianta ASGI (asgi_app.py)
+
+def training_info_response():
+    """Raspunsul pentru /api/training-info"""
+    base_dir = os.path.dirname(__file__)
+    info_path = os.path.join(base_dir, 'models', 'training_info.json')
+    
+    if not os.path.exists(info_path):
+        return {'error': 'Informatiile de antrenare nu sunt disponibile. Antreneaza modelele mai intai.'}, 404
+    
+    with open(info_path, 'r', encoding='utf-8') as f:
+        training_info = json.load(f)
+    
+    # Formateaza categoriile
+    if 'dataset' in training_info and 'categories' in training_info['dataset']:
+        training_info['dataset']['categories_formatted'] = [
+            format_category_name(cat) for cat in training_info['dataset']['categories']
+        ]
+    
+    return training_info, 200
+
+
+def predict_response(data):
+    """
+    Raspunsul pentru /api/predict
+    
+    Args:
+        data: Corpul JSON al cererii (dictionar)
+        
+    Returns:
+        (payload, status)
+    """
+    text = data.get('text', '')
+    
+    if not text:
+        return {'error': 'Textul este gol'}, 400
+    
+    # Raspunsul foloseste acelasi set de modele de la inceput pana la sfarsit
+    current_pipeline = pipeline
+    
+    try:
+        mode, thresholds = parse_prediction_mode(data)
+        budget_ms = parse_budget(data)
+        model_names = parse_model_selection(data, current_pipeline)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    
+    try:
+        prediction_result = predict_text(text, mode, thresholds, budget_ms, current_pipeline, model_names)
+    except ModelsUnavailableError as e:
+        # Eroarea nu intra in cache: modelul este reincarcat la o cerere ulterioara
+        return {'error': str(e)}, 503
+    
+    if prediction_result is None:
+        return {'error': 'Modelele nu sunt încărcate. Antrenează-le mai întâi.'}, 500
+    
+    results, performance_metrics = prediction_result
+    
+    return {
+        'success': True,
+        'mode': mode,
+        'model_version': current_pipeline.version,
+        'models': list(results),
+        'results': results,
+        'cascade': performance_metrics.get('cascade'),
+        'category_names': current_pipeline.display_names,
+        'category_names_original': current_pipeline.category_names,  # Pentru referinta
+        'performance': performance_metrics,
+        'text_length': len(text),
+        'processed_text_length': len(text.split())  # Numar de cuvinte aproximativ
+    }, 200
+
+
+def ready_response():
+    """Raspunsul pentru /api/ready: 200 doar dupa incarcarea si incalzirea modelelor"""
+    current_pipeline = pipeline
+    if current_pipeline is None or not current_pipeline.is_ready:
+        return {'ready': False}, 503
     
-    # Preprocesare text
-    preprocess_start = time.time()
-    preprocessor = TextPreprocessor(use_stemming=True, use_stopwords=True)
-    processed_text = preprocessor.preprocess_text(text)
-    performance_metrics['preprocessing_time'] = time.time() - preprocess_start
+    return {
+        'ready': True,
+        'model_version': current_pipeline.version,
+        'models_available': current_pipeline.available_models,
+        'models_loaded': list(current_pipeline.models),
+        'pid': os.getpid()
+    }, 200
+
+
+def cache_stats_response():
+    """Raspunsul pentru /api/cache/stats"""
+    if prediction_cache is None:
+        return {'enabled': False}, 200
     
-    # Vectorizare
-    vectorize_start = time.time()
-    X = vectorizer.transform([processed_text])
-    performance_metrics['vectorization_time'] = time.time() - vectorize_start
+    stats = prediction_cache.stats()
+    stats['enabled'] = True
+    stats['model_version'] = pipeline.version if pipeline is not None else None
+    return stats, 200
+
+
+def reload_response(force=False):
+    """Raspunsul pentru /api/admin/reload (incarcarea ruleaza in thread-ul cererii; celelalte cereri continua)"""
+    try:
+        return reload_models(force=force), 200
+    except Exception as e:
+        # Setul nou nu a putut fi incarcat: ramane activ cel vechi
+        return {
+            'reloaded': False,
+            'error': f'Eroare la reincarcarea modelelor: {str(e)}',
+            'model_version': pipeline.version if pipeline is not None else None
+        }, 500
+
+
+def is_admin_request(headers):
+    """Header-ul X-Admin-Token corespunde ADMIN_TOKEN (fara ADMIN_TOKEN nicio cerere nu este autorizata)"""
+    token = app.config['ADMIN_TOKEN']
+    if token is None:
+        return False
+    return hmac.compare_digest(headers.get('X-Admin-Token', '').encode('utf-8'), token.encode('utf-8'))
+
+
+def admin_error_response(headers):
+    """
+    Verifica accesul la endpoint-urile de administrare
     
-    results = {}
+    Args:
+        headers: Header-ele cererii
+        
+    Returns:
+        (payload, status) cu eroarea sau None daca cererea este autorizata
+    """
+    if app.config['ADMIN_TOKEN'] is None:
+        return {'error': 'Endpoint de administrare dezactivat (seteaza ADMIN_TOKEN)'}, 404
+    if not is_admin_request(headers):
+        return {'error': 'Acces interzis'}, 403
+    return None
+
+
+def batch_response(texts):
+    """
+    Raspunsul pentru /api/predict/batch
     
-    # Predictii pentru fiecare algoritm
-    for name, model in models.items():
-        algo_start = time.time()
+    Args:
+        texts: Lista de texte extrasa cu parse_batch_payload
         
-        prediction_id = model.predict(X)[0]
-        prediction_name = category_names[prediction_id]
+    Returns:
+        (payload, status)
+    """
+    if not texts:
+        return {'error': 'Lista de texte este goala'}, 400
+    
+    if len(texts) > app.config['MAX_BATCH_SIZE']:
+        return {'error': f"Maxim {app.config['MAX_BATCH_SIZE']} texte per cerere"}, 400
+    
+    empty = [i for i, text in enumerate(texts) if not isinstance(text, str) or not text]
+    if empty:
+        return {'error': f'Textele de la pozitiile {empty[:10]} sunt goale sau invalide'}, 400
+    
+    current_pipeline = pipeline
+    try:
+        prediction_result = predict_texts(texts, current_pipeline)
+    except ModelsUnavailableError as e:
+        return {'error': str(e)}, 503
+    
+    if prediction_result is None:
+        return {'error': 'Modelele nu sunt încărcate. Antrenează-le mai întâi.'}, 500
+    
+    batch_results, performance_metrics = prediction_result
+    performance_metrics['documents'] = len(texts)
+    performance_metrics['time_per_document'] = performance_metrics['total_time'] / len(texts)
+    
+    return {
+        'success': True,
+        'model_version': current_pipeline.version,
+        'results': [
+            {
+                'index': i,
+                'results': results,
+                'text_length': len(text),
+                'processed_text_length': len(text.split())
+            }
+            for i, (text, results) in enumerate(zip(texts, batch_results))
+        ],
+        'category_names': current_pipeline.display_names,
+        'category_names_original': current_pipeline.category_names,
+        'performance': performance_metrics
+    }, 200
+
+
+def stream_batch_response(rows, model_names=None, current_pipeline=None):
+    """
+    Clasifica un batch de randuri dintr-un upload in stream (un singur predict_batch)
+    
+    Args:
+        rows: Lista de StreamRow (randurile cu eroare nu sunt clasificate)
+        model_names: Modelele alese (None = toate cele disponibile)
+        current_pipeline: Pipeline-ul capturat la inceputul cererii (implicit cel global)
         
-        # Probabilitati (daca sunt disponibile)
+    Returns:
+        (payload, status); payload['lines'] contine cate o linie NDJSON per rand
+    """
+    current_pipeline = current_pipeline or pipeline
+    if current_pipeline is None:
+        return {'error': 'Modelele nu sunt încărcate. Antrenează-le mai întâi.'}, 500
+    
+    valid = [row for row in rows if row.error is None]
+    batch_results = []
+    if valid:
         try:
-            if hasattr(model, 'predict_proba'):
-                probabilities = model.predict_proba(X)[0]
-                prob_dict = {category_names[i]: float(prob) for i, prob in enumerate(probabilities)}
-            else:
-                prob_dict = {prediction_name: 1.0}
-        except:
-            prob_dict = {prediction_name: 1.0}
-        
-        prediction_time = time.time() - algo_start
-        
-        # Formateaza numele categoriei
-        formatted_prediction = format_category_name(prediction_name)
-        
-        # Formateaza probabilitatile
-        formatted_probs = {format_category_name(k): v for k, v in prob_dict.items()}
-        
-        results[name] = {
-            'prediction': formatted_prediction,
-            'prediction_original': prediction_name,  # Pastreaza originalul pentru referinta
-            'prediction_id': int(prediction_id),
-            'probabilities': formatted_probs,
-            'confidence': float(max(prob_dict.values())),
-            'prediction_time': prediction_time,
-            'prediction_time_ms': prediction_time * 1000  # In milisecunde
-        }
+            batch_results, _ = current_pipeline.predict_batch([row.text for row in valid], models=model_names)
+        except ModelsUnavailableError as e:
+            return {'error': str(e)}, 503
+    results_by_index = {row.index: results for row, results in zip(valid, batch_results)}
+    
+    lines = []
+    for row in rows:
+        item = {'index': row.index}
+        if row.id is not None:
+            item['id'] = row.id
+        if row.error is not None:
+            item['error'] = row.error
+        else:
+            item['results'] = results_by_index[row.index]
+            item['text_length'] = len(row.text)
+            item['model_version'] = current_pipeline.version
+        lines.append(json.dumps(item, ensure_ascii=False))
+    
+    return {
+        'lines': ''.join(line + '\n' for line in lines),
+        'rows': len(rows),
+        'classified': len(valid),
+        'model_version': current_pipeline.version
+    }, 200
+
+
+def job_batch_response(members, model_names=None):
+    """
+    Clasifica un batch de documente dintr-o arhiva (un singur predict_batch)
+    
+    Args:
+        members: Lista de (index, nume, bytes sau None daca documentul este prea mare)
+        model_names: Modelele jobului
         
-        performance_metrics['algorithms'][name] = {
-            'prediction_time': prediction_time,
-            'prediction_time_ms': prediction_time * 1000
-        }
+    Returns:
+        (payload, status); payload['results'] contine cate un rezultat per document, in ordine
+    """
+    current_pipeline = pipeline
+    if current_pipeline is None:
+        return {'error': 'Modelele nu sunt încărcate. Antrenează-le mai întâi.'}, 500
     
-    performance_metrics['total_time'] = time.time() - total_start
+    items, texts = [], []
+    for index, name, data in members:
+        item = {'index': index, 'name': name}
+        if data is None:
+            item['error'] = 'Documentul depaseste dimensiunea maxima'
+        else:
+            try:
+                text = job_text(name, data)
+                if text.strip():
+                    item['text_length'] = len(text)
+                    texts.append(text)
+                else:
+                    item['error'] = 'Text gol'
+            except Exception as e:
+                item['error'] = f'Eroare la citirea fisierului: {str(e)}'
+        items.append(item)
+    
+    if texts:
+        try:
+            batch_results, _ = current_pipeline.predict_batch(texts, models=model_names)
+        except ModelsUnavailableError as e:
+            return {'error': str(e)}, 503
+        classified = iter(batch_results)
+        for item in items:
+            if 'error' not in item:
+                item['results'] = next(classified)
+    
+    return {'results': items, 'model_version': current_pipeline.version}, 200
+
+
+def job_submit_response(upload_path, filename, model_names=None):
+    """
+    Raspunsul pentru POST /api/jobs, dupa ce arhiva a fost scrisa pe disc
+    
+    Args:
+        upload_path: Arhiva salvata (de la new_upload_path)
+        filename: Numele securizat al arhivei
+        model_names: Modelele alese (None = toate cele disponibile)
+        
+    Returns:
+        (payload, status)
+    """
+    current_pipeline = pipeline
+    if current_pipeline is None:
+        os.remove(upload_path)
+        return {'error': 'Modelele nu sunt încărcate. Antrenează-le mai întâi.'}, 500
+    
+    try:
+        job = create_job(
+            app.config['JOBS_FOLDER'], upload_path, filename,
+            model_names or current_pipeline.available_models,
+            app.config['ALLOWED_EXTENSIONS'],
+            max_member_bytes=app.config['MAX_CONTENT_LENGTH']  # aceeasi limita ca un upload obisnuit
+        )
+    except ValueError as e:
+        return {'error': str(e)}, 400
     
-    return results, performance_metrics
+    if job_runner is not None:
+        job_runner.wake()
+    return {'success': True, 'job': job}, 202
+
+
+def jobs_list_response():
+    """Raspunsul pentru GET /api/jobs"""
+    return {'jobs': list_jobs(app.config['JOBS_FOLDER'])}, 200
+
+
+def job_status_response(job_id):
+    """Raspunsul pentru GET /api/jobs/<id>: stare, progres, documente pe secunda"""
+    job = job_status(app.config['JOBS_FOLDER'], job_id)
+    if job is None:
+        return {'error': 'Jobul nu exista'}, 404
+    return job, 200
+
+
+def job_cancel_response(job_id):
+    """Raspunsul pentru DELETE /api/jobs/<id>"""
+    job = cancel_job(app.config['JOBS_FOLDER'], job_id)
+    if job is None:
+        return {'error': 'Jobul nu exista'}, 404
+    return job, 202
+
+
+def upload_response(filename, data, form, started_at=None):
+    """
+    Raspunsul pentru /api/upload (fisierul a trecut deja de allowed_file)
+    
+    Args:
+        filename: Numele securizat al fisierului
+        data: Continutul fisierului (bytes)
+        form: Celelalte campuri ale formularului (mode, praguri, budget_ms, models)
+        started_at: Momentul primirii cererii (bugetul include citirea fisierului)
+        
+    Returns:
+        (payload, status)
+    """
+    current_pipeline = pipeline
+    
+    try:
+        mode, thresholds = parse_prediction_mode(form)
+        budget_ms = parse_budget(form)
+        model_names = parse_model_selection(form, current_pipeline)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    
+    # Citeste continutul fisierului
+    try:
+        if filename.endswith('.pdf'):
+            if not PDF_SUPPORT:
+                return {'error': 'Suportul pentru PDF nu este disponibil. Instaleaza PyPDF2 sau pdfplumber: pip install PyPDF2'}, 500
+            
+            text = extract_upload_text(filename, data)
+            if not text or len(text.strip()) == 0:
+                return {'error': 'Nu s-a putut extrage text din PDF. Fisierul poate fi scanat sau corupt.'}, 500
+        else:
+            text = extract_upload_text(filename, data)
+        
+        # Face predictii; bugetul include si citirea / extragerea textului din fisier
+        if budget_ms is not None and started_at is not None:
+            budget_ms = max(budget_ms - (time.time() - started_at) * 1000, 0.001)
+        try:
+            prediction_result = predict_text(text, mode, thresholds, budget_ms, current_pipeline, model_names)
+        except ModelsUnavailableError as e:
+            return {'error': str(e)}, 503
+        
+        if prediction_result is None:
+            return {'error': 'Modelele nu sunt incarcate. Antreneaza-le mai intai.'}, 500
+        
+        results, performance_metrics = prediction_result
+        
+        return {
+            'success': True,
+            'mode': mode,
+            'model_version': current_pipeline.version,
+            'models': list(results),
+            'text': text[:500] + '...' if len(text) > 500 else text,  # Primele 500 caractere
+            'text_length': len(text),
+            'processed_text_length': len(text.split()),  # Numar de cuvinte aproximativ
+            'results': results,
+            'cascade': performance_metrics.get('cascade'),
+            'category_names': current_pipeline.display_names,
+            'category_names_original': current_pipeline.category_names,  # Pentru referinta
+            'performance': performance_metrics
+        }, 200
+    
+    except Exception as e:
+        return {'error': f'Eroare la citirea fisierului: {str(e)}'}, 500
 
 
 @app.route('/')
@@ -286,22 +1363,8 @@ def details():
 def get_training_info():
     """Endpoint pentru informatii despre antrenare"""
     try:
-        base_dir = os.path.dirname(__file__)
-        info_path = os.path.join(base_dir, 'models', 'training_info.json')
-        
-        if not os.path.exists(info_path):
-            return jsonify({'error': 'Informatiile de antrenare nu sunt disponibile. Antreneaza modelele mai intai.'}), 404
-        
-        with open(info_path, 'r', encoding='utf-8') as f:
-            training_info = json.load(f)
-        
-        # Formateaza categoriile
-        if 'dataset' in training_info and 'categories' in training_info['dataset']:
-            training_info['dataset']['categories_formatted'] = [
-                format_category_name(cat) for cat in training_info['dataset']['categories']
-            ]
-        
-        return jsonify(training_info)
+        payload, status = training_info_response()
+        return jsonify(payload), status
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -311,31 +1374,50 @@ def get_training_info():
 def predict():
     """Endpoint pentru predictie"""
     try:
-        data = request.get_json()
-        text = data.get('text', '')
-        
-        if not text:
-            return jsonify({'error': 'Textul este gol'}), 400
-        
-        prediction_result = predict_text(text)
-        
-        if prediction_result is None:
-            return jsonify({'error': 'Modelele nu sunt încărcate. Antrenează-le mai întâi.'}), 500
-        
-        results, performance_metrics = prediction_result
-        
-        # Formateaza numele categoriilor pentru afisare
-        formatted_category_names = [format_category_name(cat) for cat in category_names]
+        payload, status = predict_response(request.get_json())
+        return jsonify(payload), status
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/ready')
+def ready():
+    """Endpoint de readiness: 200 doar dupa incarcarea si incalzirea modelelor"""
+    payload, status = ready_response()
+    return jsonify(payload), status
+
+
+@app.route('/api/cache/stats')
+def get_cache_stats():
+    """Endpoint pentru statisticile cache-ului de predictii"""
+    payload, status = cache_stats_response()
+    return jsonify(payload), status
+
+
+@app.route('/api/admin/reload', methods=['POST'])
+def admin_reload():
+    """Endpoint de administrare: incarca modelele noi de pe disc si le activeaza atomic"""
+    error = admin_error_response(request.headers)
+    if error is not None:
+        payload, status = error
+        return jsonify(payload), status
+    
+    payload, status = reload_response(force=request.args.get('force') == '1')
+    return jsonify(payload), status
+
+
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_batch():
+    """Endpoint pentru predictie pe un batch de texte (JSON sau NDJSON)"""
+    try:
+        try:
+            texts = parse_batch_request()
+        except ValueError as e:
+            return jsonify({'error': f'Cerere batch invalida: {str(e)}'}), 400
         
-        return jsonify({
-            'success': True,
-            'results': results,
-            'category_names': formatted_category_names,
-            'category_names_original': category_names,  # Pentru referinta
-            'performance': performance_metrics,
-            'text_length': len(text),
-            'processed_text_length': len(text.split())  # Numar de cuvinte aproximativ
-        })
+        payload, status = batch_response(texts)
+        return jsonify(payload), status
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -345,6 +1427,8 @@ def predict():
 def upload_file():
     """Endpoint pentru upload fisier"""
     try:
+        upload_start = time.time()
+        
         if 'file' not in request.files:
             return jsonify({'error': 'Nu s-a incarcat niciun fisier'}), 400
         
@@ -354,63 +1438,14 @@ def upload_file():
             return jsonify({'error': 'Nu s-a selectat niciun fisier'}), 400
         
         if file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-            
-            # Citeste continutul fisierului
-            try:
-                if filename.endswith('.txt'):
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        text = f.read()
-                elif filename.endswith('.csv'):
-                    df = pd.read_csv(filepath)
-                    # Ia prima coloana sau combina toate coloanele text
-                    text = ' '.join(df.iloc[:, 0].astype(str).tolist())
-                elif filename.endswith('.json'):
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        if isinstance(data, dict):
-                            text = ' '.join(str(v) for v in data.values() if isinstance(v, str))
-                        else:
-                            text = str(data)
-                elif filename.endswith('.pdf'):
-                    if not PDF_SUPPORT:
-                        return jsonify({'error': 'Suportul pentru PDF nu este disponibil. Instaleaza PyPDF2 sau pdfplumber: pip install PyPDF2'}), 500
-                    
-                    text = extract_text_from_pdf(filepath)
-                    if not text or len(text.strip()) == 0:
-                        return jsonify({'error': 'Nu s-a putut extrage text din PDF. Fisierul poate fi scanat sau corupt.'}), 500
-                
-                # Sterge fisierul dupa citire
-                os.remove(filepath)
-                
-                # Face predictii
-                prediction_result = predict_text(text)
-                
-                if prediction_result is None:
-                    return jsonify({'error': 'Modelele nu sunt incarcate. Antreneaza-le mai intai.'}), 500
-                
-                results, performance_metrics = prediction_result
-                
-                # Formateaza numele categoriilor pentru afisare
-                formatted_category_names = [format_category_name(cat) for cat in category_names]
-                
-                return jsonify({
-                    'success': True,
-                    'text': text[:500] + '...' if len(text) > 500 else text,  # Primele 500 caractere
-                    'text_length': len(text),
-                    'processed_text_length': len(text.split()),  # Numar de cuvinte aproximativ
-                    'results': results,
-                    'category_names': formatted_category_names,
-                    'category_names_original': category_names,  # Pentru referinta
-                    'performance': performance_metrics
-                })
-            
-            except Exception as e:
-                if os.path.exists(filepath):
-                    os.remove(filepath)
-                return jsonify({'error': f'Eroare la citirea fisierului: {str(e)}'}), 500
+            form = request.form.to_dict()
+            if len(request.form.getlist('models')) > 1:
+                form['models'] = request.form.getlist('models')  # models=nb&models=svm
+            # Fisierul este citit direct din cerere (fara copie temporara in uploads/)
+            payload, status = upload_response(
+                secure_filename(file.filename), file.read(), form, upload_start
+            )
+            return jsonify(payload), status
         
         return jsonify({'error': 'Tip de fișier nepermis'}), 400
     
@@ -418,6 +1453,108 @@ def upload_file():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/upload/stream', methods=['POST'])
+def upload_stream():
+    """
+    Endpoint pentru clasificarea pe randuri a unui fisier CSV / JSON / NDJSON trimis ca si corp al cererii
+    (ex: curl --data-binary @date.csv -H 'Content-Type: text/csv'); raspunsul NDJSON este trimis
+    pe masura ce fisierul este citit, fara copie temporara pe disc
+    """
+    upload_start = time.time()
+    current_pipeline = pipeline
+    if current_pipeline is None:
+        return jsonify({'error': 'Modelele nu sunt încărcate. Antrenează-le mai întâi.'}), 500
+    
+    values = request.args.to_dict()
+    if len(request.args.getlist('models')) > 1:
+        values['models'] = request.args.getlist('models')  # models=nb&models=svm
+    try:
+        options = parse_stream_options(values, request.mimetype, current_pipeline)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    # Tot raspunsul foloseste pipeline-ul capturat, chiar daca modelele sunt reincarcate intre timp
+    options['pipeline'] = current_pipeline
+    
+    # Stream-ul brut al cererii: MAX_CONTENT_LENGTH nu se aplica, fisierul nu este tinut in memorie
+    stream = get_input_stream(request.environ, max_content_length=None)
+    chunk_size = app.config['STREAM_CHUNK_SIZE']
+    chunks = iter(lambda: stream.read(chunk_size), b'')
+    
+    response = Response(stream_with_context(stream_upload_lines(chunks, options, upload_start)),
+                        mimetype='application/x-ndjson')
+    response.headers['X-Accel-Buffering'] = 'no'  # fara buffering in proxy (nginx)
+    return response
+
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """
+    Endpoint pentru un job de clasificare in masa: corpul cererii este o arhiva zip / tar
+    (ex: curl --data-binary @articole.zip 'localhost:5001/api/jobs?filename=articole.zip');
+    raspunde 202 imediat ce arhiva este pe disc, clasificarea ruleaza in fundal
+    """
+    current_pipeline = pipeline
+    if current_pipeline is None:
+        return jsonify({'error': 'Modelele nu sunt încărcate. Antrenează-le mai întâi.'}), 500
+    
+    values = request.args.to_dict()
+    if len(request.args.getlist('models')) > 1:
+        values['models'] = request.args.getlist('models')  # models=nb&models=svm
+    try:
+        model_names = parse_model_selection(values, current_pipeline)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Arhiva este copiata pe disc din stream-ul cererii (limita JOB_MAX_ARCHIVE_BYTES, nu MAX_CONTENT_LENGTH)
+    upload_path = new_upload_path(app.config['JOBS_FOLDER'])
+    stream = get_input_stream(request.environ, max_content_length=None)
+    chunk_size = app.config['STREAM_CHUNK_SIZE']
+    try:
+        save_upload(iter(lambda: stream.read(chunk_size), b''), upload_path, app.config['JOB_MAX_ARCHIVE_BYTES'])
+    except OverflowError as e:
+        return jsonify({'error': str(e)}), 413
+    
+    filename = secure_filename(values.get('filename') or '') or 'archive'
+    payload, status = job_submit_response(upload_path, filename, model_names)
+    return jsonify(payload), status
+
+
+@app.route('/api/jobs')
+def get_jobs():
+    """Endpoint cu starea tuturor joburilor"""
+    payload, status = jobs_list_response()
+    return jsonify(payload), status
+
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """Endpoint cu starea unui job (progres, documente pe secunda, timp estimat)"""
+    payload, status = job_status_response(job_id)
+    return jsonify(payload), status
+
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job_route(job_id):
+    """Endpoint pentru oprirea unui job (rezultatele de pana atunci raman descarcabile)"""
+    payload, status = job_cancel_response(job_id)
+    return jsonify(payload), status
+
+
+@app.route('/api/jobs/<job_id>/results')
+def get_job_results(job_id):
+    """Endpoint pentru descarcarea rezultatelor unui job (?format=ndjson|csv), si in timpul rularii"""
+    fmt = request.args.get('format', 'ndjson')
+    error = job_results_error(job_id, fmt)
+    if error is not None:
+        payload, status = error
+        return jsonify(payload), status
+    
+    response = Response(iter_job_results(app.config['JOBS_FOLDER'], job_id, fmt),
+                        mimetype='text/csv' if fmt == 'csv' else 'application/x-ndjson')
+    response.headers['Content-Disposition'] = f'attachment; filename={job_id}.{fmt}'
+    return response
+
+
 if __name__ == '__main__':
     # Incarca modelele la pornire
     if load_models():
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Varianta ASGI (asyncio) a UI-ului de clasificare text
+Cererile sunt primite fara sa blocheze bucla de evenimente; extragerea textului (PDF/CSV/JSON)
+si predictiile ruleaza intr-un pool limitat de procese, cu modelele incarcate o singura data.
+Aceleasi rute si aceleasi raspunsuri JSON ca app.py.
+
+Pornire:
+    pip install starlette uvicorn python-multipart
+    uvicorn asgi_app:application --port 5001
+"""
+
+import os
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from starlette.applications import Starlette
+from starlette.requests import ClientDisconnect
+from starlette.responses import HTMLResponse, JSONResponse, StreamingResponse
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+from werkzeug.utils import secure_filename
+
+import app as web_app
+from stream_parsing import RowStreamParser
+from bulk_jobs import iter_job_results, new_upload_path
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Numarul de procese pentru munca CPU si numarul maxim de cereri trimise pool-ului simultan
+PROCESS_WORKERS = int(os.environ.get('ASGI_PROCESS_WORKERS', str(os.cpu_count() or 1)))
+MAX_PENDING = int(os.environ.get('ASGI_MAX_PENDING', str(PROCESS_WORKERS * 4)))
+# Cat asteapta o reincarcare ca toate procesele din pool sa termine sarcinile in curs (secunde)
+RELOAD_BARRIER_TIMEOUT = float(os.environ.get('ASGI_RELOAD_TIMEOUT', '60'))
+
+# Template-urile folosesc url_for('static', filename=...) ca in Flask
+templates = Environment(
+    loader=FileSystemLoader(os.path.join(BASE_DIR, 'templates')),
+    autoescape=select_autoescape(['html'])
+)
+templates.globals['url_for'] = lambda endpoint, filename='': f'/{endpoint}/{filename}'
+
+
+# Functii rulate in procesele din pool (modelele sunt mostenite prin fork din procesul principal)
+
+def _init_worker():
+    """Initializeaza un proces din pool"""
+    if web_app.pipeline is None:
+        web_app.load_models(start_workers=False)
+    elif web_app.app.config['MODEL_WATCH_INTERVAL'] > 0:
+        # Procesele recreate de pool pornesc pe setul de modele de pe disc
+        try:
+            web_app.reload_models()
+        except Exception as e:
+            print(f"Procesul {os.getpid()} ramane pe modelele incarcate la pornire: {e}")
+    # Fiecare proces isi supravegheaza singur directorul cu modele (MODEL_WATCH_INTERVAL);
+    # joburile ruleaza in procesul principal, care trimite batch-urile in pool
+    web_app.start_background_workers(start_jobs=False)
+
+
+def _call(name, *args):
+    """Apeleaza un builder de raspuns din app.py; erorile devin raspunsuri 500 ca in Flask"""
+    try:
+        return getattr(web_app, name)(*args)
+    except Exception as e:
+        return {'error': str(e)}, 500
+
+
+def _reload_worker(force):
+    """
+    Reincarca modelele procesului curent din pool
+    Bariera tine procesul ocupat pana cand fiecare proces a primit cate o sarcina de reincarcare
+    """
+    try:
+        offloader.reload_barrier.wait(timeout=RELOAD_BARRIER_TIMEOUT)
+    except threading.BrokenBarrierError:
+        pass  # Un proces nu s-a eliberat la timp: reincarcarea continua, dar poate sari un proces
+    payload, status = _call('reload_response', force)
+    return dict(payload, pid=os.getpid()), status
+
+
+class ProcessOffloader:
+    """Pool de procese limitat pentru munca CPU (extragere text, vectorizare, modele)"""
+
+    def __init__(self, max_workers, max_pending):
+        """
+        Initializeaza pool-ul
+
+        Args:
+            max_workers: Numarul de procese
+            max_pending: Numarul maxim de sarcini trimise simultan (restul asteapta in bucla async)
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.executor = None
+        self.semaphore = None
+        self.reload_barrier = None
+        self.reload_lock = None
+
+    def start(self):
+        """Porneste procesele (fork dupa incarcarea modelelor) si asteapta sa fie gata"""
+        context = multiprocessing.get_context('fork')
+        # Mostenita prin fork de procesele din pool (nu poate fi trimisa ca argument)
+        self.reload_barrier = context.Barrier(self.max_workers)
+        self.reload_lock = asyncio.Lock()
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=context,
+            initializer=_init_worker
+        )
+        self.semaphore = asyncio.Semaphore(self.max_pending)
+        # Creeaza toate procesele acum, nu la prima cerere
+        for future in [self.executor.submit(_call, 'ready_response') for _ in range(self.max_workers)]:
+            future.result()
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+    async def run(self, name, *args):
+        """
+        Ruleaza un builder de raspuns din app.py intr-un proces din pool
+
+        Returns:
+            (payload, status)
+        """
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, _call, name, *args)
+
+    async def reload_all(self, force=False):
+        """
+        Reincarca modelele in fiecare proces din pool (cate o sarcina per proces)
+
+        Returns:
+            Lista de (payload, status), una per proces
+        """
+        async with self.reload_lock:
+            self.reload_barrier.reset()
+            loop = asyncio.get_running_loop()
+            futures = [loop.run_in_executor(self.executor, _reload_worker, force) for _ in range(self.max_workers)]
+            return await asyncio.gather(*futures)
+
+
+offloader = ProcessOffloader(PROCESS_WORKERS, MAX_PENDING)
+
+
+def offloaded_job_batch(members, model_names):
+    """Batch de job clasificat intr-un proces din pool (apelat din thread-urile JobRunner)"""
+    payload, status = offloader.executor.submit(_call, 'job_batch_response', members, model_names).result()
+    if status != 200:
+        raise RuntimeError(payload['error'])
+    return payload['results'], payload['model_version']
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse care poate citi corpul cererii in timp ce trimite raspunsul
+    (StreamingResponse consuma mesajele cererii ca sa detecteze deconectarea clientului;
+    aici deconectarea este semnalata de request.stream() sau de trimiterea raspunsului)
+    """
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+
+
+def json_response(payload, status=200):
+    return JSONResponse(payload, status_code=status)
+
+
+async def index(request):
+    """Pagina principala"""
+    return HTMLResponse(templates.get_template('index.html').render())
+
+
+async def details(request):
+    """Pagina cu detalii despre antrenare"""
+    return HTMLResponse(templates.get_template('details.html').render())
+
+
+async def get_training_info(request):
+    """Endpoint pentru informatii despre antrenare"""
+    try:
+        return json_response(*await asyncio.to_thread(web_app.training_info_response))
+    except Exception as e:
+        return json_response({'error': str(e)}, 500)
+
+
+async def predict(request):
+    """Endpoint pentru predictie"""
+    try:
+        data = await request.json()
+    except ValueError:
+        return json_response({'error': 'Corpul cererii nu este JSON valid'}, 400)
+    if not isinstance(data, dict):
+        return json_response({'error': 'Corpul cererii trebuie sa fie un obiect JSON'}, 400)
+    return json_response(*await offloader.run('predict_response', data))
+
+
+async def predict_batch(request):
+    """Endpoint pentru predictie pe un batch de texte (JSON sau NDJSON)"""
+    body = await request.body()
+    mimetype = request.headers.get('content-type', '').split(';')[0].strip()
+    try:
+        texts = web_app.parse_batch_payload(mimetype, body)
+    except ValueError as e:
+        return json_response({'error': f'Cerere batch invalida: {str(e)}'}, 400)
+    return json_response(*await offloader.run('batch_response', texts))
+
+
+async def upload_file(request):
+    """Endpoint pentru upload fisier"""
+    upload_start = time.time()
+    try:
+        content_length = int(request.headers.get('content-length') or 0)
+        if content_length > web_app.app.config['MAX_CONTENT_LENGTH']:
+            return json_response({'error': 'Fisierul depaseste dimensiunea maxima permisa'}, 413)
+
+        # Formularul multipart este citit asincron (fisierele mari sunt tinute pe disc de starlette)
+        async with request.form() as form:
+            file = form.get('file')
+            if file is None or isinstance(file, str):
+                return json_response({'error': 'Nu s-a incarcat niciun fisier'}, 400)
+
+            if file.filename == '':
+                return json_response({'error': 'Nu s-a selectat niciun fisier'}, 400)
+
+            if not web_app.allowed_file(file.filename):
+                return json_response({'error': 'Tip de fișier nepermis'}, 400)
+
+            data = await file.read()
+            fields = {key: value for key, value in form.items() if isinstance(value, str)}
+            if len(form.getlist('models')) > 1:
+                fields['models'] = form.getlist('models')  # models=nb&models=svm
+
+        return json_response(*await offloader.run(
+            'upload_response', secure_filename(file.filename), data, fields, upload_start
+        ))
+
+    except Exception as e:
+        return json_response({'error': str(e)}, 500)
+
+
+async def upload_stream(request):
+    """Endpoint pentru clasificarea pe randuri a unui fisier CSV / JSON / NDJSON trimis ca si corp al cererii"""
+    upload_start = time.time()
+    values = dict(request.query_params)
+    if len(request.query_params.getlist('models')) > 1:
+        values['models'] = request.query_params.getlist('models')  # models=nb&models=svm
+    mimetype = request.headers.get('content-type', '').split(';')[0].strip()
+    try:
+        options = web_app.parse_stream_options(values, mimetype, web_app.pipeline)
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
+    
+    return DuplexStreamingResponse(stream_upload_lines(request, options, upload_start),
+                                   media_type='application/x-ndjson', headers={'X-Accel-Buffering': 'no'})
+
+
+async def stream_upload_lines(request, options, started_at):
+    """
+    Varianta async a web_app.stream_upload_lines: corpul cererii este citit pe bucati fara sa blocheze
+    bucla de evenimente, iar fiecare batch de randuri este clasificat intr-un proces din pool
+    """
+    parser = RowStreamParser(options['format'], options['text_field'], options['id_field'],
+                             max_record_bytes=web_app.app.config['STREAM_MAX_RECORD_BYTES'])
+    batch_size = web_app.app.config['STREAM_BATCH_SIZE']
+    summary = web_app.new_stream_summary()
+    
+    async def classify(rows):
+        for start in range(0, len(rows), batch_size):
+            payload, status = await offloader.run('stream_batch_response', rows[start:start + batch_size],
+                                                  options['models'])
+            if status != 200:
+                raise RuntimeError(payload['error'])
+            web_app.update_stream_summary(summary, payload)
+            yield payload['lines']
+    
+    try:
+        async for chunk in request.stream():
+            async for lines in classify(await asyncio.to_thread(parser.feed, chunk)):
+                yield lines
+        async for lines in classify(parser.close()):
+            yield lines
+    except (ValueError, RuntimeError) as e:
+        yield web_app.stream_error_line(summary, e)
+        return
+    
+    yield web_app.stream_summary_line(summary, started_at)
+
+
+async def submit_job(request):
+    """Endpoint pentru un job de clasificare in masa: corpul cererii este o arhiva zip / tar"""
+    values = dict(request.query_params)
+    if len(request.query_params.getlist('models')) > 1:
+        values['models'] = request.query_params.getlist('models')  # models=nb&models=svm
+    try:
+        model_names = web_app.parse_model_selection(values, web_app.pipeline)
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
+    
+    # Arhiva este copiata pe disc pe masura ce soseste (limita JOB_MAX_ARCHIVE_BYTES)
+    upload_path = new_upload_path(web_app.app.config['JOBS_FOLDER'])
+    max_bytes = web_app.app.config['JOB_MAX_ARCHIVE_BYTES']
+    size = 0
+    try:
+        with open(upload_path, 'wb') as f:
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > max_bytes:
+                    raise OverflowError(f'Arhiva depaseste dimensiunea maxima ({max_bytes} bytes)')
+                await asyncio.to_thread(f.write, chunk)
+    except BaseException as e:
+        os.remove(upload_path)
+        if isinstance(e, OverflowError):
+            return json_response({'error': str(e)}, 413)
+        raise
+    
+    filename = secure_filename(values.get('filename') or '') or 'archive'
+    return json_response(*await asyncio.to_thread(web_app.job_submit_response, upload_path, filename, model_names))
+
+
+async def get_jobs(request):
+    """Endpoint cu starea tuturor joburilor"""
+    return json_response(*await asyncio.to_thread(web_app.jobs_list_response))
+
+
+async def job(request):
+    """Endpoint cu starea unui job (GET) sau pentru oprirea lui (DELETE)"""
+    job_id = request.path_params['job_id']
+    if request.method == 'DELETE':
+        return json_response(*await asyncio.to_thread(web_app.job_cancel_response, job_id))
+    return json_response(*await asyncio.to_thread(web_app.job_status_response, job_id))
+
+
+async def get_job_results(request):
+    """Endpoint pentru descarcarea rezultatelor unui job (?format=ndjson|csv)"""
+    job_id = request.path_params['job_id']
+    fmt = request.query_params.get('format', 'ndjson')
+    error = web_app.job_results_error(job_id, fmt)
+    if error is not None:
+        return json_response(*error)
+    
+    # Generatorul sincron (citire de pe disc) este rulat de starlette intr-un thread
+    return StreamingResponse(iter_job_results(web_app.app.config['JOBS_FOLDER'], job_id, fmt),
+                             media_type='text/csv' if fmt == 'csv' else 'application/x-ndjson',
+                             headers={'Content-Disposition': f'attachment; filename={job_id}.{fmt}'})
+
+
+async def ready(request):
+    """Endpoint de readiness (raspunde unul dintre procesele din pool)"""
+    if offloader.executor is None:
+        return json_response({'ready': False}, 503)
+    return json_response(*await offloader.run('ready_response'))
+
+
+async def get_cache_stats(request):
+    """Endpoint pentru statisticile cache-ului de predictii (ale unuia dintre procesele din pool)"""
+    return json_response(*await offloader.run('cache_stats_response'))
+
+
+async def admin_reload(request):
+    """
+    Endpoint de administrare: reincarca modelele in procesul principal (folosit pentru validarea
+    cererilor si de joburi) si in fiecare proces din pool
+    """
+    error = web_app.admin_error_response(request.headers)
+    if error is not None:
+        return json_response(*error)
+
+    force = request.query_params.get('force') == '1'
+    payload, status = await asyncio.to_thread(web_app.reload_response, force)
+    processes = await offloader.reload_all(force)
+    payload['processes'] = [process_payload for process_payload, _ in processes]
+    payload['reloaded'] = payload.get('reloaded', False) or any(p.get('reloaded') for p in payload['processes'])
+    if any(process_status != 200 for _, process_status in processes):
+        status = 500
+    return json_response(payload, status)
+
+
+@asynccontextmanager
+async def lifespan(application):
+    # Modelele se incarca o singura data, inainte de fork; procesele din pool le partajeaza.
+    # Ruleaza in thread-ul principal (doar la pornire), ca fork-ul sa nu copieze alte thread-uri.
+    if not web_app.load_models(start_workers=False):
+        raise RuntimeError("Nu s-au putut incarca modelele. Ruleaza mai intai: python3 train_models.py")
+    offloader.start()
+    print(f"Pool de procese pornit: {offloader.max_workers} procese, maxim {offloader.max_pending} sarcini simultan")
+    # Runner-ul de joburi (thread) porneste dupa ce procesele din pool au fost create cu fork
+    web_app.start_job_runner(offloaded_job_batch)
+    try:
+        yield
+    finally:
+        offloader.shutdown()
+
+
+application = Starlette(
+    routes=[
+        Route('/', index),
+        Route('/details', details),
+        Route('/api/training-info', get_training_info),
+        Route('/api/predict', predict, methods=['POST']),
+        Route('/api/predict/batch', predict_batch, methods=['POST']),
+        Route('/api/upload', upload_file, methods=['POST']),
+        Route('/api/upload/stream', upload_stream, methods=['POST']),
+        Route('/api/jobs', submit_job, methods=['POST']),
+        Route('/api/jobs', get_jobs),
+        Route('/api/jobs/{job_id}', job, methods=['GET', 'DELETE']),
+        Route('/api/jobs/{job_id}/results', get_job_results),
+        Route('/api/ready', ready),
+        Route('/api/cache/stats', get_cache_stats),
+        Route('/api/admin/reload', admin_reload, methods=['POST']),
+        Mount('/static', StaticFiles(directory=os.path.join(BASE_DIR, 'static')), name='static')
+    ],
+    lifespan=lifespan
+)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    port = 5001
+    print(f"Server ASGI pornit! Acceseaza http://localhost:{port}")
+    uvicorn.run(application, host='0.0.0.0', port=port)
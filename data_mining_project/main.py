@@ -16,7 +16,8 @@ from preprocessing import prepare_data_for_training
 from naive_bayes import NaiveBayesClassifier
 from svm_classifier import SVMClassifier
 from random_forest import RandomForestTextClassifier
-from evaluation import compare_algorithms, plot_confusion_matrices, save_detailed_results
+from evaluation import (compare_algorithms, plot_confusion_matrices, save_detailed_results,
+                        measure_prediction_latency, compare_svm_engines)
 
 
 def load_dataset(dataset_path):
@@ -89,7 +90,11 @@ def main():
         test_size=0.2,
         random_state=42,
         vectorizer_type='tfidf',
-        max_features=10000
+        max_features=10000,
+        token_stream=True,
+        n_jobs=-1,  # preprocesare in paralel pe toate core-urile
+        dataset_path=dataset_path,
+        cache_dir=os.path.join(base_dir, 'data', 'cache')
     )
     
     # Lista pentru rezultate
@@ -115,6 +120,19 @@ def main():
     svm_results['y_test'] = y_test
     results_list.append(svm_results)
     
+    # SVM liniar one-vs-rest (solver primal) comparat cu SVC
+    linear_svm_classifier = SVMClassifier(C=1.0, max_iter=1000, engine='linear')
+    linear_svm_classifier.train(X_train, y_train)
+    linear_svm_accuracy = (linear_svm_classifier.predict_with_scores(X_test)['labels'] == y_test).mean()
+    compare_svm_engines([
+        dict(engine='svc (linear kernel, one-vs-one)', accuracy=svm_results['accuracy'],
+             training_time=svm_classifier.training_time,
+             **measure_prediction_latency(svm_classifier, X_test)),
+        dict(engine='linear (LinearSVC, one-vs-rest)', accuracy=linear_svm_accuracy,
+             training_time=linear_svm_classifier.training_time,
+             **measure_prediction_latency(linear_svm_classifier, X_test))
+    ], output_dir=results_dir)
+    
     # 3. Random Forest
     print("\n" + "="*80)
     print("ALGORITM 3: RANDOM FOREST")
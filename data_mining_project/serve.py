@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Server de productie (prefork) pentru UI
+Modelele sunt incarcate si incalzite o singura data in procesul master; workerii sunt
+creati cu fork si partajeaza paginile modelelor (copy-on-write) si socket-ul de ascultare
+"""
+
+import os
+import sys
+import gc
+import argparse
+import random
+import signal
+import socket
+import time
+from werkzeug.serving import make_server
+
+import app as web_app
+
+
+# Cat asteapta un worker in accept() inainte sa verifice daca trebuie sa se opreasca (secunde)
+ACCEPT_POLL_INTERVAL = 1.0
+
+
+def bind_socket(host, port, backlog=2048):
+    """
+    Creeaza socket-ul de ascultare in master (mostenit de toti workerii)
+
+    Args:
+        host: Adresa de ascultare
+        port: Portul
+        backlog: Lungimea cozii de conexiuni in asteptare
+
+    Returns:
+        Socket-ul legat si in ascultare
+    """
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def freeze_shared_objects():
+    """
+    Muta obiectele incarcate (modele, vectorizer, tabele) in generatia permanenta a GC-ului,
+    ca garbage collector-ul din workeri sa nu le atinga header-ele si sa nu copieze paginile
+    """
+    gc.collect()
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
+
+
+def run_worker(sock, host, port, max_requests):
+    """
+    Bucla unui worker: serveste cereri pe socket-ul partajat pana la max_requests sau SIGTERM
+
+    Args:
+        sock: Socket-ul de ascultare creat in master
+        host: Adresa de ascultare
+        port: Portul
+        max_requests: Numarul de cereri dupa care workerul se opreste si este inlocuit (0 = nelimitat)
+    """
+    stopping = []
+
+    def request_stop(signum, frame):
+        stopping.append(signum)
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C este tratat de master
+
+    # Master-ul nu reincarca modelele: un worker nou (ex: reciclat) porneste direct pe setul de pe disc
+    if web_app.app.config['MODEL_WATCH_INTERVAL'] > 0:
+        try:
+            web_app.reload_models()
+        except Exception as e:
+            print(f"Workerul {os.getpid()} ramane pe modelele incarcate de master: {e}")
+    
+    # Thread-urile (micro-batcher, thread pool, supravegherea modelelor) nu supravietuiesc fork-ului
+    web_app.start_background_workers()
+
+    handled = [0]
+
+    def counting_app(environ, start_response):
+        handled[0] += 1
+        return web_app.app(environ, start_response)
+
+    server = make_server(host, port, counting_app, fd=sock.fileno())
+    # handle_request revine periodic si fara cerere, ca SIGTERM sa fie observat intre cereri
+    server.timeout = ACCEPT_POLL_INTERVAL
+
+    while not stopping and (not max_requests or handled[0] < max_requests):
+        server.handle_request()
+
+    os._exit(0)
+
+
+def spawn_worker(sock, host, port, max_requests):
+    """
+    Creeaza un worker cu fork
+
+    Returns:
+        PID-ul workerului
+    """
+    pid = os.fork()
+    if pid == 0:
+        try:
+            run_worker(sock, host, port, max_requests)
+        finally:
+            os._exit(1)
+    return pid
+
+
+def serve(host='0.0.0.0', port=5001, workers=None, max_requests=0, max_requests_jitter=0):
+    """
+    Incarca modelele in master si ruleaza N workeri, inlocuindu-i pe cei care se opresc
+
+    Args:
+        host: Adresa de ascultare
+        port: Portul
+        workers: Numarul de workeri (implicit numarul de core-uri)
+        max_requests: Cereri servite de un worker inainte sa fie reciclat (0 = nelimitat)
+        max_requests_jitter: Variatie aleatoare adaugata la max_requests, ca workerii sa nu
+            fie reciclati toti odata
+
+    Returns:
+        Codul de iesire
+    """
+    if not hasattr(os, 'fork'):
+        print("Serverul prefork necesita os.fork (Linux/macOS). Pe Windows foloseste: python3 app.py")
+        return 1
+
+    workers = workers or os.cpu_count() or 1
+
+    # Modelele se incarca o singura data, fara thread-uri de fundal (pornite dupa fork)
+    if not web_app.load_models(start_workers=False):
+        print("Nu s-au putut incarca modelele. Ruleaza mai intai: python3 train_models.py")
+        return 1
+
+    sock = bind_socket(host, port)
+    freeze_shared_objects()
+
+    def worker_max_requests():
+        if not max_requests:
+            return 0
+        return max_requests + random.randint(0, max_requests_jitter)
+
+    children = {}
+    for _ in range(workers):
+        children[spawn_worker(sock, host, port, worker_max_requests())] = time.time()
+
+    print(f"Server pornit! {workers} workeri (master PID {os.getpid()}). Acceseaza http://localhost:{port}")
+
+    shutting_down = []
+
+    def request_shutdown(signum, frame):
+        if not shutting_down:
+            print("\nOprire server...")
+        shutting_down.append(signum)
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, request_shutdown)
+    signal.signal(signal.SIGINT, request_shutdown)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.pop(pid, None)
+
+        if shutting_down:
+            continue
+
+        # Worker reciclat (max_requests) sau cazut: este inlocuit cu unul nou, din aceeasi imagine
+        if os.waitstatus_to_exitcode(status) != 0:
+            print(f"Workerul {pid} s-a oprit neasteptat (status {status}); pornesc altul")
+        children[spawn_worker(sock, host, port, worker_max_requests())] = time.time()
+
+    sock.close()
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Server de productie prefork pentru UI')
+    parser.add_argument('--host', default=os.environ.get('HOST', '0.0.0.0'),
+                        help='Adresa de ascultare (implicit: 0.0.0.0)')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', '5001')),
+                        help='Portul (implicit: 5001)')
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_WORKERS', '0')),
+                        help='Numarul de procese worker (implicit: numarul de core-uri)')
+    parser.add_argument('--max-requests', type=int, default=int(os.environ.get('MAX_REQUESTS', '0')),
+                        help='Cereri dupa care un worker este reciclat (0 = nelimitat)')
+    parser.add_argument('--max-requests-jitter', type=int, default=int(os.environ.get('MAX_REQUESTS_JITTER', '0')),
+                        help='Variatie aleatoare adaugata la --max-requests')
+    args = parser.parse_args()
+
+    sys.exit(serve(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        max_requests=args.max_requests,
+        max_requests_jitter=args.max_requests_jitter
+    ))
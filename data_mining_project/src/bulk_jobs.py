@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+Joburi de clasificare in masa pentru arhive zip / tar
+Fiecare job are un director pe disc (arhiva, job.json, results.ndjson, checkpoint.json), deci starea
+este vizibila din orice proces (workerii serve.py, procesul ASGI) si supravietuieste unui restart.
+Un singur proces ruleaza joburile odata (lock pe jobs/.runner.lock); un job intrerupt este reluat
+de la ultimul checkpoint, fara documente pierdute sau duplicate in rezultate.
+Arhiva este stearsa cand jobul se termina; rezultatele raman pana la expirarea perioadei de retentie.
+"""
+
+import os
+import io
+import csv
+import json
+import time
+import fcntl
+import shutil
+import secrets
+import tarfile
+import zipfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+JOB_FILE = 'job.json'
+RESULTS_FILE = 'results.ndjson'
+CHECKPOINT_FILE = 'checkpoint.json'
+CANCEL_FILE = 'cancel'
+RUNNER_LOCK = '.runner.lock'
+UPLOADS_DIR = '.uploads'
+
+JOB_ID_LENGTH = 16  # caractere hex
+RESULT_FORMATS = ('ndjson', 'csv')
+FINISHED_STATUSES = ('completed', 'cancelled', 'failed')
+
+
+def _write_json(path, data):
+    """Scrie un fisier JSON atomic (un proces care citeste vede fie versiunea veche, fie cea noua)"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def is_valid_job_id(job_id):
+    return isinstance(job_id, str) and len(job_id) == JOB_ID_LENGTH and all(c in '0123456789abcdef' for c in job_id)
+
+
+def job_dir(jobs_dir, job_id):
+    if not is_valid_job_id(job_id):
+        return None
+    path = os.path.join(jobs_dir, job_id)
+    return path if os.path.exists(os.path.join(path, JOB_FILE)) else None
+
+
+def _archive_path(path, job):
+    return os.path.join(path, f"archive.{job['archive_format']}")
+
+
+def _remove_archive(path, job):
+    """Arhiva nu mai este necesara dupa ce jobul s-a terminat (rezultatele raman descarcabile)"""
+    archive_path = _archive_path(path, job)
+    if os.path.exists(archive_path):
+        os.remove(archive_path)
+
+
+def new_upload_path(jobs_dir):
+    """Calea unde este scrisa o arhiva in curs de primire (inainte sa devina job)"""
+    uploads_dir = os.path.join(jobs_dir, UPLOADS_DIR)
+    os.makedirs(uploads_dir, exist_ok=True)
+    return os.path.join(uploads_dir, secrets.token_hex(8))
+
+
+def save_upload(chunks, path, max_bytes):
+    """
+    Scrie pe disc o arhiva primita pe bucati
+
+    Args:
+        chunks: Iterabil de bytes (stream-ul cererii)
+        path: Calea fisierului (de la new_upload_path)
+        max_bytes: Dimensiunea maxima a arhivei
+
+    Returns:
+        Numarul de bytes scrisi
+    """
+    size = 0
+    try:
+        with open(path, 'wb') as f:
+            for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise OverflowError(f'Arhiva depaseste dimensiunea maxima ({max_bytes} bytes)')
+                f.write(chunk)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return size
+
+
+def detect_archive_format(path):
+    """'zip' sau 'tar' (tar, tar.gz, tar.bz2, tar.xz), dupa continut"""
+    if zipfile.is_zipfile(path):
+        return 'zip'
+    if tarfile.is_tarfile(path):
+        return 'tar'
+    raise ValueError('Fisierul nu este o arhiva zip sau tar')
+
+
+def is_document_member(name, extensions):
+    """
+    Daca un fisier din arhiva este un document de clasificat
+
+    Args:
+        name: Calea fisierului in arhiva
+        extensions: Extensiile acceptate (fisierele fara extensie sunt text, ca in 20 Newsgroups)
+    """
+    parts = name.replace('\\', '/').split('/')
+    if '__MACOSX' in parts or parts[-1].startswith('.') or not parts[-1]:
+        return False
+    if '.' not in parts[-1]:
+        return True
+    return parts[-1].rsplit('.', 1)[1].lower() in extensions
+
+
+def iter_archive_members(path, fmt, extensions, max_member_bytes, start=0):
+    """
+    Documentele dintr-o arhiva, in ordinea din arhiva (citite din arhiva, fara extragere pe disc)
+
+    Args:
+        path: Calea arhivei
+        fmt: 'zip' sau 'tar'
+        extensions: Extensiile acceptate
+        max_member_bytes: Dimensiunea maxima a unui document (cele mai mari devin erori)
+        start: Numarul de documente sarite (reluare de la checkpoint)
+
+    Yields:
+        (index, nume, bytes sau None daca documentul este prea mare)
+    """
+    index = 0
+    if fmt == 'zip':
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not is_document_member(info.filename, extensions):
+                    continue
+                if index >= start:
+                    data = archive.read(info) if info.file_size <= max_member_bytes else None
+                    yield index, info.filename, data
+                index += 1
+    else:
+        with tarfile.open(path, 'r:*') as archive:
+            for member in archive:
+                if not member.isfile() or not is_document_member(member.name, extensions):
+                    continue
+                if index >= start:
+                    data = archive.extractfile(member).read() if member.size <= max_member_bytes else None
+                    yield index, member.name, data
+                index += 1
+
+
+def count_archive_members(path, fmt, extensions):
+    return sum(1 for _ in iter_archive_members(path, fmt, extensions, max_member_bytes=-1))
+
+
+def create_job(jobs_dir, upload_path, filename, models, extensions, max_member_bytes):
+    """
+    Transforma o arhiva primita intr-un job in coada
+
+    Args:
+        jobs_dir: Directorul cu joburi
+        upload_path: Arhiva salvata cu save_upload (este mutata in directorul jobului)
+        filename: Numele original al arhivei
+        models: Modelele folosite (lista)
+        extensions: Extensiile documentelor acceptate
+        max_member_bytes: Dimensiunea maxima a unui document
+
+    Returns:
+        Starea jobului (ca job_status)
+    """
+    try:
+        fmt = detect_archive_format(upload_path)
+        total = count_archive_members(upload_path, fmt, extensions)
+    except (ValueError, tarfile.TarError, zipfile.BadZipFile, EOFError, OSError) as e:
+        os.remove(upload_path)
+        raise ValueError(f'Arhiva invalida: {str(e)}')
+    if total == 0:
+        os.remove(upload_path)
+        raise ValueError(f"Arhiva nu contine documente ({', '.join(sorted(extensions))} sau fara extensie)")
+
+    job_id = secrets.token_hex(JOB_ID_LENGTH // 2)
+    staging_dir = os.path.join(jobs_dir, f'.staging-{job_id}')
+    os.makedirs(staging_dir)
+    os.replace(upload_path, os.path.join(staging_dir, f'archive.{fmt}'))
+    open(os.path.join(staging_dir, RESULTS_FILE), 'wb').close()
+
+    job = {
+        'id': job_id,
+        'filename': filename,
+        'archive_format': fmt,
+        'models': list(models),
+        'extensions': sorted(extensions),
+        'max_member_bytes': max_member_bytes,
+        'total': total,
+        'status': 'queued',
+        'error': None,
+        'created_at': time.time(),
+        'started_at': None,
+        'finished_at': None
+    }
+    _write_json(os.path.join(staging_dir, JOB_FILE), job)
+    _write_json(os.path.join(staging_dir, CHECKPOINT_FILE), new_checkpoint())
+
+    # Jobul devine vizibil (si poate fi preluat de runner) doar complet scris
+    os.replace(staging_dir, os.path.join(jobs_dir, job_id))
+    return job_status(jobs_dir, job_id)
+
+
+def new_checkpoint():
+    return {'processed': 0, 'classified': 0, 'errors': 0, 'results_bytes': 0, 'elapsed_time': 0.0,
+            'model_versions': [], 'updated_at': time.time()}
+
+
+def job_status(jobs_dir, job_id):
+    """
+    Starea unui job: progres, viteza, timp estimat
+
+    Returns:
+        Dictionar cu starea sau None daca jobul nu exista
+    """
+    path = job_dir(jobs_dir, job_id)
+    if path is None:
+        return None
+    try:
+        job = _read_json(os.path.join(path, JOB_FILE))
+        checkpoint = _read_json(os.path.join(path, CHECKPOINT_FILE))
+    except FileNotFoundError:
+        return None  # sters intre timp (prune_jobs)
+
+    rate = checkpoint['processed'] / checkpoint['elapsed_time'] if checkpoint['elapsed_time'] > 0 else None
+    remaining = job['total'] - checkpoint['processed']
+    job.update({
+        'processed': checkpoint['processed'],
+        'classified': checkpoint['classified'],
+        'errors': checkpoint['errors'],
+        'progress': checkpoint['processed'] / job['total'] if job['total'] else 1.0,
+        'elapsed_time': checkpoint['elapsed_time'],
+        'documents_per_second': rate,
+        'eta_seconds': remaining / rate if rate and job['status'] in ('queued', 'running') else None,
+        'model_versions': checkpoint['model_versions'],
+        'cancel_requested': os.path.exists(os.path.join(path, CANCEL_FILE)),
+        'updated_at': checkpoint['updated_at']
+    })
+    return job
+
+
+def list_jobs(jobs_dir):
+    """Starea tuturor joburilor, cele mai noi primele"""
+    if not os.path.isdir(jobs_dir):
+        return []
+    jobs = [job_status(jobs_dir, name) for name in os.listdir(jobs_dir) if is_valid_job_id(name)]
+    return sorted((job for job in jobs if job is not None), key=lambda job: job['created_at'], reverse=True)
+
+
+def cancel_job(jobs_dir, job_id):
+    """
+    Cere oprirea unui job (runner-ul il opreste dupa batch-ul curent; rezultatele raman descarcabile)
+
+    Returns:
+        Starea jobului sau None daca jobul nu exista
+    """
+    path = job_dir(jobs_dir, job_id)
+    if path is None:
+        return None
+    open(os.path.join(path, CANCEL_FILE), 'a').close()
+    return job_status(jobs_dir, job_id)
+
+
+def prune_jobs(jobs_dir, retention_seconds):
+    """
+    Sterge joburile terminate mai vechi decat perioada de retentie (cu tot cu rezultate) si
+    upload-urile abandonate (arhive primite partial, joburi create doar pe jumatate)
+
+    Args:
+        jobs_dir: Directorul cu joburi
+        retention_seconds: Cat timp raman rezultatele dupa terminarea jobului
+
+    Returns:
+        Numarul de joburi sterse
+    """
+    if not os.path.isdir(jobs_dir):
+        return 0
+    cutoff = time.time() - retention_seconds
+    removed = 0
+    for job in list_jobs(jobs_dir):
+        if job['status'] in FINISHED_STATUSES and (job['finished_at'] or 0) < cutoff:
+            # Redenumirea este atomica: jobul dispare din lista inainte ca fisierele sa fie sterse
+            trash_dir = os.path.join(jobs_dir, f".deleting-{job['id']}")
+            os.replace(os.path.join(jobs_dir, job['id']), trash_dir)
+            shutil.rmtree(trash_dir, ignore_errors=True)
+            removed += 1
+
+    for name in os.listdir(jobs_dir):
+        path = os.path.join(jobs_dir, name)
+        if name.startswith('.deleting-') or (name.startswith('.staging-') and os.path.getmtime(path) < cutoff):
+            shutil.rmtree(path, ignore_errors=True)
+    uploads_dir = os.path.join(jobs_dir, UPLOADS_DIR)
+    if os.path.isdir(uploads_dir):
+        for name in os.listdir(uploads_dir):
+            path = os.path.join(uploads_dir, name)
+            # Un upload in curs isi actualizeaza mtime la fiecare bucata scrisa
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+    return removed
+
+
+def iter_job_results(jobs_dir, job_id, fmt='ndjson'):
+    """
+    Rezultatele unui job pana la ultimul checkpoint (si in timpul rularii)
+
+    Args:
+        jobs_dir: Directorul cu joburi
+        job_id: Id-ul jobului
+        fmt: 'ndjson' (liniile salvate) sau 'csv' (predictia si increderea per model)
+
+    Yields:
+        Bucati de text
+    """
+    if fmt not in RESULT_FORMATS:
+        raise ValueError(f"Format necunoscut: {fmt} (permise: {', '.join(RESULT_FORMATS)})")
+    path = job_dir(jobs_dir, job_id)
+    if path is None:
+        raise KeyError(job_id)
+    job = _read_json(os.path.join(path, JOB_FILE))
+    limit = _read_json(os.path.join(path, CHECKPOINT_FILE))['results_bytes']
+
+    header = ['index', 'name']
+    for name in job['models']:
+        header += [f'{name}_prediction', f'{name}_confidence']
+    header.append('error')
+    if fmt == 'csv':
+        yield _csv_line(header)
+
+    # Doar octetii confirmati de checkpoint (dupa ei poate fi un batch scris pe jumatate)
+    with open(os.path.join(path, RESULTS_FILE), 'rb') as f:
+        remaining = limit
+        lines = []
+        while remaining > 0:
+            line = f.readline(remaining)
+            if not line:
+                break
+            remaining -= len(line)
+            if fmt == 'ndjson':
+                lines.append(line.decode('utf-8'))
+            else:
+                item = json.loads(line)
+                row = [item['index'], item['name']]
+                for name in job['models']:
+                    result = (item.get('results') or {}).get(name)
+                    row += [result['prediction'], result['confidence']] if result else ['', '']
+                row.append(item.get('error', ''))
+                lines.append(_csv_line(row))
+            if len(lines) >= 1000:
+                yield ''.join(lines)
+                lines = []
+        if lines:
+            yield ''.join(lines)
+
+
+def _csv_line(row):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(row)
+    return buffer.getvalue()
+
+
+class JobRunner:
+    """Thread care ruleaza joburile din coada, unul dupa altul, cu un pool limitat pentru batch-uri"""
+
+    def __init__(self, jobs_dir, process_batch, workers=2, batch_size=256, poll_interval=1.0,
+                 retention_seconds=None):
+        """
+        Initializeaza runner-ul (thread-ul porneste cu start())
+
+        Args:
+            jobs_dir: Directorul cu joburi
+            process_batch: Functie (members, models) -> (lista de rezultate per document, versiunea modelelor);
+                members este o lista de (index, nume, bytes sau None)
+            workers: Numarul de batch-uri procesate in paralel
+            batch_size: Numarul de documente per batch
+            poll_interval: Intervalul (secunde) la care se cauta joburi noi (si cele trimise altor procese)
+            retention_seconds: Dupa cat timp sunt sterse joburile terminate (None = pastrate)
+        """
+        self.jobs_dir = jobs_dir
+        self.process_batch = process_batch
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        os.makedirs(jobs_dir, exist_ok=True)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job-batch')
+        self._worker = threading.Thread(target=self._run, name='job-runner', daemon=True)
+
+    def start(self):
+        self._worker.start()
+        return self
+
+    def wake(self):
+        """Anunta un job nou (fara sa se astepte urmatoarea verificare)"""
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self):
+        """Bucla thread-ului de lucru"""
+        while not self._stop.is_set():
+            try:
+                self.run_pending()
+            except Exception as e:
+                print(f"Eroare in runner-ul de joburi: {e}")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def run_pending(self):
+        """Ruleaza joburile din coada si sterge joburile expirate, daca niciun alt proces nu o face deja"""
+        with open(os.path.join(self.jobs_dir, RUNNER_LOCK), 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return  # alt proces ruleaza joburile
+            try:
+                while not self._stop.is_set():
+                    job = self._next_job()
+                    if job is None:
+                        break
+                    self.run_job(job['id'])
+                if self.retention_seconds is not None:
+                    prune_jobs(self.jobs_dir, self.retention_seconds)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _next_job(self):
+        """Un job intrerupt ('running' fara runner: procesul anterior s-a oprit) sau cel mai vechi din coada"""
+        jobs = [job for job in list_jobs(self.jobs_dir) if job['status'] in ('running', 'queued')]
+        if not jobs:
+            return None
+        return min(jobs, key=lambda job: (job['status'] != 'running', job['created_at']))
+
+    def run_job(self, job_id):
+        """
+        Ruleaza (sau reia de la checkpoint) un job
+
+        Args:
+            job_id: Id-ul jobului
+        """
+        path = os.path.join(self.jobs_dir, job_id)
+        job_path = os.path.join(path, JOB_FILE)
+        checkpoint_path = os.path.join(path, CHECKPOINT_FILE)
+        job = _read_json(job_path)
+        checkpoint = _read_json(checkpoint_path)
+
+        if os.path.exists(os.path.join(path, CANCEL_FILE)):
+            # Oprit inainte sa fie preluat
+            job['status'] = 'cancelled'
+            job['finished_at'] = time.time()
+            _write_json(job_path, job)
+            _remove_archive(path, job)
+            return
+
+        if job['status'] == 'running':
+            print(f"Job {job_id} reluat de la documentul {checkpoint['processed']}/{job['total']}")
+        job['status'] = 'running'
+        job['started_at'] = job['started_at'] or time.time()
+        _write_json(job_path, job)
+
+        run_start = time.time()
+        elapsed_before = checkpoint['elapsed_time']
+        cancelled = False
+        try:
+            with open(os.path.join(path, RESULTS_FILE), 'r+b') as results_file:
+                # Ce a fost scris dupa ultimul checkpoint se scrie din nou
+                results_file.truncate(checkpoint['results_bytes'])
+                results_file.seek(checkpoint['results_bytes'])
+
+                def write_batch(future):
+                    results, model_version = future.result()
+                    data = ''.join(json.dumps(item, ensure_ascii=False) + '\n' for item in results).encode('utf-8')
+                    results_file.write(data)
+                    results_file.flush()
+                    os.fsync(results_file.fileno())
+
+                    checkpoint['processed'] += len(results)
+                    checkpoint['errors'] += sum(1 for item in results if 'error' in item)
+                    checkpoint['classified'] = checkpoint['processed'] - checkpoint['errors']
+                    checkpoint['results_bytes'] += len(data)
+                    checkpoint['elapsed_time'] = elapsed_before + time.time() - run_start
+                    checkpoint['updated_at'] = time.time()
+                    if model_version not in checkpoint['model_versions']:
+                        checkpoint['model_versions'].append(model_version)
+                    _write_json(checkpoint_path, checkpoint)
+
+                members = iter_archive_members(
+                    _archive_path(path, job), job['archive_format'],
+                    set(job['extensions']), job['max_member_bytes'], start=checkpoint['processed']
+                )
+                # Batch-urile ruleaza in paralel, dar sunt scrise in ordine (checkpoint = primele N documente)
+                in_flight = deque()
+                batch = []
+                for member in members:
+                    batch.append(member)
+                    if len(batch) < self.batch_size:
+                        continue
+                    in_flight.append(self._executor.submit(self.process_batch, batch, job['models']))
+                    batch = []
+                    if len(in_flight) >= self.workers * 2:
+                        write_batch(in_flight.popleft())
+                    if os.path.exists(os.path.join(path, CANCEL_FILE)) or self._stop.is_set():
+                        cancelled = True
+                        break
+                if batch and not cancelled:
+                    in_flight.append(self._executor.submit(self.process_batch, batch, job['models']))
+                while in_flight:
+                    write_batch(in_flight.popleft())
+
+            if self._stop.is_set() and not os.path.exists(os.path.join(path, CANCEL_FILE)):
+                return  # oprire: jobul ramane 'running' si este reluat la pornire
+            job['status'] = 'cancelled' if cancelled else 'completed'
+        except Exception as e:
+            job['status'] = 'failed'
+            job['error'] = str(e)
+            print(f"Job {job_id} esuat: {e}")
+
+        job['finished_at'] = time.time()
+        _write_json(job_path, job)
+        _remove_archive(path, job)
+
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Inferenta in cascada: modelul ieftin intai, escaladare doar cand nu este sigur
+Naive Bayes -> SVM -> Random Forest; un model ulterior ruleaza doar daca marja
+dintre primele doua clase ale modelului anterior este sub prag
+"""
+
+import numpy as np
+
+
+# Ordinea etapelor (de la cel mai ieftin la cel mai scump model)
+CASCADE_ORDER = ('naive_bayes', 'svm', 'random_forest')
+
+# Praguri implicite de marja; ultima etapa nu are prag
+DEFAULT_THRESHOLDS = {
+    'naive_bayes': 0.5,  # diferenta dintre primele doua probabilitati
+    'svm': 0.5  # diferenta dintre primele doua scoruri de decizie
+}
+
+
+def top_margins(scored):
+    """
+    Marja dintre primele doua clase pentru fiecare document
+
+    Args:
+        scored: Rezultatul predict_with_scores (foloseste 'probabilities' sau 'scores')
+
+    Returns:
+        Vector cu marje (inf daca modelul nu ofera nici probabilitati, nici scoruri)
+    """
+    values = scored.get('probabilities')
+    if values is None:
+        values = scored.get('scores')
+    if values is None:
+        return np.full(len(scored['labels']), np.inf)
+
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1 or values.shape[1] == 1:
+        # Scor binar: marja este distanta fata de hiperplan
+        return np.abs(values.reshape(-1)) * 2
+    top_two = np.sort(values, axis=1)[:, -2:]
+    return top_two[:, 1] - top_two[:, 0]
+
+
+def collect_stage_outputs(classifiers, X):
+    """
+    Etichetele si marjele fiecarei etape pe un set de documente (ex: setul de validare)
+
+    Args:
+        classifiers: Dictionar {nume: wrapper cu predict_with_scores}
+        X: Features
+
+    Returns:
+        Dictionar {nume: {'labels', 'margins'}} in ordinea CASCADE_ORDER
+    """
+    stage_outputs = {}
+    for name in CASCADE_ORDER:
+        if name not in classifiers:
+            continue
+        scored = classifiers[name].predict_with_scores(X, return_scores=True)
+        stage_outputs[name] = {
+            'labels': np.asarray(scored['labels']),
+            'margins': top_margins(scored)
+        }
+    return stage_outputs
+
+
+def simulate_cascade(stage_outputs, thresholds, stage_latency_ms):
+    """
+    Simuleaza cascada pe rezultate deja calculate (set de validare sau de test)
+
+    Args:
+        stage_outputs: Dictionar {nume: {'labels', 'margins'}} in ordinea CASCADE_ORDER
+        thresholds: Dictionar {nume: prag}
+        stage_latency_ms: Dictionar {nume: latenta medie per document (ms)}
+
+    Returns:
+        (etichete finale, latenta medie estimata in ms, fractiunea de documente care ajung la fiecare etapa)
+    """
+    stages = [name for name in CASCADE_ORDER if name in stage_outputs]
+    n_documents = len(stage_outputs[stages[0]]['labels'])
+
+    final_labels = np.empty(n_documents, dtype=np.asarray(stage_outputs[stages[0]]['labels']).dtype)
+    reaching = np.ones(n_documents, dtype=bool)
+    expected_latency = 0.0
+    reach_fraction = {}
+
+    for position, name in enumerate(stages):
+        reach_fraction[name] = float(reaching.mean())
+        expected_latency += reach_fraction[name] * stage_latency_ms[name]
+
+        is_last = position == len(stages) - 1
+        threshold = thresholds.get(name)
+        if is_last or threshold is None:
+            accept = reaching
+        else:
+            accept = reaching & (stage_outputs[name]['margins'] >= threshold)
+        final_labels[accept] = np.asarray(stage_outputs[name]['labels'])[accept]
+        reaching = reaching & ~accept
+        if not reaching.any():
+            for later_name in stages[position + 1:]:
+                reach_fraction[later_name] = 0.0
+            break
+
+    return final_labels, expected_latency, reach_fraction
+
+
+def tune_cascade_thresholds(stage_outputs, y_true, stage_latency_ms, tolerance=0.005, n_quantiles=20):
+    """
+    Alege pragurile cascadei pe un set de validare: cea mai mica latenta estimata
+    cu acuratetea cel mult `tolerance` sub cea mai buna acuratete obtinuta
+
+    Args:
+        stage_outputs: Dictionar {nume: {'labels', 'margins'}}
+        y_true: Etichetele reale
+        stage_latency_ms: Dictionar {nume: latenta medie per document (ms)}
+        tolerance: Pierderea de acuratete acceptata
+        n_quantiles: Numarul de cuantile ale marjelor incercate ca praguri
+
+    Returns:
+        Dictionar cu pragurile alese, acuratetea, latenta si toate compromisurile evaluate
+    """
+    y_true = np.asarray(y_true)
+    stages = [name for name in CASCADE_ORDER if name in stage_outputs]
+    gated = stages[:-1]
+
+    # Pragurile candidate: 0 (nu escaladeaza niciodata), cuantilele marjelor si un prag
+    # peste marja maxima (escaladeaza mereu); valori finite, ca sa poata fi salvate in JSON
+    grids = []
+    for name in gated:
+        margins = np.asarray(stage_outputs[name]['margins'], dtype=np.float64)
+        finite = margins[np.isfinite(margins)]
+        if len(finite):
+            candidates = np.quantile(finite, np.linspace(0, 1, n_quantiles + 1))
+            always = float(finite.max()) + 1.0
+        else:
+            candidates, always = np.array([]), 1.0
+        grids.append(np.unique(np.concatenate([[0.0], candidates, [always]])))
+
+    tradeoffs = []
+    for combination in np.array(np.meshgrid(*grids, indexing='ij')).reshape(len(gated), -1).T:
+        thresholds = {name: round(value, 6) for name, value in zip(gated, combination.tolist())}
+        labels, latency, reach = simulate_cascade(stage_outputs, thresholds, stage_latency_ms)
+        tradeoffs.append({
+            'thresholds': thresholds,
+            'accuracy': float((labels == y_true).mean()),
+            'expected_latency_ms': float(latency),
+            'stage_fractions': reach
+        })
+
+    best_accuracy = max(t['accuracy'] for t in tradeoffs)
+    eligible = [t for t in tradeoffs if t['accuracy'] >= best_accuracy - tolerance]
+    chosen = min(eligible, key=lambda t: (t['expected_latency_ms'], -t['accuracy']))
+
+    # Frontiera Pareto (acuratete vs. latenta), pentru raport
+    pareto = []
+    for tradeoff in sorted(tradeoffs, key=lambda t: (t['expected_latency_ms'], -t['accuracy'])):
+        if not pareto or tradeoff['accuracy'] > pareto[-1]['accuracy']:
+            pareto.append(tradeoff)
+
+    return {
+        'thresholds': chosen['thresholds'],
+        'accuracy': chosen['accuracy'],
+        'expected_latency_ms': chosen['expected_latency_ms'],
+        'stage_fractions': chosen['stage_fractions'],
+        'best_accuracy': best_accuracy,
+        'tolerance': tolerance,
+        'pareto_frontier': pareto
+    }
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Cache pe disc pentru corpusul preprocesat
+Corpusul tokenizat este salvat ca vectori de id-uri de tokeni cu offset-uri in stil CSR,
+adresat dupa hash-ul fisierului de date si setarile preprocesorului
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+
+
+# Se incrementeaza cand se schimba formatul fisierelor din cache
+CACHE_FORMAT_VERSION = 1
+
+
+def file_sha256(path, block_size=1 << 20):
+    """
+    Calculeaza hash-ul SHA-256 al unui fisier
+
+    Args:
+        path: Calea catre fisier
+        block_size: Dimensiunea blocurilor citite
+
+    Returns:
+        Hash-ul in hexazecimal
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def corpus_cache_key(dataset_path, preprocessor, text_column='text'):
+    """
+    Cheia din cache: hash-ul dataset-ului + setarile preprocesorului
+
+    Args:
+        dataset_path: Calea catre fisierul CSV
+        preprocessor: TextPreprocessor folosit
+        text_column: Coloana cu textul
+
+    Returns:
+        Cheia (string hexazecimal)
+    """
+    key_data = {
+        'format_version': CACHE_FORMAT_VERSION,
+        'dataset_sha256': file_sha256(dataset_path),
+        'text_column': text_column,
+        'preprocessor': preprocessor.settings()
+    }
+    key_json = json.dumps(key_data, sort_keys=True)
+    return hashlib.sha256(key_json.encode('utf-8')).hexdigest()[:24]
+
+
+class TokenCorpus:
+    """Corpus tokenizat: id-uri de tokeni + offset-uri per document + vocabular de tokeni"""
+
+    def __init__(self, token_ids, offsets, tokens):
+        """
+        Initializeaza corpusul
+
+        Args:
+            token_ids: Vector cu id-urile tokenilor tuturor documentelor, concatenate
+            offsets: Vector de lungime n_documente + 1; documentul i = token_ids[offsets[i]:offsets[i+1]]
+            tokens: Lista tokenilor (id -> token)
+        """
+        self.token_ids = token_ids
+        self.offsets = offsets
+        self.tokens = tokens
+
+    @classmethod
+    def from_documents(cls, documents):
+        """
+        Construieste corpusul din liste de tokeni
+
+        Args:
+            documents: Lista de liste de tokeni
+
+        Returns:
+            TokenCorpus
+        """
+        token_to_id = {}
+        offsets = np.zeros(len(documents) + 1, dtype=np.int64)
+        ids = []
+        for i, document in enumerate(documents):
+            for token in document:
+                token_id = token_to_id.get(token)
+                if token_id is None:
+                    token_id = token_to_id[token] = len(token_to_id)
+                ids.append(token_id)
+            offsets[i + 1] = len(ids)
+
+        tokens = [None] * len(token_to_id)
+        for token, token_id in token_to_id.items():
+            tokens[token_id] = token
+
+        return cls(np.asarray(ids, dtype=np.int32), offsets, tokens)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return [self.tokens[token_id] for token_id in self.token_ids[start:end]]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def documents(self, as_tokens=False):
+        """
+        Returneaza documentele in formatul asteptat de vectorizer
+
+        Args:
+            as_tokens: Liste de tokeni (True) sau texte preprocesate (False)
+
+        Returns:
+            Lista de documente
+        """
+        if as_tokens:
+            return list(self)
+        return [' '.join(document) for document in self]
+
+    def save(self, directory):
+        """
+        Salveaza corpusul in format .npy (memory-mappable)
+
+        Args:
+            directory: Directorul destinatie
+        """
+        os.makedirs(directory, exist_ok=True)
+        # Tokenii sunt salvati ca un singur bloc UTF-8 separat prin '\n'
+        token_bytes = np.frombuffer('\n'.join(self.tokens).encode('utf-8'), dtype=np.uint8)
+        np.save(os.path.join(directory, 'token_ids.npy'), self.token_ids)
+        np.save(os.path.join(directory, 'offsets.npy'), self.offsets)
+        np.save(os.path.join(directory, 'tokens.npy'), token_bytes)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Incarca un corpus salvat
+
+        Args:
+            directory: Directorul cu fisierele .npy
+            mmap: Daca vectorii sa fie deschisi cu memory mapping
+
+        Returns:
+            TokenCorpus
+        """
+        mmap_mode = 'r' if mmap else None
+        token_ids = np.load(os.path.join(directory, 'token_ids.npy'), mmap_mode=mmap_mode)
+        offsets = np.load(os.path.join(directory, 'offsets.npy'), mmap_mode=mmap_mode)
+        token_bytes = np.load(os.path.join(directory, 'tokens.npy'))
+        tokens = token_bytes.tobytes().decode('utf-8').split('\n') if len(token_bytes) else []
+        return cls(token_ids, offsets, tokens)
+
+
+def load_or_build_corpus(dataset_path, df, preprocessor, cache_dir, text_column='text',
+                         n_jobs=1, chunksize=1000):
+    """
+    Incarca corpusul tokenizat din cache sau il construieste si il salveaza
+
+    Args:
+        dataset_path: Calea catre fisierul CSV din care provine df
+        df: DataFrame-ul citit din dataset_path
+        preprocessor: TextPreprocessor folosit la antrenare
+        cache_dir: Directorul radacina al cache-ului
+        text_column: Coloana cu textul
+        n_jobs: Numarul de procese pentru preprocesare (la construire)
+        chunksize: Numarul de documente per chunk (la construire)
+
+    Returns:
+        TokenCorpus
+    """
+    key = corpus_cache_key(dataset_path, preprocessor, text_column)
+    corpus_dir = os.path.join(cache_dir, f'corpus_{key}')
+
+    if os.path.exists(os.path.join(corpus_dir, 'tokens.npy')):
+        corpus = TokenCorpus.load(corpus_dir)
+        if len(corpus) == len(df):
+            print(f"Corpus preprocesat incarcat din cache: {corpus_dir}")
+            return corpus
+        print("Cache invalid (numar diferit de documente), se reconstruieste...")
+
+    df_processed = preprocessor.preprocess_dataframe(
+        df, text_column, as_tokens=True, n_jobs=n_jobs, chunksize=chunksize
+    )
+    corpus = TokenCorpus.from_documents(df_processed[f'{text_column}_processed'].tolist())
+
+    # Scrie intr-un director temporar si il redenumeste atomic
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix='corpus_tmp_', dir=cache_dir)
+    try:
+        corpus.save(tmp_dir)
+        if os.path.exists(corpus_dir):
+            shutil.rmtree(corpus_dir)
+        os.replace(tmp_dir, corpus_dir)
+        print(f"Corpus preprocesat salvat in cache: {corpus_dir}")
+    except OSError as e:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        print(f"Nu s-a putut salva cache-ul corpusului: {e}")
+
+    return corpus
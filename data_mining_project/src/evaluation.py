@@ -5,6 +5,7 @@ Modul pentru evaluare si comparatie a algoritmilor
 
 import json
 import os
+import time
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -245,3 +246,65 @@ def save_detailed_results(results_list, category_names, output_dir='results'):
     
     print(f"Rezultate detaliate salvate: {json_path}")
 
+
+def measure_prediction_latency(classifier, X, n_single=100):
+    """
+    Masoara latenta de predictie: batch complet si documente individuale
+    
+    Args:
+        classifier: Wrapper antrenat (cu metoda predict_with_scores)
+        X: Features de test
+        n_single: Numarul de documente prezise individual
+        
+    Returns:
+        Dictionar cu timpi
+    """
+    start_time = time.time()
+    classifier.predict_with_scores(X)
+    batch_time = time.time() - start_time
+    
+    n_single = min(n_single, X.shape[0])
+    start_time = time.time()
+    for i in range(n_single):
+        classifier.predict_with_scores(X[i])
+    single_time = time.time() - start_time
+    
+    return {
+        'batch_time': batch_time,
+        'batch_time_per_document_ms': batch_time / X.shape[0] * 1000,
+        'single_document_ms': single_time / max(n_single, 1) * 1000
+    }
+
+
+def compare_svm_engines(engine_results, output_dir='results'):
+    """
+    Compara variantele de SVM (ex: SVC kernel liniar vs. LinearSVC primal one-vs-rest)
+    
+    Args:
+        engine_results: Lista de dictionare cu 'engine', 'accuracy', 'training_time' si latente
+        output_dir: Directorul pentru salvare rezultate
+        
+    Returns:
+        DataFrame cu comparatia
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    
+    df_engines = pd.DataFrame([{
+        'Engine': result['engine'],
+        'Accuracy': result['accuracy'],
+        'Training Time (s)': result['training_time'],
+        'Batch Prediction (ms/doc)': result['batch_time_per_document_ms'],
+        'Single Document Latency (ms)': result['single_document_ms']
+    } for result in engine_results])
+    
+    csv_path = os.path.join(output_dir, 'svm_engine_comparison.csv')
+    df_engines.to_csv(csv_path, index=False)
+    
+    print("\n" + "="*80)
+    print("COMPARATIE ENGINE-URI SVM")
+    print("="*80)
+    print(df_engines.to_string(index=False))
+    print("="*80)
+    print(f"Comparatie salvata: {csv_path}")
+    
+    return df_engines
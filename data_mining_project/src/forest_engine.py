@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Motor compact de inferenta pentru Random Forest
+Arborii sunt aplatizati in vectori NumPy (feature, prag, copii, valori frunze),
+salvati ca .npy (memory-mappable) si parcursi vectorizat direct pe input rar (CSR)
+"""
+
+import os
+import numpy as np
+import scipy.sparse as sp
+
+
+class CompactForest:
+    """Random Forest exportat ca vectori de noduri; expune predict / predict_proba / classes_"""
+
+    ARRAY_NAMES = ('feature', 'threshold', 'children_left', 'children_right', 'value', 'roots', 'classes')
+
+    def __init__(self, feature, threshold, children_left, children_right, value, roots, classes, n_features):
+        """
+        Initializeaza motorul
+
+        Args:
+            feature: Feature-ul testat in fiecare nod (int32; negativ la frunze)
+            threshold: Pragul fiecarui nod (float64)
+            children_left: Indexul global al copilului stang (-1 la frunze)
+            children_right: Indexul global al copilului drept (-1 la frunze)
+            value: Distributia claselor normalizata pe fiecare nod (n_noduri, n_clase)
+            roots: Indexul global al radacinii fiecarui arbore
+            classes: Etichetele claselor (ca classes_ din sklearn)
+            n_features: Numarul de features ale inputului
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.n_features = int(n_features)
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        """
+        Aplatizeaza un RandomForestClassifier antrenat
+
+        Args:
+            forest: RandomForestClassifier antrenat (clasificare single-output)
+
+        Returns:
+            CompactForest
+        """
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            is_leaf = tree.children_left < 0
+            roots.append(offset)
+            features.append(tree.feature.astype(np.int32))
+            thresholds.append(tree.threshold.astype(np.float64))
+            lefts.append(np.where(is_leaf, -1, tree.children_left + offset).astype(np.int32))
+            rights.append(np.where(is_leaf, -1, tree.children_right + offset).astype(np.int32))
+
+            # Ca in DecisionTreeClassifier.predict_proba: distributia normalizata a frunzei
+            value = tree.value[:, 0, :].astype(np.float64)
+            normalizer = value.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(value / normalizer)
+
+            offset += tree.node_count
+
+        return cls(
+            np.concatenate(features),
+            np.concatenate(thresholds),
+            np.concatenate(lefts),
+            np.concatenate(rights),
+            np.vstack(values),
+            np.asarray(roots, dtype=np.int32),
+            np.asarray(forest.classes_),
+            forest.n_features_in_
+        )
+
+    @property
+    def n_estimators(self):
+        return len(self.roots)
+
+    def _apply(self, X):
+        """
+        Gaseste frunza fiecarui document in fiecare arbore
+
+        Args:
+            X: Matrice CSR (n_documente, n_features)
+
+        Returns:
+            Matrice (n_documente, n_arbori) cu indexul global al frunzelor
+        """
+        X = sp.csr_matrix(X)
+        if not X.has_sorted_indices:
+            X = X.copy()
+            X.sort_indices()
+        n_rows = X.shape[0]
+
+        # Chei globale (rand * n_features + coloana), sortate crescator in format CSR
+        entry_rows = np.repeat(np.arange(n_rows, dtype=np.int64), np.diff(X.indptr))
+        keys = entry_rows * self.n_features + X.indices
+        data = X.data.astype(np.float32)  # sklearn compara features in float32
+
+        row_offsets = (np.arange(n_rows, dtype=np.int64) * self.n_features)[:, None]
+        nodes = np.tile(np.asarray(self.roots, dtype=np.int64), (n_rows, 1))
+
+        while True:
+            left = self.children_left[nodes]
+            active = left >= 0
+            if not active.any():
+                return nodes
+
+            # Valoarea feature-ului testat (0 daca lipseste din matricea rara)
+            feature = np.maximum(self.feature[nodes], 0)
+            query = row_offsets + feature
+            if len(keys):
+                position = np.minimum(np.searchsorted(keys, query), len(keys) - 1)
+                x_value = np.where(keys[position] == query, data[position], np.float32(0.0))
+            else:
+                x_value = np.zeros(query.shape, dtype=np.float32)
+
+            go_left = x_value <= self.threshold[nodes]
+            next_nodes = np.where(go_left, left, self.children_right[nodes])
+            nodes = np.where(active, next_nodes, nodes)
+
+    def predict_proba(self, X, batch_size=256):
+        """
+        Probabilitatile claselor (media distributiilor frunzelor peste arbori)
+
+        Args:
+            X: Matrice rara (n_documente, n_features)
+            batch_size: Numarul de documente parcurse odata
+
+        Returns:
+            Matrice (n_documente, n_clase)
+        """
+        X = sp.csr_matrix(X)
+        probabilities = np.empty((X.shape[0], len(self.classes_)), dtype=np.float64)
+        for start in range(0, X.shape[0], batch_size):
+            leaves = self._apply(X[start:start + batch_size])
+            probabilities[start:start + batch_size] = self.value[leaves].sum(axis=1) / self.n_estimators
+        return probabilities
+
+    def predict(self, X):
+        """
+        Predictii (clasa cu probabilitatea maxima)
+
+        Args:
+            X: Matrice rara (n_documente, n_features)
+
+        Returns:
+            Vector cu etichete
+        """
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def save(self, directory):
+        """
+        Salveaza vectorii ca fisiere .npy
+
+        Args:
+            directory: Directorul destinatie
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in self.ARRAY_NAMES:
+            array = self.classes_ if name == 'classes' else getattr(self, name)
+            np.save(os.path.join(directory, f'{name}.npy'), np.asarray(array))
+        np.save(os.path.join(directory, 'n_features.npy'), np.asarray([self.n_features], dtype=np.int64))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Incarca un motor salvat
+
+        Args:
+            directory: Directorul cu fisierele .npy
+            mmap: Daca vectorii sa fie deschisi cu memory mapping (partajati intre procese)
+
+        Returns:
+            CompactForest
+        """
+        mmap_mode = 'r' if mmap else None
+        arrays = {
+            name: np.load(os.path.join(directory, f'{name}.npy'),
+                          mmap_mode=None if name == 'classes' else mmap_mode)
+            for name in cls.ARRAY_NAMES
+        }
+        n_features = int(np.load(os.path.join(directory, 'n_features.npy'))[0])
+        return cls(n_features=n_features, **arrays)
@@ -0,0 +1,591 @@
+#!/usr/bin/env python3
+"""
+Pipeline de inferenta reutilizabil pentru UI
+Construit o singura data la incarcarea modelelor si folosit pentru fiecare cerere
+"""
+
+import time
+import threading
+
+from preprocessing import TextPreprocessor, uses_token_stream
+from linear_scoring import FusedLinearScorer
+from cascade import CASCADE_ORDER, DEFAULT_THRESHOLDS, top_margins
+from naive_bayes import NaiveBayesClassifier
+from svm_classifier import SVMClassifier
+from random_forest import RandomForestTextClassifier
+
+
+# Text folosit pentru predictia de incalzire inainte ca serverul sa fie gata
+WARMUP_TEXT = "The quick brown fox jumps over the lazy dog while computers process graphics."
+
+# Ponderea ultimei masuratori in media exponentiala a timpilor per model
+TIMING_EWMA_ALPHA = 0.2
+
+# Eticheta grupului de modele scorate impreuna (FusedLinearScorer) in istoricul timpilor
+FUSED_UNIT = 'fused'
+
+# Dupa cate secunde se reincearca incarcarea unui model esuat (eroarea poate fi trecatoare)
+LOAD_RETRY_INTERVAL = 30.0
+
+# Wrapper-ul folosit pentru fiecare model salvat de train_models.py
+MODEL_WRAPPERS = {
+    'naive_bayes': NaiveBayesClassifier,
+    'svm': SVMClassifier,
+    'random_forest': RandomForestTextClassifier
+}
+
+
+class ModelsUnavailableError(RuntimeError):
+    """Niciunul dintre modelele cerute nu este incarcat si nici nu a putut fi incarcat"""
+
+
+class InferencePipeline:
+    """Pipeline de inferenta: preprocesor, vectorizer, modele si nume de afisare"""
+
+    def __init__(self, vectorizer, models, category_names, display_names=None, preprocessor=None,
+                 version=None, executor=None, cascade_thresholds=None, model_loaders=None):
+        """
+        Initializeaza pipeline-ul
+
+        Args:
+            vectorizer: Vectorizer-ul antrenat
+            models: Dictionar {nume_algoritm: model antrenat}
+            category_names: Lista cu numele originale ale categoriilor (dupa id)
+            display_names: Lista cu numele formatate ale categoriilor (dupa id)
+            preprocessor: TextPreprocessor deja construit (optional)
+            version: Versiunea setului de modele (folosita de cache si in raspunsuri)
+            executor: ThreadPoolExecutor partajat pentru scorarea modelelor in paralel (optional;
+                fara el modelele ruleaza unul dupa altul)
+            cascade_thresholds: Pragurile implicite ale cascadei pentru acest set de modele
+                (implicit DEFAULT_THRESHOLDS)
+            model_loaders: Dictionar {nume_algoritm: functie -> model} pentru modelele incarcate
+                abia la prima folosire (optional)
+        """
+        self.preprocessor = preprocessor or TextPreprocessor(use_stemming=True, use_stopwords=True)
+        self.vectorizer = vectorizer
+        self.token_stream = uses_token_stream(vectorizer)
+        self.model_loaders = dict(model_loaders or {})
+        # Toate modelele care pot fi folosite, in ordinea din raspunsuri (incarcate sau nu)
+        self.available_models = list(models) + [name for name in self.model_loaders if name not in models]
+        # {nume_algoritm: (eroare, momentul esecului)}; incarcarea se reincearca dupa LOAD_RETRY_INTERVAL
+        self.load_errors = {}
+        self.load_times = {}
+        self._load_lock = threading.Lock()
+        self._warmup_X = None
+        self._set_loaded_models(dict(models))
+        self.category_names = list(category_names)
+        self.display_names = list(display_names) if display_names is not None else list(category_names)
+        self.version = version
+        self.executor = executor
+        self.cascade_thresholds = dict(DEFAULT_THRESHOLDS, **(cascade_thresholds or {}))
+        # Istoricul timpilor (medie exponentiala, secunde per document) pentru bugetul de latenta
+        self.timing_history = {}
+        self.is_ready = False
+
+    def _set_loaded_models(self, models):
+        """Inlocuieste (copy-on-write) modelele incarcate, wrapper-ele si scorarea fuzionata"""
+        # Wrapper-e cu protocolul predict_with_scores (eticheta + probabilitati dintr-o evaluare)
+        classifiers = {name: MODEL_WRAPPERS[name].from_model(model) for name, model in models.items()}
+        # Modelele liniare (NB, SVM liniar) sunt scorate impreuna, cu o singura inmultire
+        fused_scorer = FusedLinearScorer(models)
+        # Cererile in curs pot citi oricare versiune: seturile noi le includ mereu pe cele vechi
+        self.classifiers = classifiers
+        self.fused_scorer = fused_scorer if len(fused_scorer) else None
+        self.models = models
+
+    def ensure_models(self, names=None):
+        """
+        Incarca la prima folosire modelele cerute (cele care lipsesc sau nu se pot incarca sunt ignorate;
+        un model esuat ramane disponibil si este reincarcat la o cerere dupa LOAD_RETRY_INTERVAL)
+
+        Args:
+            names: Numele modelelor (implicit toate modelele disponibile)
+
+        Returns:
+            Numele modelelor gata de folosit, in ordinea available_models
+        """
+        requested = self.available_models if names is None else names
+        if any(self._needs_loading(name, self.models) for name in requested):
+            with self._load_lock:
+                loaded = dict(self.models)
+                new_names = []
+                for name in requested:
+                    if not self._needs_loading(name, loaded):
+                        continue
+                    load_start = time.time()
+                    try:
+                        loaded[name] = self.model_loaders[name]()
+                    except Exception as e:
+                        self.load_errors[name] = (str(e), time.time())
+                        print(f"Modelul {name} nu a putut fi incarcat: {e}")
+                        continue
+                    self.load_errors.pop(name, None)
+                    self.load_times[name] = time.time() - load_start
+                    new_names.append(name)
+                if new_names:
+                    self._set_loaded_models(loaded)
+                    self._warm_models(new_names)
+        return [name for name in self.available_models if name in requested and name in self.models]
+
+    def _needs_loading(self, name, loaded):
+        if name in loaded or name not in self.model_loaders:
+            return False
+        failure = self.load_errors.get(name)
+        return failure is None or time.time() - failure[1] >= LOAD_RETRY_INTERVAL
+
+    def unavailable_error(self, names):
+        """Eroarea pentru o cerere in care niciun model cerut nu a putut fi folosit"""
+        details = [f"{name}: {self.load_errors[name][0]}" for name in names if name in self.load_errors]
+        message = "Niciunul dintre modelele cerute nu a putut fi incarcat"
+        return ModelsUnavailableError(f"{message} ({'; '.join(details)})" if details else message)
+
+    def _warm_models(self, names):
+        """Incalzeste modelele abia incarcate si le initializeaza istoricul timpilor"""
+        if self._warmup_X is None:
+            return
+        for name in names:
+            # Primul apel plateste alocarile; al doilea da un timp reprezentativ
+            self.classifiers[name].predict_with_scores(self._warmup_X)
+            self.record_timing(name, self.classifiers[name].predict_with_scores(self._warmup_X)['prediction_time'])
+        if self.fused_scorer is not None and any(name in self.fused_scorer.model_names for name in names):
+            self.record_timing(FUSED_UNIT, self.fused_scorer.score(self._warmup_X)[1])
+
+    def warmup(self, text=WARMUP_TEXT):
+        """
+        Ruleaza o predictie de incalzire (cache-uri, importuri lazy, alocari) cu modelele deja incarcate
+
+        Args:
+            text: Textul folosit pentru incalzire
+
+        Returns:
+            Durata incalzirii in secunde
+        """
+        start_time = time.time()
+        loaded = list(self.models)
+        if loaded:
+            self.predict(text, models=loaded)
+            # Si fiecare model separat (etapele cascadei), ca istoricul timpilor sa fie complet
+            self.predict_cascade(text, thresholds={name: float('inf') for name in loaded}, models=loaded)
+        # Modelele incarcate mai tarziu sunt incalzite pe acelasi document
+        self._warmup_X = self.vectorizer.transform([self.preprocess(text)])
+        self.is_ready = True
+        return time.time() - start_time
+
+    def preprocess(self, text):
+        """
+        Preproceseaza un text in formatul asteptat de vectorizer
+
+        Args:
+            text: Textul brut
+
+        Returns:
+            Lista de tokeni (vectorizer cu TokenNgramAnalyzer) sau textul preprocesat
+        """
+        if self.token_stream:
+            return self.preprocessor.tokenize(text)
+        return self.preprocessor.preprocess_text(text)
+
+    def record_timing(self, unit, seconds):
+        """
+        Actualizeaza media exponentiala a timpului unui model (sau a grupului fuzionat)
+        pe baza unei predictii pentru un singur document
+
+        Args:
+            unit: Numele modelului sau FUSED_UNIT
+            seconds: Durata apelului
+        """
+        previous = self.timing_history.get(unit)
+        if previous is None:
+            self.timing_history[unit] = seconds
+        else:
+            self.timing_history[unit] = (1 - TIMING_EWMA_ALPHA) * previous + TIMING_EWMA_ALPHA * seconds
+
+    def expected_time(self, unit, n_documents=1):
+        """
+        Timpul estimat al unui model din istoric (0 daca modelul nu a rulat inca)
+
+        Args:
+            unit: Numele modelului sau FUSED_UNIT
+            n_documents: Numarul de documente de scorat
+
+        Returns:
+            Durata estimata in secunde
+        """
+        return self.timing_history.get(unit, 0.0) * n_documents
+
+    def predict(self, text, deadline=None, document=None, models=None):
+        """
+        Face predictii pentru un text folosind toti algoritmii (sau doar cei alesi)
+
+        Args:
+            text: Textul de clasificat
+            deadline: Momentul (time.time()) pana la care trebuie sa se termine predictia (optional)
+            document: Textul deja preprocesat cu preprocess() (optional)
+            models: Numele modelelor folosite (implicit toate cele disponibile)
+
+        Returns:
+            (results, performance_metrics)
+        """
+        documents = [document] if document is not None else None
+        batch_results, performance_metrics = self.predict_batch([text], documents, deadline=deadline, models=models)
+        return batch_results[0], performance_metrics
+
+    def predict_batch(self, texts, documents=None, deadline=None, models=None):
+        """
+        Face predictii pentru mai multe texte: un singur transform si un singur apel per model
+
+        Args:
+            texts: Lista de texte de clasificat
+            documents: Textele deja preprocesate cu preprocess() (optional; elementele None
+                sunt preprocesate aici)
+            deadline: Momentul (time.time()) pana la care trebuie sa se termine predictia;
+                modelele care nu ar incapea in timpul ramas sunt sarite (optional)
+            models: Numele modelelor folosite (implicit toate cele disponibile)
+
+        Returns:
+            (lista de results per document, performance_metrics agregat pe batch)
+
+        Raises:
+            ModelsUnavailableError: daca niciunul dintre modelele cerute nu a putut fi incarcat
+        """
+        performance_metrics = {
+            'preprocessing_time': 0,
+            'vectorization_time': 0,
+            'total_time': 0,
+            'algorithms': {},
+            'model_version': self.version
+        }
+
+        total_start = time.time()
+
+        # Preprocesare text
+        preprocess_start = time.time()
+        if documents is None:
+            documents = [self.preprocess(text) for text in texts]
+        elif any(document is None for document in documents):
+            documents = [self.preprocess(text) if document is None else document
+                         for text, document in zip(texts, documents)]
+        performance_metrics['preprocessing_time'] = time.time() - preprocess_start
+
+        # Vectorizare
+        vectorize_start = time.time()
+        X = self.vectorizer.transform(documents)
+        performance_metrics['vectorization_time'] = time.time() - vectorize_start
+
+        # Modelele cerute care nu au fost folosite inca se incarca acum (o singura data)
+        model_names = self.ensure_models(models)
+        if not model_names:
+            raise self.unavailable_error(self.available_models if models is None else models)
+        scored_models = self.score_models(X, performance_metrics, deadline=deadline, model_names=model_names)
+        batch_results = self.format_batch(scored_models, len(texts))
+
+        performance_metrics['total_time'] = time.time() - total_start
+
+        return batch_results, performance_metrics
+
+    def predict_cascade(self, text, thresholds=None, document=None, deadline=None, models=None):
+        """
+        Predictie in cascada: Naive Bayes intai, SVM si Random Forest doar daca
+        marja dintre primele doua clase ale etapei anterioare este sub prag
+
+        Args:
+            text: Textul de clasificat
+            thresholds: Dictionar {nume_algoritm: prag de marja} (peste cascade_thresholds)
+            document: Textul deja preprocesat cu preprocess() (optional)
+            deadline: Momentul (time.time()) pana la care trebuie sa se termine predictia;
+                cascada se opreste inaintea unei etape care nu ar incapea (optional)
+            models: Etapele permise (implicit toate modelele disponibile); fiecare model este
+                incarcat abia cand cascada ajunge la el
+
+        Returns:
+            (results cu etapele rulate, performance_metrics cu sectiunea 'cascade')
+        """
+        thresholds = dict(self.cascade_thresholds, **(thresholds or {}))
+        performance_metrics = {
+            'preprocessing_time': 0,
+            'vectorization_time': 0,
+            'total_time': 0,
+            'algorithms': {},
+            'model_version': self.version
+        }
+
+        total_start = time.time()
+
+        preprocess_start = time.time()
+        if document is None:
+            document = self.preprocess(text)
+        performance_metrics['preprocessing_time'] = time.time() - preprocess_start
+
+        vectorize_start = time.time()
+        X = self.vectorizer.transform([document])
+        performance_metrics['vectorization_time'] = time.time() - vectorize_start
+
+        allowed = self.available_models if models is None else models
+        stages = [name for name in CASCADE_ORDER if name in allowed and name in self.available_models]
+        scored_models = {}
+        margins = {}
+        final_algorithm = None
+        budget_exhausted = False
+
+        for position, name in enumerate(stages):
+            expected = self.expected_time(name)
+            if final_algorithm is not None and deadline is not None and time.time() + expected > deadline:
+                # Bugetul nu mai permite etapa (prima etapa ruleaza mereu): ramane predictia etapei anterioare
+                budget_exhausted = True
+                break
+            if not self.ensure_models([name]):
+                # Modelul nu a putut fi incarcat: cascada continua cu etapa urmatoare
+                continue
+
+            scored = self.classifiers[name].predict_with_scores(X, return_scores=True)
+            self.record_timing(name, scored['prediction_time'])
+            scored_models[name] = scored
+            margins[name] = float(top_margins(scored)[0])
+            performance_metrics['algorithms'][name] = {
+                'prediction_time': scored['prediction_time'],
+                'prediction_time_ms': scored['prediction_time'] * 1000,
+                'fused': False
+            }
+            final_algorithm = name
+
+            # Etapa este sigura: modelele mai scumpe nu mai ruleaza
+            is_last = position == len(stages) - 1
+            if is_last or margins[name] >= thresholds.get(name, float('inf')):
+                break
+
+        if final_algorithm is None:
+            raise self.unavailable_error(stages)
+
+        results = self.format_batch(scored_models, 1)[0]
+        performance_metrics['cascade'] = {
+            'stages': list(scored_models),
+            'skipped': [name for name in stages if name not in scored_models],
+            'final_algorithm': final_algorithm,
+            'prediction': results[final_algorithm]['prediction'],
+            'margins': margins,
+            'thresholds': {name: thresholds[name] for name in stages[:-1] if name in thresholds},
+            'budget_exhausted': budget_exhausted
+        }
+        performance_metrics['total_time'] = time.time() - total_start
+
+        return results, performance_metrics
+
+    def scoring_units(self, n_documents=1, deadline=None, names=None):
+        """
+        Unitatile de scorare (grupul fuzionat si fiecare model ramas)
+
+        Args:
+            n_documents: Numarul de documente de scorat
+            deadline: Daca este dat, unitatile sunt ordonate dupa timpul estimat (cele ieftine intai)
+            names: Modelele de scorat, deja incarcate (implicit toate modelele incarcate)
+
+        Returns:
+            Lista de (unitate, [nume modele])
+        """
+        names = list(self.models) if names is None else names
+        fused_scorer = self.fused_scorer
+        fused_names = []
+        if fused_scorer is not None:
+            fused_names = [name for name in fused_scorer.model_names if name in names]
+            # Trecerea comuna scoreaza toate modelele fuzionate: pentru unul singur din mai multe
+            # este mai ieftin apelul direct
+            if len(fused_names) < min(2, len(fused_scorer)):
+                fused_names = []
+        units = [(FUSED_UNIT, fused_names)] if fused_names else []
+        units += [(name, [name]) for name in names if name not in fused_names]
+        if deadline is not None:
+            units.sort(key=lambda unit: self.expected_time(unit[0], n_documents))
+        return units
+
+    def score_unit(self, unit, names, X):
+        """
+        Scoreaza o unitate (grupul fuzionat sau un model)
+
+        Args:
+            unit: Numele modelului sau FUSED_UNIT
+            names: Modelele acoperite de unitate
+            X: Matrice rara (n_documente, n_features)
+
+        Returns:
+            (dictionar {nume: scoruri}, durata unitatii in secunde, timp CPU al thread-ului in secunde)
+        """
+        # Timpul CPU al thread-ului nu include asteptarea dupa GIL cand unitatile ruleaza in paralel
+        cpu_start = time.thread_time()
+        if unit == FUSED_UNIT:
+            # Scorare fuzionata: o singura trecere pentru toate modelele liniare
+            fused_results, fused_time = self.fused_scorer.score(X)
+            scored = {}
+            for name in names:
+                scored[name] = dict(fused_results[name])
+                # Timpul trecerii comune este atribuit fiecarui model fuzionat
+                scored[name]['prediction_time'] = fused_time
+            return scored, fused_time, time.thread_time() - cpu_start
+
+        scored = self.classifiers[unit].predict_with_scores(X)
+        return {unit: scored}, scored['prediction_time'], time.thread_time() - cpu_start
+
+    def score_models(self, X, performance_metrics, deadline=None, model_names=None):
+        """
+        Scoreaza matricea X cu toate modelele (modelele liniare intr-o singura trecere)
+        Daca pipeline-ul are un executor, unitatile ruleaza in paralel pe thread-urile lui
+
+        Args:
+            X: Matrice rara (n_documente, n_features)
+            performance_metrics: Dictionarul de metrici completat cu timpii per algoritm
+            deadline: Momentul (time.time()) pana la care trebuie sa se termine scorarea (optional)
+            model_names: Modelele de scorat, deja incarcate (implicit toate modelele incarcate)
+
+        Returns:
+            Dictionar {nume: {'labels', 'probabilities', 'prediction_time'}}; modelele sarite
+            din cauza bugetului au {'skipped': True, 'expected_time'} (unitatea cea mai ieftina
+            nu este sarita niciodata)
+        """
+        n_documents = X.shape[0]
+        scored_models = {}
+        scoring_start = time.time()
+
+        def skip(unit, names, expected):
+            # Modelul nu mai incape in timpul ramas: este marcat ca sarit, fara sa depaseasca termenul
+            for name in names:
+                scored_models[name] = {'skipped': True, 'expected_time': expected}
+                performance_metrics['algorithms'][name] = {
+                    'skipped': True,
+                    'expected_time_ms': expected * 1000,
+                    'fused': unit == FUSED_UNIT
+                }
+
+        def collect(unit, names, scored, unit_time, cpu_time):
+            scored_models.update(scored)
+            if unit == FUSED_UNIT:
+                performance_metrics['fused_scoring_time'] = unit_time
+            # Batch-urile amortizeaza costul fix; istoricul foloseste doar predictiile individuale
+            if n_documents == 1:
+                self.record_timing(unit, unit_time)
+            for name in names:
+                performance_metrics['algorithms'][name] = {
+                    'prediction_time': scored[name]['prediction_time'],
+                    'prediction_time_ms': scored[name]['prediction_time'] * 1000,
+                    'cpu_time_ms': cpu_time * 1000,
+                    'fused': unit == FUSED_UNIT
+                }
+
+        model_names = list(self.models) if model_names is None else model_names
+        units = self.scoring_units(n_documents, deadline, model_names)
+        submitted = 0  # Unitatile trimise executorului (rulate in paralel)
+
+        def fits(position, expected):
+            # Cu buget, unitatile sunt ordonate dupa cost: prima (cea mai ieftina) ruleaza mereu,
+            # ca raspunsul sa aiba cel putin o predictie (ca prima etapa a cascadei)
+            return deadline is None or position == 0 or time.time() + expected <= deadline
+
+        if self.executor is not None and len(units) > 1:
+            # Unitatile ruleaza simultan: fiecare trebuie sa incapa singura in timpul ramas
+            futures = []
+            for position, (unit, names) in enumerate(units):
+                expected = self.expected_time(unit, n_documents)
+                if fits(position, expected):
+                    futures.append((unit, names, self.executor.submit(self.score_unit, unit, names, X)))
+                else:
+                    skip(unit, names, expected)
+            submitted = len(futures)
+            for unit, names, future in futures:
+                collect(unit, names, *future.result())
+        else:
+            for position, (unit, names) in enumerate(units):
+                expected = self.expected_time(unit, n_documents)
+                if fits(position, expected):
+                    collect(unit, names, *self.score_unit(unit, names, X))
+                else:
+                    skip(unit, names, expected)
+
+        # Timpul real al scorarii (in paralel este mai mic decat suma timpilor per model)
+        performance_metrics['scoring_wall_time'] = time.time() - scoring_start
+        performance_metrics['concurrent'] = submitted > 1
+
+        if deadline is not None:
+            performance_metrics['skipped_models'] = [
+                name for name, scored in scored_models.items() if scored.get('skipped')
+            ]
+
+        # Ordinea modelelor din raspuns ramane cea de la incarcare
+        return {name: scored_models[name] for name in model_names}
+
+    def format_batch(self, scored_models, n_documents):
+        """
+        Construieste rezultatele per document din scorurile modelelor
+
+        Args:
+            scored_models: Rezultatul score_models
+            n_documents: Numarul de documente scorate
+
+        Returns:
+            Lista de dictionare {nume_algoritm: rezultat formatat}, cate unul per document
+        """
+        batch_results = [{} for _ in range(n_documents)]
+
+        for name, scored in scored_models.items():
+            if scored.get('skipped'):
+                for i in range(n_documents):
+                    batch_results[i][name] = self.format_skipped(scored['expected_time'] / max(n_documents, 1))
+                continue
+
+            # Timpul modelului este impartit egal intre documentele din batch
+            prediction_time = scored['prediction_time'] / max(n_documents, 1)
+            for i in range(n_documents):
+                prediction_id = int(scored['labels'][i])
+
+                # Probabilitati (daca sunt disponibile)
+                if scored['probabilities'] is not None:
+                    prob_values = {j: float(prob) for j, prob in enumerate(scored['probabilities'][i])}
+                else:
+                    prob_values = {prediction_id: 1.0}
+
+                batch_results[i][name] = self.format_result(prediction_id, prob_values, prediction_time)
+
+        return batch_results
+
+    def format_skipped(self, expected_time, reason='latency_budget'):
+        """
+        Rezultatul unui algoritm care nu a rulat (aceleasi chei ca format_result)
+
+        Args:
+            expected_time: Timpul estimat al modelului in secunde
+            reason: Motivul pentru care modelul a fost sarit
+
+        Returns:
+            Dictionar cu rezultatul in formatul API-ului
+        """
+        return {
+            'skipped': True,
+            'skip_reason': reason,
+            'expected_time_ms': expected_time * 1000,
+            'prediction': None,
+            'prediction_original': None,
+            'prediction_id': None,
+            'probabilities': {},
+            'confidence': 0.0,
+            'prediction_time': 0,
+            'prediction_time_ms': 0
+        }
+
+    def format_result(self, prediction_id, prob_values, prediction_time):
+        """
+        Construieste rezultatul unui algoritm folosind numele precalculate
+
+        Args:
+            prediction_id: Id-ul categoriei prezise
+            prob_values: Dictionar {id_categorie: probabilitate}
+            prediction_time: Timpul de predictie in secunde
+
+        Returns:
+            Dictionar cu rezultatul in formatul API-ului
+        """
+        return {
+            'prediction': self.display_names[prediction_id],
+            'prediction_original': self.category_names[prediction_id],  # Pastreaza originalul pentru referinta
+            'prediction_id': prediction_id,
+            'probabilities': {self.display_names[i]: p for i, p in prob_values.items()},
+            'confidence': float(max(prob_values.values())),
+            'prediction_time': prediction_time,
+            'prediction_time_ms': prediction_time * 1000  # In milisecunde
+        }
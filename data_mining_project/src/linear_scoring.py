@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Scorare fuzionata pentru modelele liniare
+Naive Bayes multinomial si SVM-ul liniar sunt amandoua o matrice de ponderi si un bias
+aplicate aceluiasi vector TF-IDF, deci pot fi scorate impreuna cu o singura inmultire
+"""
+
+import time
+import numpy as np
+
+
+def _linear_block(model):
+    """
+    Extrage ponderile si bias-ul unui model liniar, daca modelul poate fi fuzionat
+
+    Args:
+        model: Model sklearn antrenat
+
+    Returns:
+        (tip, W de forma (n_features, k), b de forma (k,)) sau None
+    """
+    # MultinomialNB: log P(c|x) ~ x * feature_log_prob_.T + class_log_prior_
+    if hasattr(model, 'feature_log_prob_') and hasattr(model, 'class_log_prior_'):
+        return 'naive_bayes', model.feature_log_prob_.T, model.class_log_prior_
+
+    # Modele liniare one-vs-rest fara probabilitati (LinearSVC, SGDClassifier cu hinge).
+    # SVC (one-vs-one, cu vectori suport) si modelele cu predict_proba raman pe calea normala.
+    if (hasattr(model, 'coef_') and hasattr(model, 'intercept_')
+            and not hasattr(model, 'support_vectors_') and not hasattr(model, 'predict_proba')):
+        coef = np.asarray(model.coef_)
+        intercept = np.atleast_1d(model.intercept_)
+        if coef.shape[0] == 1:
+            # Caz binar: scorurile (-s, s) dau aceeasi decizie ca semnul lui s
+            return 'linear', np.vstack([-coef, coef]).T, np.concatenate([-intercept, intercept])
+        return 'linear', coef.T, intercept
+
+    return None
+
+
+class FusedLinearScorer:
+    """Scoreaza toate modelele liniare cu o singura inmultire matrice rara x matrice densa"""
+
+    def __init__(self, models):
+        """
+        Construieste matricea de ponderi concatenata
+
+        Args:
+            models: Dictionar {nume_algoritm: model sklearn antrenat}
+        """
+        weights = []
+        biases = []
+        self.blocks = {}
+        offset = 0
+
+        for name, model in models.items():
+            block = _linear_block(model)
+            if block is None:
+                continue
+            kind, W, b = block
+            n_outputs = W.shape[1]
+            weights.append(np.asarray(W, dtype=np.float64))
+            biases.append(np.asarray(b, dtype=np.float64))
+            self.blocks[name] = {
+                'kind': kind,
+                'slice': slice(offset, offset + n_outputs),
+                'classes': np.asarray(model.classes_)
+            }
+            offset += n_outputs
+
+        if weights:
+            self.weights = np.ascontiguousarray(np.hstack(weights))
+            self.bias = np.concatenate(biases)
+        else:
+            self.weights = None
+            self.bias = None
+
+    @property
+    def model_names(self):
+        """Numele modelelor acoperite de scorarea fuzionata"""
+        return list(self.blocks)
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def score(self, X):
+        """
+        Scoreaza un document sau un batch pentru toate modelele fuzionate
+
+        Args:
+            X: Matrice rara (n_documente, n_features)
+
+        Returns:
+            (rezultate, durata): rezultate = {nume: {'labels', 'probabilities' (sau None), 'scores'}}
+        """
+        start_time = time.time()
+
+        all_scores = np.asarray(X @ self.weights) + self.bias
+
+        results = {}
+        for name, block in self.blocks.items():
+            scores = all_scores[:, block['slice']]
+            labels = block['classes'][np.argmax(scores, axis=1)]
+
+            probabilities = None
+            if block['kind'] == 'naive_bayes':
+                # Softmax peste log-verosimilitatea comuna (identic cu predict_proba)
+                shifted = np.exp(scores - scores.max(axis=1, keepdims=True))
+                probabilities = shifted / shifted.sum(axis=1, keepdims=True)
+
+            results[name] = {
+                'labels': labels,
+                'probabilities': probabilities,
+                'scores': scores
+            }
+
+        return results, time.time() - start_time
+
+
+class LinearOneVsOneSVM:
+    """
+    SVC cu kernel liniar redus la ponderile celor k(k-1)/2 perechi de clase
+    Aceleasi predictii ca SVC (votul one-vs-one din libsvm), fara vectori suport
+    """
+
+    kernel = 'linear'
+
+    def __init__(self, pair_coef, pair_intercept, classes):
+        """
+        Initializeaza modelul
+
+        Args:
+            pair_coef: Ponderile perechilor (n_perechi, n_features), in conventia libsvm
+                       (ca SVC.coef_, cu semnul inversat in cazul binar)
+            pair_intercept: Bias-ul perechilor (n_perechi,), in aceeasi conventie
+            classes: Etichetele claselor
+        """
+        self.pair_coef = pair_coef
+        self.pair_intercept = pair_intercept
+        self.classes_ = classes
+        n_classes = len(classes)
+        self.pairs = [(i, j) for i in range(n_classes) for j in range(i + 1, n_classes)]
+
+    @classmethod
+    def from_svc(cls, svc):
+        """
+        Extrage ponderile unui SVC antrenat cu kernel liniar
+
+        Args:
+            svc: sklearn.svm.SVC(kernel='linear') antrenat
+
+        Returns:
+            LinearOneVsOneSVM
+        """
+        if svc.kernel != 'linear':
+            raise ValueError(f"Doar SVC cu kernel liniar poate fi redus la ponderi (kernel={svc.kernel})")
+        coef = svc.coef_
+        coef = coef.toarray() if hasattr(coef, 'toarray') else np.asarray(coef)
+        coef = np.asarray(coef, dtype=np.float64)
+        intercept = np.asarray(svc.intercept_, dtype=np.float64)
+        if len(svc.classes_) == 2:
+            # Caz binar: sklearn inverseaza semnul (scor pozitiv = classes_[1]),
+            # in conventia libsvm a perechilor scorul pozitiv voteaza classes_[0]
+            coef = -coef
+            intercept = -intercept
+        return cls(np.ascontiguousarray(coef), intercept, np.asarray(svc.classes_))
+
+    @property
+    def n_features_in_(self):
+        return self.pair_coef.shape[1]
+
+    def pair_decision(self, X):
+        """Scorurile perechilor (n_documente, n_perechi)"""
+        return np.asarray(X @ self.pair_coef.T) + self.pair_intercept
+
+    def _votes(self, pair_scores):
+        votes = np.zeros((pair_scores.shape[0], len(self.classes_)))
+        confidences = np.zeros_like(votes)
+        for k, (i, j) in enumerate(self.pairs):
+            positive = pair_scores[:, k] > 0
+            votes[positive, i] += 1
+            votes[~positive, j] += 1
+            confidences[:, i] += pair_scores[:, k]
+            confidences[:, j] -= pair_scores[:, k]
+        return votes, confidences
+
+    def decision_function(self, X):
+        """
+        Scoruri per clasa ca SVC.decision_function (decision_function_shape='ovr'):
+        voturi + incredere normalizata in (-1/3, 1/3); in cazul binar un singur scor
+        (pozitiv = classes_[1]), tot ca SVC
+        """
+        pair_scores = self.pair_decision(X)
+        if len(self.classes_) == 2:
+            return -pair_scores[:, 0]
+        votes, confidences = self._votes(pair_scores)
+        return votes + confidences / (3 * (np.abs(confidences) + 1))
+
+    def predict(self, X):
+        """Predictii prin votul one-vs-one (la egalitate castiga clasa cu indexul mai mic)"""
+        votes, _ = self._votes(self.pair_decision(X))
+        return self.classes_[np.argmax(votes, axis=1)]
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Micro-batching pentru cereri de predictie concurente
+Cererile care sosesc intr-o fereastra scurta sunt grupate intr-un singur apel
+de vectorizare + scorare, apoi fiecare apelant isi primeste propriul rezultat
+"""
+
+import copy
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class _PendingRequest:
+    """O cerere in asteptare in coada batcher-ului"""
+
+    def __init__(self, text, context=None, document=None):
+        self.text = text
+        self.context = context
+        self.document = document
+        self.enqueued_at = time.time()
+        self.future = Future()
+
+
+class MicroBatcher:
+    """Grupeaza cererile concurente intr-un singur apel predict_batch"""
+
+    def __init__(self, predict_batch, window_ms=2.0, max_batch_size=32):
+        """
+        Initializeaza batcher-ul
+
+        Args:
+            predict_batch: Functie (texts, context, documents) -> (lista de results, performance_metrics);
+                documents contine None pentru textele trimise fara document preprocesat
+            window_ms: Cat asteapta primul document din batch dupa alte cereri (milisecunde)
+            max_batch_size: Numarul maxim de documente dintr-un batch
+        """
+        self.predict_batch = predict_batch
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._worker.start()
+
+    def submit(self, text, context=None, document=None):
+        """
+        Trimite un text si asteapta rezultatul lui
+
+        Args:
+            text: Textul de clasificat
+            context: Obiect transmis functiei predict_batch (ex: pipeline-ul cu care a inceput
+                cererea); cererile cu context diferit nu sunt grupate in acelasi apel
+            document: Textul deja preprocesat (optional; evita a doua preprocesare in batch)
+
+        Returns:
+            (results, performance_metrics) pentru acest text
+        """
+        pending = _PendingRequest(text, context, document)
+        self._queue.put(pending)
+        return pending.future.result()
+
+    def _collect_batch(self):
+        """Asteapta prima cerere, apoi aduna altele pana la expirarea ferestrei sau max_batch_size"""
+        batch = [self._queue.get()]
+        deadline = batch[0].enqueued_at + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """Bucla thread-ului de lucru"""
+        while True:
+            collected = self._collect_batch()
+            # De obicei un singur grup; mai multe doar daca modelele au fost reincarcate in fereastra
+            groups = {}
+            for pending in collected:
+                groups.setdefault(id(pending.context), []).append(pending)
+            for batch in groups.values():
+                self._predict_group(batch)
+
+    def _predict_group(self, batch):
+        """Scoreaza un grup de cereri cu acelasi context si distribuie rezultatele"""
+        batch_start = time.time()
+        try:
+            batch_results, batch_metrics = self.predict_batch(
+                [pending.text for pending in batch],
+                batch[0].context,
+                [pending.document for pending in batch]
+            )
+        except Exception as e:
+            for pending in batch:
+                pending.future.set_exception(e)
+            return
+
+        finished_at = time.time()
+        for pending, results in zip(batch, batch_results):
+            performance_metrics = copy.deepcopy(batch_metrics)
+            performance_metrics['queue_wait_time'] = batch_start - pending.enqueued_at
+            performance_metrics['batch_size'] = len(batch)
+            performance_metrics['batch_total_time'] = batch_metrics['total_time']
+            # Timpul total vazut de apelant include asteptarea in coada
+            performance_metrics['total_time'] = finished_at - pending.enqueued_at
+            pending.future.set_result((results, performance_metrics))
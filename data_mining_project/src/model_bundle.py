@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Bundle versionat de modele: un manifest JSON + vectori .npy (memory-mappable)
+Contine vocabularul si ponderile IDF, Naive Bayes, SVM-ul liniar, arborii Random Forest,
+tabela de tokeni si categoriile; fiecare fisier are checksum sha256 in manifest
+"""
+
+import os
+import json
+import fcntl
+import shutil
+import hashlib
+from datetime import datetime
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer, HashingVectorizer, TfidfTransformer
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.svm import LinearSVC
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+
+from preprocessing import TokenNgramAnalyzer, TokenTable, uses_token_stream
+from linear_scoring import LinearOneVsOneSVM
+from forest_engine import CompactForest
+from corpus_cache import file_sha256
+
+
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+CURRENT_POINTER = 'CURRENT'  # fisierul care indica bundle-ul activ din models/bundles/
+# Fisierul pe care procesele care folosesc un bundle tin un lock partajat (nu face parte din manifest)
+IN_USE_LOCK = '.in-use'
+
+# Bundle-uri vechi pastrate (procesele care inca le folosesc pot termina cererile in curs)
+KEEP_BUNDLES = 3
+
+
+class ModelBundle:
+    """Un bundle incarcat: vectorizer, modele, categorii, tabela de tokeni si versiunea"""
+
+    def __init__(self, directory, manifest, vectorizer, category_names, token_table, mmap=True, verify=True):
+        self.directory = directory
+        self.manifest = manifest
+        self.version = manifest['version']
+        self.vectorizer = vectorizer
+        self.models = {}
+        self.category_names = category_names
+        self.token_table = token_table
+        self.mmap = mmap
+        self.verify = verify
+        # Modelele se incarca la prima folosire: bundle-ul nu poate fi sters cat timp obiectul traieste
+        self._in_use = _hold_bundle(directory)
+
+    @property
+    def model_names(self):
+        """Toate modelele din bundle (incarcate sau nu)"""
+        return list(self.manifest['models'])
+
+    def load_model(self, name):
+        """
+        Incarca un model din bundle (verifica doar fisierele lui)
+
+        Args:
+            name: Numele algoritmului
+
+        Returns:
+            Modelul reconstruit
+        """
+        if name not in self.models:
+            if self.verify:
+                verify_bundle(self.directory, self.manifest, prefix=f'models/{name}/')
+            self.models[name] = _restore_model(self.manifest['models'][name], name, self.directory, self.mmap)
+        return self.models[name]
+
+
+def _hold_bundle(bundle_dir):
+    """
+    Marcheaza bundle-ul ca folosit (lock partajat pe IN_USE_LOCK), ca _prune_bundles sa nu il stearga
+    Lock-ul dureaza cat timp fisierul ramane deschis, si in procesele create cu fork
+
+    Returns:
+        Fisierul de lock deschis sau None (bundle read-only, fara fisierul de lock)
+    """
+    try:
+        lock_file = open(os.path.join(bundle_dir, IN_USE_LOCK), 'a')
+    except OSError:
+        return None
+    fcntl.flock(lock_file, fcntl.LOCK_SH)
+    return lock_file
+
+
+def _remove_unused_bundle(bundle_dir):
+    """
+    Sterge un bundle doar daca niciun proces nu il mai foloseste
+
+    Returns:
+        True daca bundle-ul a fost sters
+    """
+    try:
+        lock_file = open(os.path.join(bundle_dir, IN_USE_LOCK), 'a')
+    except OSError:
+        return False
+    with lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False  # Un proces poate inca incarca modele din el; va fi sters de o scriere ulterioara
+        shutil.rmtree(bundle_dir, ignore_errors=True)
+    return True
+
+
+def _save_array(directory, relative_path, array):
+    path = os.path.join(directory, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.save(path, np.ascontiguousarray(array))
+
+
+def _load_array(directory, relative_path, mmap):
+    # Vectorii de obiecte nu pot fi mapati; toti vectorii din bundle au tipuri numerice sau unicode
+    return np.load(os.path.join(directory, relative_path), mmap_mode='r' if mmap else None)
+
+
+def _vocabulary_terms(vocabulary):
+    """Termenii vocabularului in ordinea coloanelor"""
+    terms = [None] * len(vocabulary)
+    for term, index in vocabulary.items():
+        terms[index] = term
+    return np.array(terms, dtype=str)
+
+
+def _export_vectorizer(vectorizer, directory):
+    """Salveaza starea vectorizer-ului si returneaza descrierea lui pentru manifest"""
+    token_stream = uses_token_stream(vectorizer)
+
+    if isinstance(vectorizer, Pipeline):
+        hashing, transformer = vectorizer.steps[0][1], vectorizer.steps[-1][1]
+    else:
+        hashing, transformer = vectorizer, None
+
+    analyzer = hashing.analyzer
+    spec = {
+        'token_stream': token_stream,
+        'ngram_range': list(analyzer.ngram_range if token_stream else hashing.ngram_range),
+        'lowercase': hashing.lowercase,
+        'binary': hashing.binary,
+        'dtype': np.dtype(hashing.dtype).name
+    }
+
+    if isinstance(hashing, HashingVectorizer):
+        spec.update({
+            'type': 'hashing',
+            'n_features': hashing.n_features,
+            'alternate_sign': hashing.alternate_sign,
+            'norm': hashing.norm,
+            'idf': transformer is not None
+        })
+        if transformer is not None:
+            spec.update({'idf_norm': transformer.norm, 'sublinear_tf': transformer.sublinear_tf})
+            _save_array(directory, 'vectorizer/idf.npy', transformer.idf_)
+        return spec
+
+    spec.update({
+        'type': 'tfidf' if isinstance(hashing, TfidfVectorizer) else 'count',
+        'n_features': len(hashing.vocabulary_)
+    })
+    _save_array(directory, 'vectorizer/vocabulary.npy', _vocabulary_terms(hashing.vocabulary_))
+    if isinstance(hashing, TfidfVectorizer):
+        spec.update({'norm': hashing.norm, 'use_idf': hashing.use_idf, 'sublinear_tf': hashing.sublinear_tf,
+                     'smooth_idf': hashing.smooth_idf})
+        if hashing.use_idf:
+            _save_array(directory, 'vectorizer/idf.npy', hashing.idf_)
+    return spec
+
+
+def _restore_vectorizer(spec, directory, mmap):
+    """Reconstruieste vectorizer-ul din manifest si vectorii salvati"""
+    if spec['token_stream']:
+        ngram_params = {'analyzer': TokenNgramAnalyzer(ngram_range=tuple(spec['ngram_range']))}
+    else:
+        ngram_params = {'ngram_range': tuple(spec['ngram_range'])}
+    common = {'lowercase': spec['lowercase'], 'binary': spec['binary'], 'dtype': np.dtype(spec['dtype'])}
+
+    if spec['type'] == 'hashing':
+        hashing = HashingVectorizer(n_features=spec['n_features'], alternate_sign=spec['alternate_sign'],
+                                    norm=spec['norm'], **common, **ngram_params)
+        if not spec['idf']:
+            return hashing
+        transformer = TfidfTransformer(norm=spec['idf_norm'], sublinear_tf=spec['sublinear_tf'])
+        transformer.idf_ = _load_array(directory, 'vectorizer/idf.npy', mmap)
+        transformer.n_features_in_ = spec['n_features']
+        return Pipeline([('hashing', hashing), ('tfidf', transformer)])
+
+    terms = _load_array(directory, 'vectorizer/vocabulary.npy', mmap)
+    if spec['type'] == 'tfidf':
+        vectorizer = TfidfVectorizer(norm=spec['norm'], use_idf=spec['use_idf'], sublinear_tf=spec['sublinear_tf'],
+                                     smooth_idf=spec['smooth_idf'], **common, **ngram_params)
+    else:
+        vectorizer = CountVectorizer(**common, **ngram_params)
+    vectorizer.vocabulary_ = dict(zip(terms.tolist(), range(len(terms))))
+    vectorizer.fixed_vocabulary_ = False
+    if spec['type'] == 'tfidf' and spec['use_idf']:
+        vectorizer.idf_ = _load_array(directory, 'vectorizer/idf.npy', mmap)
+    return vectorizer
+
+
+def _export_model(name, model, directory):
+    """Salveaza un model ca vectori si returneaza descrierea lui pentru manifest"""
+    prefix = f'models/{name}'
+
+    if isinstance(model, CompactForest) or hasattr(model, 'estimators_'):
+        forest = model if isinstance(model, CompactForest) else CompactForest.from_sklearn(model)
+        forest.save(os.path.join(directory, prefix))
+        return {'type': 'compact_forest'}
+
+    _save_array(directory, f'{prefix}/classes.npy', np.asarray(model.classes_))
+
+    if hasattr(model, 'feature_log_prob_'):
+        _save_array(directory, f'{prefix}/feature_log_prob.npy', model.feature_log_prob_)
+        _save_array(directory, f'{prefix}/class_log_prior.npy', model.class_log_prior_)
+        return {'type': 'multinomial_nb', 'alpha': float(model.alpha)}
+
+    if hasattr(model, 'support_vectors_') or isinstance(model, LinearOneVsOneSVM):
+        svm = model if isinstance(model, LinearOneVsOneSVM) else LinearOneVsOneSVM.from_svc(model)
+        _save_array(directory, f'{prefix}/pair_coef.npy', svm.pair_coef)
+        _save_array(directory, f'{prefix}/pair_intercept.npy', svm.pair_intercept)
+        return {'type': 'linear_ovo_svm'}
+
+    if hasattr(model, 'coef_'):
+        _save_array(directory, f'{prefix}/coef.npy', model.coef_)
+        _save_array(directory, f'{prefix}/intercept.npy', np.atleast_1d(model.intercept_))
+        return {'type': 'sgd' if isinstance(model, SGDClassifier) else 'linear_svc'}
+
+    raise ValueError(f"Modelul {name} ({type(model).__name__}) nu poate fi exportat in bundle")
+
+
+def _restore_model(spec, name, directory, mmap):
+    """Reconstruieste un model din vectorii salvati"""
+    prefix = f'models/{name}'
+
+    if spec['type'] == 'compact_forest':
+        return CompactForest.load(os.path.join(directory, prefix), mmap=mmap)
+
+    classes = _load_array(directory, f'{prefix}/classes.npy', False)
+
+    if spec['type'] == 'linear_ovo_svm':
+        return LinearOneVsOneSVM(_load_array(directory, f'{prefix}/pair_coef.npy', mmap),
+                                 _load_array(directory, f'{prefix}/pair_intercept.npy', mmap),
+                                 classes)
+
+    if spec['type'] == 'multinomial_nb':
+        model = MultinomialNB(alpha=spec['alpha'])
+        model.feature_log_prob_ = _load_array(directory, f'{prefix}/feature_log_prob.npy', mmap)
+        model.class_log_prior_ = _load_array(directory, f'{prefix}/class_log_prior.npy', mmap)
+        model.n_features_in_ = model.feature_log_prob_.shape[1]
+    else:
+        model = SGDClassifier(loss='hinge') if spec['type'] == 'sgd' else LinearSVC()
+        model.coef_ = _load_array(directory, f'{prefix}/coef.npy', mmap)
+        model.intercept_ = _load_array(directory, f'{prefix}/intercept.npy', mmap)
+        model.n_features_in_ = model.coef_.shape[1]
+    model.classes_ = classes
+    return model
+
+
+def _checksums(directory):
+    """sha256, forma si tipul fiecarui vector .npy din bundle"""
+    files = {}
+    for root, _, filenames in os.walk(directory):
+        for filename in sorted(filenames):
+            if not filename.endswith('.npy'):
+                continue
+            path = os.path.join(root, filename)
+            array = np.load(path, mmap_mode='r')
+            files[os.path.relpath(path, directory).replace(os.sep, '/')] = {
+                'sha256': file_sha256(path),
+                'shape': list(array.shape),
+                'dtype': array.dtype.str
+            }
+    return dict(sorted(files.items()))
+
+
+def write_bundle(bundles_dir, vectorizer, models, category_names, token_table=None, metadata=None,
+                 preprocessor_settings=None, stop_words=None):
+    """
+    Scrie un bundle nou si il marcheaza ca activ (atomic, prin fisierul CURRENT)
+
+    Args:
+        bundles_dir: Directorul cu bundle-uri (ex: models/bundles)
+        vectorizer: Vectorizer-ul antrenat
+        models: Dictionar {nume_algoritm: model antrenat}
+        category_names: Numele originale ale categoriilor, dupa id
+        token_table: TokenTable (optional)
+        metadata: Informatii suplimentare salvate in manifest (optional)
+        preprocessor_settings: Setarile TextPreprocessor folosite la antrenare (optional)
+        stop_words: Stop words folosite la antrenare; permit inferenta fara nltk (optional)
+
+    Returns:
+        Calea catre bundle-ul scris
+    """
+    os.makedirs(bundles_dir, exist_ok=True)
+    staging_dir = os.path.join(bundles_dir, f'.staging-{os.getpid()}')
+    if os.path.exists(staging_dir):
+        shutil.rmtree(staging_dir)
+    os.makedirs(staging_dir)
+
+    manifest = {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'categories': list(category_names),
+        'vectorizer': _export_vectorizer(vectorizer, staging_dir),
+        'models': {name: _export_model(name, model, staging_dir) for name, model in models.items()},
+        'token_table': None,
+        'preprocessing': {'settings': preprocessor_settings, 'stop_words': stop_words is not None},
+        'metadata': metadata or {}
+    }
+
+    if stop_words is not None:
+        _save_array(staging_dir, 'preprocessing/stop_words.npy', np.array(sorted(stop_words), dtype=str))
+
+    if token_table is not None:
+        keys = sorted(token_table.entries)
+        _save_array(staging_dir, 'token_table/tokens.npy', np.array(keys, dtype=str))
+        _save_array(staging_dir, 'token_table/values.npy', np.array([token_table.entries[k] for k in keys], dtype=str))
+        manifest['token_table'] = {'settings': token_table.settings,
+                                   'vocabulary_filter': token_table.vocabulary_words is not None}
+
+    manifest['files'] = _checksums(staging_dir)
+
+    # Versiunea depinde doar de continut: acelasi antrenament da aceeasi versiune.
+    # metadata intra in hash (ex: pragurile cascadei depind de latente masurate), altfel un bundle
+    # existent cu aceleasi ponderi ar pastra metadatele vechi
+    content = json.dumps({key: manifest[key] for key in ('format_version', 'categories', 'vectorizer', 'models',
+                                                          'token_table', 'preprocessing', 'files', 'metadata')},
+                         sort_keys=True)
+    manifest['version'] = hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
+
+    with open(os.path.join(staging_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    bundle_dir = os.path.join(bundles_dir, manifest['version'])
+    if os.path.exists(bundle_dir):
+        shutil.rmtree(staging_dir)
+    else:
+        os.replace(staging_dir, bundle_dir)
+
+    # Comutarea bundle-ului activ este atomica: CURRENT este inlocuit dintr-o singura operatie
+    pointer_tmp = os.path.join(bundles_dir, f'.{CURRENT_POINTER}.tmp-{os.getpid()}')
+    with open(pointer_tmp, 'w', encoding='utf-8') as f:
+        f.write(manifest['version'] + '\n')
+    os.replace(pointer_tmp, os.path.join(bundles_dir, CURRENT_POINTER))
+
+    _prune_bundles(bundles_dir, keep=manifest['version'])
+    return bundle_dir
+
+
+def _prune_bundles(bundles_dir, keep):
+    """Sterge bundle-urile vechi, pastrandu-le pe ultimele KEEP_BUNDLES si pe cele inca folosite"""
+    bundles = [
+        entry for entry in os.listdir(bundles_dir)
+        if os.path.isfile(os.path.join(bundles_dir, entry, MANIFEST_NAME))
+    ]
+    bundles.sort(key=lambda entry: os.path.getmtime(os.path.join(bundles_dir, entry, MANIFEST_NAME)), reverse=True)
+    for entry in bundles[KEEP_BUNDLES:]:
+        if entry != keep:
+            _remove_unused_bundle(os.path.join(bundles_dir, entry))
+
+
+def current_bundle_dir(bundles_dir):
+    """
+    Bundle-ul activ indicat de fisierul CURRENT
+
+    Returns:
+        Calea catre bundle sau None daca nu exista
+    """
+    pointer = os.path.join(bundles_dir, CURRENT_POINTER)
+    if not os.path.exists(pointer):
+        return None
+    with open(pointer, 'r', encoding='utf-8') as f:
+        version = f.read().strip()
+    bundle_dir = os.path.join(bundles_dir, version)
+    return bundle_dir if os.path.isfile(os.path.join(bundle_dir, MANIFEST_NAME)) else None
+
+
+def read_manifest(bundle_dir):
+    with open(os.path.join(bundle_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def verify_bundle(bundle_dir, manifest=None, prefix=None, exclude_prefix=None):
+    """
+    Verifica checksum-urile vectorilor din bundle
+
+    Args:
+        bundle_dir: Directorul bundle-ului
+        manifest: Manifestul deja citit (optional)
+        prefix: Verifica doar fisierele cu acest prefix (ex: 'models/svm/')
+        exclude_prefix: Sare peste fisierele cu acest prefix
+
+    Raises:
+        ValueError: daca un fisier lipseste sau nu corespunde manifestului
+    """
+    manifest = manifest or read_manifest(bundle_dir)
+    for relative_path, info in manifest['files'].items():
+        if prefix is not None and not relative_path.startswith(prefix):
+            continue
+        if exclude_prefix is not None and relative_path.startswith(exclude_prefix):
+            continue
+        path = os.path.join(bundle_dir, relative_path)
+        if not os.path.exists(path):
+            raise ValueError(f"Bundle incomplet: lipseste {relative_path}")
+        if file_sha256(path) != info['sha256']:
+            raise ValueError(f"Bundle corupt: checksum diferit pentru {relative_path}")
+
+
+def load_bundle(bundle_dir, mmap=True, verify=True, models=None):
+    """
+    Incarca un bundle (vectorii sunt deschisi cu memory mapping)
+
+    Args:
+        bundle_dir: Directorul bundle-ului (ex: models/bundles/<versiune>)
+        mmap: Daca vectorii sa fie mapati in memorie (paginile sunt partajate intre procese)
+        verify: Daca sa se verifice checksum-urile sha256 inainte de incarcare
+        models: Modelele incarcate acum (implicit toate); restul se incarca la nevoie cu load_model
+
+    Returns:
+        ModelBundle
+    """
+    manifest = read_manifest(bundle_dir)
+    if manifest.get('format_version') != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"Format de bundle necunoscut: {manifest.get('format_version')}")
+    if verify:
+        # Fisierele modelelor sunt verificate cand modelul este incarcat
+        verify_bundle(bundle_dir, manifest, exclude_prefix='models/')
+
+    vectorizer = _restore_vectorizer(manifest['vectorizer'], bundle_dir, mmap)
+
+    token_table = None
+    if manifest.get('token_table'):
+        tokens = _load_array(bundle_dir, 'token_table/tokens.npy', False).tolist()
+        values = _load_array(bundle_dir, 'token_table/values.npy', False).tolist()
+        vocabulary_words = None
+        if manifest['token_table']['vocabulary_filter']:
+            # Ca in build_token_table: cuvintele care apar in termenii vocabularului
+            vocabulary_words = set()
+            for term in getattr(vectorizer, 'vocabulary_', {}):
+                vocabulary_words.update(term.split(' '))
+        token_table = TokenTable(dict(zip(tokens, values)), vocabulary_words=vocabulary_words,
+                                 settings=manifest['token_table']['settings'])
+
+    bundle = ModelBundle(bundle_dir, manifest, vectorizer, manifest['categories'], token_table, mmap=mmap, verify=verify)
+    for name in (bundle.model_names if models is None else models):
+        bundle.load_model(name)
+    return bundle
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Supravegherea directorului cu modele: cand train_models.py scrie un set nou,
+modelele sunt reincarcate in fundal, fara restartul serverului
+"""
+
+import threading
+
+
+class ModelWatcher:
+    """Thread care verifica periodic versiunea modelelor de pe disc si declanseaza reincarcarea"""
+
+    def __init__(self, disk_version, active_version, reload, interval=5.0):
+        """
+        Initializeaza si porneste thread-ul
+
+        Args:
+            disk_version: Functie -> versiunea setului de modele de pe disc
+            active_version: Functie -> versiunea modelelor folosite acum
+            reload: Functie apelata pentru reincarcare (poate arunca exceptii)
+            interval: Intervalul dintre verificari (secunde)
+        """
+        self.disk_version = disk_version
+        self.active_version = active_version
+        self.reload = reload
+        self.interval = interval
+        self.failed_version = None  # versiunea a carei incarcare a esuat (nu se reincearca)
+        self._stop = threading.Event()
+        self._worker = threading.Thread(target=self._run, name='model-watcher', daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        """Bucla thread-ului de lucru"""
+        previous = None
+        while not self._stop.wait(self.interval):
+            try:
+                version = self.disk_version()
+            except OSError:
+                # Directorul poate fi in curs de rescriere; se verifica din nou la urmatorul interval
+                previous = None
+                continue
+
+            # Reincarcare doar daca versiunea e aceeasi la doua verificari la rand:
+            # fisierele pickle sunt scrise unul dupa altul, nu atomic ca bundle-ul
+            stable = version == previous
+            previous = version
+            if not stable or version == self.active_version() or version == self.failed_version:
+                continue
+
+            try:
+                self.reload()
+                self.failed_version = None
+            except Exception as e:
+                self.failed_version = version
+                print(f"Reincarcarea modelelor a esuat ({version}): {e}; raman modelele active")
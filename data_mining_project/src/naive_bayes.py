@@ -4,6 +4,7 @@ Implementare Naive Bayes pentru clasificare text
 """
 
 import time
+import numpy as np
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import pandas as pd
@@ -23,6 +24,23 @@ class NaiveBayesClassifier:
         self.training_time = None
         self.prediction_time = None
     
+    @classmethod
+    def from_model(cls, model):
+        """
+        Construieste wrapper-ul in jurul unui model sklearn deja antrenat (ex: incarcat din .pkl)
+        
+        Args:
+            model: Model MultinomialNB antrenat
+            
+        Returns:
+            Instanta wrapper-ului
+        """
+        classifier = cls.__new__(cls)
+        classifier.model = model
+        classifier.training_time = None
+        classifier.prediction_time = None
+        return classifier
+    
     def train(self, X_train, y_train):
         """
         Antreneaza modelul
@@ -44,6 +62,26 @@ class NaiveBayesClassifier:
         
         return self
     
+    def partial_fit(self, X_batch, y_batch, classes=None):
+        """
+        Antreneaza incremental modelul pe un batch (antrenare streaming)
+        
+        Args:
+            X_batch: Features pentru batch-ul curent
+            y_batch: Etichetele batch-ului curent
+            classes: Toate clasele posibile (obligatoriu la primul apel)
+            
+        Returns:
+            self
+        """
+        start_time = time.time()
+        
+        self.model.partial_fit(X_batch, y_batch, classes=classes)
+        
+        self.training_time = (self.training_time or 0) + time.time() - start_time
+        
+        return self
+    
     def predict(self, X_test):
         """
         Face predictii
@@ -60,6 +98,29 @@ class NaiveBayesClassifier:
         
         return predictions
     
+    def predict_with_scores(self, X, return_scores=False):
+        """
+        Eticheta si probabilitatile dintr-o singura evaluare a modelului
+        
+        Args:
+            X: Features
+            return_scores: Ignorat (probabilitatile sunt deja scorurile modelului)
+            
+        Returns:
+            Dictionar cu 'labels', 'probabilities', 'scores' (None) si 'prediction_time' (durata acestui apel)
+        """
+        start_time = time.time()
+        probabilities = self.model.predict_proba(X)
+        labels = self.model.classes_[np.argmax(probabilities, axis=1)]
+        elapsed = time.time() - start_time
+        
+        return {
+            'labels': labels,
+            'probabilities': probabilities,
+            'scores': None,
+            'prediction_time': elapsed
+        }
+    
     def evaluate(self, X_test, y_test):
         """
         Evalueaza modelul
@@ -71,7 +132,9 @@ class NaiveBayesClassifier:
         Returns:
             Dictionar cu metrici
         """
-        predictions = self.predict(X_test)
+        scored = self.predict_with_scores(X_test)
+        self.prediction_time = scored['prediction_time']
+        predictions = scored['labels']
         
         accuracy = accuracy_score(y_test, predictions)
         
@@ -81,6 +144,7 @@ class NaiveBayesClassifier:
             'training_time': self.training_time,
             'prediction_time': self.prediction_time,
             'predictions': predictions,
+            'probabilities': scored['probabilities'],
             'classification_report': classification_report(y_test, predictions, output_dict=True),
             'confusion_matrix': confusion_matrix(y_test, predictions)
         }
@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+Runtime de inferenta doar cu NumPy si SciPy (fara sklearn, pandas sau nltk)
+Citeste bundle-ul versionat scris de train_models.py (models/bundles/CURRENT) si reproduce
+rezultatele predict_text: tokenizare prin tabela exportata, vectorizare TF-IDF / count / hashing,
+Naive Bayes si SVM liniar (scorare fuzionata), SVM one-vs-one liniar si Random Forest compact.
+Tokenii care lipsesc din tabela sunt tratati cu porter_stemmer.py si stop words din bundle.
+
+Verificare de paritate cu calea sklearn (dupa python3 train_models.py):
+    python3 src/numpy_runtime.py
+"""
+
+import os
+import re
+import json
+import time
+import threading
+from collections import Counter
+
+import numpy as np
+import scipy.sparse as sp
+
+from linear_scoring import FusedLinearScorer, LinearOneVsOneSVM
+from forest_engine import CompactForest
+from corpus_cache import file_sha256
+from porter_stemmer import porter_stem
+
+
+# Aceleasi valori ca in preprocessing.py (importul lui ar aduce sklearn, pandas si nltk)
+TOKEN_DROP = ''
+TOKEN_OOV = '_oov_'
+
+# token_pattern-ul implicit al vectorizer-elor sklearn (pentru vectorizer-ele pe text, nu pe tokeni)
+WORD_PATTERN = re.compile(r'(?u)\b\w\w+\b')
+
+# Aceleasi fisiere ca in model_bundle.py
+MANIFEST_NAME = 'manifest.json'
+CURRENT_POINTER = 'CURRENT'
+
+
+def murmurhash3_32(key, seed=0):
+    """
+    MurmurHash3 (x86, 32 biti, cu semn) al unui string, ca sklearn.utils.murmurhash3_32
+
+    Args:
+        key: Stringul (codificat UTF-8)
+        seed: Seed-ul hash-ului
+
+    Returns:
+        Hash-ul ca intreg cu semn pe 32 de biti
+    """
+    data = key.encode('utf-8')
+    mask = 0xffffffff
+    c1, c2 = 0xcc9e2d51, 0x1b873593
+    h = seed & mask
+
+    n_blocks = len(data) // 4
+    for i in range(n_blocks):
+        k = int.from_bytes(data[4 * i:4 * i + 4], 'little')
+        k = (k * c1) & mask
+        k = ((k << 15) | (k >> 17)) & mask
+        k = (k * c2) & mask
+        h ^= k
+        h = ((h << 13) | (h >> 19)) & mask
+        h = (h * 5 + 0xe6546b64) & mask
+
+    tail = data[4 * n_blocks:]
+    k = 0
+    if len(tail) >= 3:
+        k ^= tail[2] << 16
+    if len(tail) >= 2:
+        k ^= tail[1] << 8
+    if tail:
+        k ^= tail[0]
+        k = (k * c1) & mask
+        k = ((k << 15) | (k >> 17)) & mask
+        k = (k * c2) & mask
+        h ^= k
+
+    h ^= len(data)
+    h ^= h >> 16
+    h = (h * 0x85ebca6b) & mask
+    h ^= h >> 13
+    h = (h * 0xc2b2ae35) & mask
+    h ^= h >> 16
+    return h - (1 << 32) if h & 0x80000000 else h
+
+
+class _ArrayModel:
+    """Model liniar refacut din vectori (atributele asteptate de FusedLinearScorer)"""
+
+    def __init__(self, classes, **arrays):
+        self.classes_ = classes
+        for name, array in arrays.items():
+            setattr(self, name, array)
+
+
+class TableTokenizer:
+    """Tokenizare ca TextPreprocessor.tokenize, pe baza tabelei token brut -> stem exportate"""
+
+    def __init__(self, entries, vocabulary_words=None, stop_words=None, settings=None, cache_size=50000):
+        """
+        Initializeaza tokenizer-ul
+
+        Args:
+            entries: Dictionar {token_brut: stem / TOKEN_DROP / TOKEN_OOV} (poate fi gol)
+            vocabulary_words: Cuvintele din vocabular (None = fara marcare OOV)
+            stop_words: Multimea stop words (None = incarcate din nltk la nevoie, pentru bundle-uri vechi)
+            settings: Setarile preprocesorului de la antrenare
+            cache_size: Numarul maxim de tokeni calculati tinuti in memo
+        """
+        self.entries = entries
+        self.has_table = bool(entries)
+        self.vocabulary_words = vocabulary_words
+        self.stop_words = stop_words
+        self.settings = settings or {'use_stemming': True, 'use_stopwords': True, 'language': 'english'}
+        self.cache_size = cache_size
+        self._token_cache = {}
+        self._cache_lock = threading.Lock()
+
+    def clean_text(self, text):
+        """Aceeasi curatare ca TextPreprocessor.clean_text"""
+        if not isinstance(text, str) or text == '':
+            return ''
+        text = re.sub(r'[^a-z0-9\s]', ' ', text.lower())
+        return re.sub(r'\s+', ' ', text).strip()
+
+    def tokenize(self, text):
+        """
+        Tokenizeaza textul
+
+        Args:
+            text: Textul brut
+
+        Returns:
+            Lista de tokeni (stem-uri si TOKEN_OOV)
+        """
+        tokens = []
+        for token in self.clean_text(text).split():
+            mapped = self.entries.get(token)
+            if mapped is None:
+                mapped = self._map_missing(token)
+            if mapped:
+                tokens.append(mapped)
+        return tokens
+
+    def _map_missing(self, token):
+        """Token care nu este in tabela: stop words si stemming calculate (cu memo limitat)"""
+        with self._cache_lock:
+            mapped = self._token_cache.get(token)
+        if mapped is not None:
+            return mapped
+
+        if self.settings['use_stopwords'] and token in self._get_stop_words():
+            mapped = TOKEN_DROP
+        else:
+            mapped = porter_stem(token) if self.settings['use_stemming'] else token
+            if self.has_table:
+                # Aceleasi decizii ca la exportul tabelei
+                if len(mapped) < 2:
+                    mapped = TOKEN_DROP
+                elif self.vocabulary_words is not None and mapped not in self.vocabulary_words:
+                    mapped = TOKEN_OOV
+
+        if self.cache_size:
+            with self._cache_lock:
+                if token not in self._token_cache:
+                    if len(self._token_cache) >= self.cache_size:
+                        del self._token_cache[next(iter(self._token_cache))]
+                    self._token_cache[token] = mapped
+        return mapped
+
+    def _get_stop_words(self):
+        if self.stop_words is None:
+            from nltk.corpus import stopwords
+            self.stop_words = set(stopwords.words(self.settings['language']))
+        return self.stop_words
+
+
+class ArrayVectorizer:
+    """Transform-ul vectorizer-elor sklearn (TF-IDF, count, hashing + IDF) pe vectori exportati"""
+
+    def __init__(self, spec, terms=None, idf=None):
+        """
+        Initializeaza vectorizer-ul
+
+        Args:
+            spec: Descrierea vectorizer-ului din manifest
+            terms: Termenii vocabularului in ordinea coloanelor (tfidf / count)
+            idf: Ponderile IDF (optional)
+        """
+        self.spec = spec
+        self.n_features = spec['n_features']
+        self.vocabulary = {term: index for index, term in enumerate(terms.tolist())} if terms is not None else None
+        self.idf = np.asarray(idf, dtype=np.float64) if idf is not None else None
+        self.dtype = np.dtype(spec['dtype'])
+
+    def analyze(self, document):
+        """
+        n-gramele unui document (ca TokenNgramAnalyzer sau analyzer-ul 'word')
+
+        Args:
+            document: Lista de tokeni (token_stream) sau textul preprocesat
+
+        Returns:
+            Lista de n-grame
+        """
+        if self.spec['token_stream']:
+            tokens = [token for token in document if len(token) > 1]
+        else:
+            tokens = WORD_PATTERN.findall(document.lower() if self.spec['lowercase'] else document)
+
+        min_n, max_n = self.spec['ngram_range']
+        if max_n == 1:
+            return tokens
+        ngrams = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            for i in range(len(tokens) - n + 1):
+                ngrams.append(' '.join(tokens[i:i + n]))
+        return ngrams
+
+    def _column(self, term):
+        """Coloana si semnul unui termen pentru vectorizer-ul hashing"""
+        h = murmurhash3_32(term)
+        if h == -2 ** 31:
+            # Ca in sklearn: abs(-2**31) nu este reprezentabil pe 32 de biti
+            index = (2 ** 31 - 1 - (self.n_features - 1)) % self.n_features
+        else:
+            index = abs(h) % self.n_features
+        sign = -1.0 if self.spec['alternate_sign'] and h < 0 else 1.0
+        return index, sign
+
+    def transform(self, documents):
+        """
+        Vectorizeaza documentele
+
+        Args:
+            documents: Lista de documente (liste de tokeni sau texte preprocesate)
+
+        Returns:
+            Matrice CSR (n_documente, n_features)
+        """
+        indptr, indices, values = [0], [], []
+        hashing = self.spec['type'] == 'hashing'
+        for document in documents:
+            counts = {}
+            for term, count in Counter(self.analyze(document)).items():
+                if hashing:
+                    index, sign = self._column(term)
+                    counts[index] = counts.get(index, 0.0) + sign * count
+                else:
+                    index = self.vocabulary.get(term)
+                    if index is not None:
+                        counts[index] = count
+            for index in sorted(counts):
+                if counts[index] != 0:
+                    indices.append(index)
+                    values.append(counts[index])
+            indptr.append(len(indices))
+
+        X = sp.csr_matrix(
+            (np.asarray(values, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+            shape=(len(documents), self.n_features)
+        )
+        if self.spec['binary']:
+            X.data.fill(1)
+
+        if hashing:
+            X = self._normalize(X, self.spec['norm'])
+            if self.spec['idf']:
+                X = self._reweight(X, self.spec['sublinear_tf'], self.spec['idf_norm'])
+        elif self.spec['type'] == 'tfidf':
+            X = self._reweight(X, self.spec['sublinear_tf'], self.spec['norm'])
+        return X.astype(self.dtype)
+
+    def _reweight(self, X, sublinear_tf, norm):
+        """Ponderare TF-IDF (ca TfidfTransformer.transform)"""
+        if sublinear_tf:
+            np.log(X.data, X.data)
+            X.data += 1
+        if self.idf is not None:
+            X = X @ sp.diags(self.idf)
+        return self._normalize(sp.csr_matrix(X), norm)
+
+    @staticmethod
+    def _normalize(X, norm):
+        if norm is None:
+            return X
+        if norm == 'l2':
+            row_norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+        else:
+            row_norms = np.asarray(abs(X).sum(axis=1)).ravel()
+        row_norms[row_norms == 0] = 1.0
+        return sp.csr_matrix(sp.diags(1.0 / row_norms) @ X)
+
+
+class NumpyRuntime:
+    """Predictii ca InferencePipeline.predict, doar cu NumPy / SciPy"""
+
+    def __init__(self, manifest, bundle_dir, tokenizer, vectorizer, models, display_names=None):
+        """
+        Initializeaza runtime-ul (de obicei prin from_bundle / from_models_dir)
+
+        Args:
+            manifest: Manifestul bundle-ului
+            bundle_dir: Directorul bundle-ului
+            tokenizer: TableTokenizer
+            vectorizer: ArrayVectorizer
+            models: Dictionar {nume_algoritm: model refacut din vectori}
+            display_names: Numele de afisare ale categoriilor (implicit numele originale)
+        """
+        self.manifest = manifest
+        self.bundle_dir = bundle_dir
+        self.version = manifest['version']
+        self.category_names = list(manifest['categories'])
+        self.display_names = list(display_names) if display_names is not None else list(self.category_names)
+        self.tokenizer = tokenizer
+        self.vectorizer = vectorizer
+        self.models = models
+        fused_scorer = FusedLinearScorer(models)
+        self.fused_scorer = fused_scorer if len(fused_scorer) else None
+
+    @classmethod
+    def from_models_dir(cls, models_dir, **kwargs):
+        """Incarca bundle-ul activ din models/bundles/CURRENT"""
+        bundles_dir = os.path.join(models_dir, 'bundles')
+        with open(os.path.join(bundles_dir, CURRENT_POINTER), 'r', encoding='utf-8') as f:
+            version = f.read().strip()
+        return cls.from_bundle(os.path.join(bundles_dir, version), **kwargs)
+
+    @classmethod
+    def from_bundle(cls, bundle_dir, display_names=None, mmap=True, verify=True):
+        """
+        Incarca un bundle
+
+        Args:
+            bundle_dir: Directorul bundle-ului
+            display_names: Numele de afisare ale categoriilor (optional)
+            mmap: Daca vectorii sa fie mapati in memorie
+            verify: Daca sa se verifice checksum-urile sha256
+
+        Returns:
+            NumpyRuntime
+        """
+        with open(os.path.join(bundle_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        if verify:
+            for relative_path, info in manifest['files'].items():
+                if file_sha256(os.path.join(bundle_dir, relative_path)) != info['sha256']:
+                    raise ValueError(f"Bundle corupt: checksum diferit pentru {relative_path}")
+
+        def load(relative_path, use_mmap=mmap):
+            path = os.path.join(bundle_dir, relative_path)
+            if not os.path.exists(path):
+                return None
+            return np.load(path, mmap_mode='r' if use_mmap else None)
+
+        spec = manifest['vectorizer']
+        terms = load('vectorizer/vocabulary.npy', use_mmap=False)
+        vectorizer = ArrayVectorizer(spec, terms=terms, idf=load('vectorizer/idf.npy'))
+
+        # Tabela de tokeni si stop words
+        preprocessing = manifest.get('preprocessing') or {}
+        settings = preprocessing.get('settings') or (manifest.get('token_table') or {}).get('settings')
+        stop_words = None
+        if preprocessing.get('stop_words'):
+            stop_words = set(load('preprocessing/stop_words.npy', use_mmap=False).tolist())
+        entries, vocabulary_words = {}, None
+        if manifest.get('token_table'):
+            tokens = load('token_table/tokens.npy', use_mmap=False).tolist()
+            values = load('token_table/values.npy', use_mmap=False).tolist()
+            entries = dict(zip(tokens, values))
+            if manifest['token_table']['vocabulary_filter'] and vectorizer.vocabulary is not None:
+                vocabulary_words = set()
+                for term in vectorizer.vocabulary:
+                    vocabulary_words.update(term.split(' '))
+        tokenizer = TableTokenizer(entries, vocabulary_words=vocabulary_words, stop_words=stop_words,
+                                   settings=settings)
+
+        models = {}
+        for name, model_spec in manifest['models'].items():
+            prefix = f'models/{name}'
+            if model_spec['type'] == 'compact_forest':
+                models[name] = CompactForest.load(os.path.join(bundle_dir, prefix), mmap=mmap)
+                continue
+            classes = load(f'{prefix}/classes.npy', use_mmap=False)
+            if model_spec['type'] == 'linear_ovo_svm':
+                models[name] = LinearOneVsOneSVM(load(f'{prefix}/pair_coef.npy'),
+                                                 load(f'{prefix}/pair_intercept.npy'), classes)
+            elif model_spec['type'] == 'multinomial_nb':
+                models[name] = _ArrayModel(classes,
+                                           feature_log_prob_=load(f'{prefix}/feature_log_prob.npy'),
+                                           class_log_prior_=load(f'{prefix}/class_log_prior.npy'))
+            else:
+                models[name] = _ArrayModel(classes,
+                                           coef_=load(f'{prefix}/coef.npy'),
+                                           intercept_=load(f'{prefix}/intercept.npy'))
+
+        return cls(manifest, bundle_dir, tokenizer, vectorizer, models, display_names=display_names)
+
+    def preprocess(self, text):
+        """Documentul in formatul asteptat de vectorizer (tokeni sau text preprocesat)"""
+        tokens = self.tokenizer.tokenize(text)
+        return tokens if self.vectorizer.spec['token_stream'] else ' '.join(tokens)
+
+    def score(self, X, model_names):
+        """
+        Scoreaza matricea X cu modelele alese
+
+        Returns:
+            Dictionar {nume: {'labels', 'probabilities', 'prediction_time'}}
+        """
+        scored = {}
+        fused_names = [name for name in model_names
+                       if self.fused_scorer is not None and name in self.fused_scorer.model_names]
+        if fused_names:
+            fused_results, fused_time = self.fused_scorer.score(X)
+            for name in fused_names:
+                scored[name] = dict(fused_results[name], prediction_time=fused_time)
+
+        for name in model_names:
+            if name in scored:
+                continue
+            start_time = time.time()
+            model = self.models[name]
+            if isinstance(model, CompactForest):
+                probabilities = model.predict_proba(X)
+                labels = model.classes_[np.argmax(probabilities, axis=1)]
+            else:
+                probabilities = None
+                labels = model.predict(X)
+            scored[name] = {'labels': labels, 'probabilities': probabilities,
+                            'prediction_time': time.time() - start_time}
+        return scored
+
+    def predict(self, text, models=None):
+        """
+        Face predictii pentru un text (acelasi format ca predict_text din app.py)
+
+        Args:
+            text: Textul de clasificat
+            models: Numele modelelor folosite (implicit toate)
+
+        Returns:
+            (results, performance_metrics)
+        """
+        performance_metrics = {'algorithms': {}, 'model_version': self.version}
+        total_start = time.time()
+
+        document = self.preprocess(text)
+        performance_metrics['preprocessing_time'] = time.time() - total_start
+
+        vectorize_start = time.time()
+        X = self.vectorizer.transform([document])
+        performance_metrics['vectorization_time'] = time.time() - vectorize_start
+
+        model_names = [name for name in self.models if models is None or name in models]
+        results = {}
+        for name, scored in self.score(X, model_names).items():
+            prediction_id = int(scored['labels'][0])
+            if scored['probabilities'] is not None:
+                prob_values = {j: float(p) for j, p in enumerate(scored['probabilities'][0])}
+            else:
+                prob_values = {prediction_id: 1.0}
+            results[name] = {
+                'prediction': self.display_names[prediction_id],
+                'prediction_original': self.category_names[prediction_id],
+                'prediction_id': prediction_id,
+                'probabilities': {self.display_names[i]: p for i, p in prob_values.items()},
+                'confidence': float(max(prob_values.values())),
+                'prediction_time': scored['prediction_time'],
+                'prediction_time_ms': scored['prediction_time'] * 1000
+            }
+            performance_metrics['algorithms'][name] = {
+                'prediction_time': scored['prediction_time'],
+                'prediction_time_ms': scored['prediction_time'] * 1000
+            }
+
+        # Ordinea modelelor din raspuns ramane cea din bundle
+        results = {name: results[name] for name in model_names}
+        performance_metrics['total_time'] = time.time() - total_start
+        return results, performance_metrics
+
+
+if __name__ == "__main__":
+    import sys
+    import csv
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    models_dir = os.path.join(base_dir, 'models')
+
+    # Pornire: fara sklearn, pandas si nltk
+    start_time = time.time()
+    runtime = NumpyRuntime.from_models_dir(models_dir)
+    runtime.predict("warm-up text about space rockets and hockey players")
+    startup_time = time.time() - start_time
+    heavy_modules = [name for name in ('sklearn', 'pandas', 'nltk') if name in sys.modules]
+    print(f"Runtime NumPy: bundle {runtime.version}, pornire {startup_time * 1000:.1f}ms, "
+          f"module grele importate: {heavy_modules or 'niciunul'}")
+    assert not heavy_modules, heavy_modules
+
+    # Paritate cu calea sklearn (InferencePipeline din app.py, pe acelasi bundle)
+    sys.path.insert(0, base_dir)
+    import app as web_app
+    web_app.app.config['PRELOAD_MODELS'] = 'all'
+    assert web_app.load_models(start_workers=False), "Modelele nu sunt antrenate: python3 train_models.py"
+    assert web_app.pipeline.version == runtime.version, "Bundle-ul activ s-a schimbat intre incarcari"
+    runtime.display_names = web_app.pipeline.display_names
+
+    texts = [
+        "The rocket launch to orbit used a new space shuttle engine.",
+        "",
+        "!!! ??? ...",
+        "Zyxwvut qqqq unseen tokens everywhere, running runners ran",
+        "The players and the doctors met at the hockey arena; a goal was scored!",
+    ]
+    dataset_path = os.path.join(base_dir, 'data', 'processed', 'selected_6categories_dataset.csv')
+    if os.path.exists(dataset_path):
+        csv.field_size_limit(sys.maxsize)
+        with open(dataset_path, newline='', encoding='utf-8') as f:
+            texts += [row['text'] for _, row in zip(range(300), csv.DictReader(f))]
+
+    max_difference = 0.0
+    for text in texts:
+        lite_results, _ = runtime.predict(text)
+        reference_results, _ = web_app.pipeline.predict(text)
+        assert list(lite_results) == list(reference_results), (list(lite_results), list(reference_results))
+        for name, reference in reference_results.items():
+            lite = lite_results[name]
+            assert lite['prediction_id'] == reference['prediction_id'], (name, text[:80])
+            assert lite['probabilities'].keys() == reference['probabilities'].keys(), (name, text[:80])
+            for category, probability in reference['probabilities'].items():
+                max_difference = max(max_difference, abs(lite['probabilities'][category] - probability))
+
+    assert max_difference < 1e-9, max_difference
+    print(f"Paritate cu sklearn: OK ({len(texts)} texte, diferenta maxima a probabilitatilor {max_difference:.2e})")
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Porter stemmer fara dependinte (acelasi rezultat ca nltk.stem.PorterStemmer, modul implicit NLTK_EXTENSIONS)
+Folosit de runtime-ul de inferenta doar cu NumPy: importul nltk aduce si sklearn / pandas.
+
+Verificare de paritate cu nltk:
+    python3 src/porter_stemmer.py
+"""
+
+VOWELS = frozenset('aeiou')
+
+# Forme neregulate tratate separat de NLTK
+IRREGULAR_FORMS = {
+    'sky': ['sky', 'skies'],
+    'die': ['dying'],
+    'lie': ['lying'],
+    'tie': ['tying'],
+    'news': ['news'],
+    'inning': ['innings', 'inning'],
+    'outing': ['outings', 'outing'],
+    'canning': ['cannings', 'canning'],
+    'howe': ['howe'],
+    'proceed': ['proceed'],
+    'exceed': ['exceed'],
+    'succeed': ['succeed'],
+}
+IRREGULAR_POOL = {form: stem for stem, forms in IRREGULAR_FORMS.items() for form in forms}
+
+
+def _consonant_flags(word):
+    """True pentru consoane; 'y' este consoana daca litera anterioara nu este"""
+    flags = []
+    for i, ch in enumerate(word):
+        if ch in VOWELS:
+            flags.append(False)
+        elif ch == 'y':
+            flags.append(True if i == 0 else not flags[i - 1])
+        else:
+            flags.append(True)
+    return flags
+
+
+def _is_consonant(word, i):
+    return _consonant_flags(word[:i + 1])[i]
+
+
+def _measure(stem):
+    """Masura m din [C](VC){m}[V]"""
+    return ''.join('c' if flag else 'v' for flag in _consonant_flags(stem)).count('vc')
+
+
+def _has_positive_measure(stem):
+    return _measure(stem) > 0
+
+
+def _contains_vowel(stem):
+    return not all(_consonant_flags(stem))
+
+
+def _ends_double_consonant(word):
+    return len(word) >= 2 and word[-1] == word[-2] and _is_consonant(word, len(word) - 1)
+
+
+def _ends_cvc(word):
+    """Conditia *o (plus extensia NLTK pentru cuvinte de doua litere)"""
+    if len(word) >= 3:
+        flags = _consonant_flags(word)
+        if flags[-3] and not flags[-2] and flags[-1] and word[-1] not in 'wxy':
+            return True
+    if len(word) == 2:
+        flags = _consonant_flags(word)
+        return not flags[0] and flags[1]
+    return False
+
+
+def _apply_rule_list(word, rules):
+    """Aplica prima regula (sufix, inlocuire, conditie) potrivita"""
+    for suffix, replacement, condition in rules:
+        if suffix == '*d' and _ends_double_consonant(word):
+            stem = word[:-2]
+            return stem + replacement if condition is None or condition(stem) else word
+        if word.endswith(suffix):
+            stem = word[:len(word) - len(suffix)]
+            return stem + replacement if condition is None or condition(stem) else word
+    return word
+
+
+def _step1a(word):
+    if word.endswith('ies') and len(word) == 4:
+        return word[:-3] + 'ie'
+    return _apply_rule_list(word, [('sses', 'ss', None), ('ies', 'i', None), ('ss', 'ss', None), ('s', '', None)])
+
+
+def _step1b(word):
+    if word.endswith('ied'):
+        return word[:-3] + ('ie' if len(word) == 4 else 'i')
+
+    if word.endswith('eed'):
+        stem = word[:-3]
+        return stem + 'ee' if _measure(stem) > 0 else word
+
+    for suffix in ('ed', 'ing'):
+        if word.endswith(suffix) and _contains_vowel(word[:-len(suffix)]):
+            stem = word[:-len(suffix)]
+            break
+    else:
+        return word
+
+    return _apply_rule_list(stem, [
+        ('at', 'ate', None),
+        ('bl', 'ble', None),
+        ('iz', 'ize', None),
+        ('*d', stem[-1], lambda _: stem[-1] not in ('l', 's', 'z')),
+        ('', 'e', lambda s: _measure(s) == 1 and _ends_cvc(s)),
+    ])
+
+
+def _step1c(word):
+    return _apply_rule_list(word, [('y', 'i', lambda s: len(s) > 1 and _is_consonant(s, len(s) - 1))])
+
+
+STEP2_RULES = [
+    ('ational', 'ate'), ('tional', 'tion'), ('enci', 'ence'), ('anci', 'ance'), ('izer', 'ize'),
+    ('bli', 'ble'), ('alli', 'al'), ('entli', 'ent'), ('eli', 'e'), ('ousli', 'ous'),
+    ('ization', 'ize'), ('ation', 'ate'), ('ator', 'ate'), ('alism', 'al'), ('iveness', 'ive'),
+    ('fulness', 'ful'), ('ousness', 'ous'), ('aliti', 'al'), ('iviti', 'ive'), ('biliti', 'ble'),
+    ('fulli', 'ful'),
+]
+
+STEP3_RULES = [
+    ('icate', 'ic'), ('ative', ''), ('alize', 'al'), ('iciti', 'ic'), ('ical', 'ic'), ('ful', ''), ('ness', ''),
+]
+
+STEP4_SUFFIXES = [
+    'al', 'ance', 'ence', 'er', 'ic', 'able', 'ible', 'ant', 'ement', 'ment', 'ent',
+    'ion', 'ou', 'ism', 'ate', 'iti', 'ous', 'ive', 'ize',
+]
+
+
+def _step2(word):
+    if word.endswith('alli') and _has_positive_measure(word[:-4]):
+        return _step2(word[:-4] + 'al')
+    rules = [(suffix, replacement, _has_positive_measure) for suffix, replacement in STEP2_RULES]
+    rules.append(('logi', 'log', lambda _: _has_positive_measure(word[:-3])))
+    return _apply_rule_list(word, rules)
+
+
+def _step3(word):
+    return _apply_rule_list(word, [(suffix, replacement, _has_positive_measure)
+                                   for suffix, replacement in STEP3_RULES])
+
+
+def _step4(word):
+    rules = []
+    for suffix in STEP4_SUFFIXES:
+        if suffix == 'ion':
+            rules.append((suffix, '', lambda s: _measure(s) > 1 and s[-1] in ('s', 't')))
+        else:
+            rules.append((suffix, '', lambda s: _measure(s) > 1))
+    return _apply_rule_list(word, rules)
+
+
+def _step5a(word):
+    if word.endswith('e'):
+        stem = word[:-1]
+        measure = _measure(stem)
+        if measure > 1 or (measure == 1 and not _ends_cvc(stem)):
+            return stem
+    return word
+
+
+def _step5b(word):
+    return _apply_rule_list(word, [('ll', 'l', lambda _: _measure(word[:-1]) > 1)])
+
+
+def porter_stem(word):
+    """
+    Stem-ul Porter al unui cuvant
+
+    Args:
+        word: Cuvantul
+
+    Returns:
+        Stem-ul (litere mici)
+    """
+    stem = word.lower()
+    if stem in IRREGULAR_POOL:
+        return IRREGULAR_POOL[stem]
+    if len(word) <= 2:
+        return stem
+    for step in (_step1a, _step1b, _step1c, _step2, _step3, _step4, _step5a, _step5b):
+        stem = step(stem)
+    return stem
+
+
+if __name__ == "__main__":
+    import os
+    import re
+    import csv
+    import sys
+    from nltk.stem import PorterStemmer
+
+    words = set('''caresses ponies ties caress cats feed agreed plastered bled motoring sing conflated
+        troubled sized hopping tanned falling hissing fizzed failing filing happy sky skies dying relational
+        conditional rational valenci hesitanci digitizer conformabli radicalli differentli vileli analogousli
+        vietnamization predication operator feudalism decisiveness hopefulness callousness formaliti
+        sensitiviti sensibiliti triplicate formative formalize electriciti electrical hopeful goodness revival
+        allowance inference airliner gyroscopic adjustable defensible irritant replacement adjustment
+        dependent adoption homologou communism activate angulariti homologous effective bowdlerize probate
+        rate cease controll roll generously fully spied tried flies enjoy enjoyment as is by yyyy syzygy
+        toy ties logi analogi archaeologi innings news proceed exceed succeeded dies lied a an'''.split())
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    dataset_path = os.path.join(base_dir, 'data', 'processed', 'selected_6categories_dataset.csv')
+    if os.path.exists(dataset_path):
+        csv.field_size_limit(sys.maxsize)
+        with open(dataset_path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                words.update(re.sub(r'[^a-z0-9\s]', ' ', row['text'].lower()).split())
+
+    stemmer = PorterStemmer()
+    mismatches = [(word, porter_stem(word), stemmer.stem(word)) for word in sorted(words)
+                  if porter_stem(word) != stemmer.stem(word)]
+    assert not mismatches, mismatches[:20]
+    print(f"Porter stemmer: {len(words)} cuvinte, identic cu nltk")
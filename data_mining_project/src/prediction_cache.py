@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Cache pentru rezultatele predictiilor (LRU + TTL) cu de-duplicare single-flight
+Cererile identice care sosesc in timp ce rezultatul este calculat asteapta acelasi calcul
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+def prediction_cache_key(document, model_version):
+    """
+    Cheia din cache: hash-ul textului preprocesat + versiunea modelelor
+
+    Args:
+        document: Textul preprocesat (string) sau lista de tokeni
+        model_version: Versiunea setului de modele
+
+    Returns:
+        Cheia (string hexazecimal)
+    """
+    if isinstance(document, (list, tuple)):
+        document = ' '.join(document)
+    digest = hashlib.sha256(f'{model_version}\n{document}'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    """Cache LRU limitat, cu expirare (TTL) si single-flight pentru cheile in curs de calcul"""
+
+    def __init__(self, max_entries=10000, ttl_seconds=3600):
+        """
+        Initializeaza cache-ul
+
+        Args:
+            max_entries: Numarul maxim de intrari (cele mai vechi folosite sunt eliminate)
+            ttl_seconds: Durata de viata a unei intrari (None = fara expirare)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # cheie -> (expira_la, valoare)
+        self._in_flight = {}  # cheie -> Future
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'coalesced': 0,  # cereri care au asteptat un calcul deja pornit
+            'evictions': 0,
+            'expirations': 0
+        }
+
+    def get_or_compute(self, key, compute):
+        """
+        Returneaza valoarea din cache sau o calculeaza o singura data
+
+        Args:
+            key: Cheia cererii
+            compute: Functie fara argumente care calculeaza valoarea
+
+        Returns:
+            (valoare, status) unde status este 'hit', 'miss' sau 'coalesced'
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return value, 'hit'
+                del self._entries[key]
+                self._stats['expirations'] += 1
+
+            future = self._in_flight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._in_flight[key] = Future()
+                self._stats['misses'] += 1
+            else:
+                self._stats['coalesced'] += 1
+
+        if not is_owner:
+            return future.result(), 'coalesced'
+
+        try:
+            value = compute()
+        except Exception as e:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._store(key, value)
+            self._in_flight.pop(key, None)
+        future.set_result(value)
+
+        return value, 'miss'
+
+    def get(self, key):
+        """
+        Cauta o valoare fara sa porneasca un calcul
+
+        Args:
+            key: Cheia cererii
+
+        Returns:
+            Valoarea din cache sau None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return value
+                del self._entries[key]
+                self._stats['expirations'] += 1
+            self._stats['misses'] += 1
+        return None
+
+    def put(self, key, value):
+        """
+        Adauga o valoare calculata in afara get_or_compute
+
+        Args:
+            key: Cheia cererii
+            value: Valoarea de salvat
+        """
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key, value):
+        """Salveaza o intrare si elimina cele mai vechi (apelat cu lock-ul luat)"""
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def clear(self):
+        """Goleste cache-ul (statisticile se pastreaza)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Statisticile cache-ului
+
+        Returns:
+            Dictionar cu hits, misses, evictions, dimensiune etc.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+            stats['in_flight'] = len(self._in_flight)
+        lookups = stats['hits'] + stats['misses'] + stats['coalesced']
+        stats['max_entries'] = self.max_entries
+        stats['ttl_seconds'] = self.ttl_seconds
+        stats['hit_rate'] = (stats['hits'] + stats['coalesced']) / lookups if lookups else 0.0
+        return stats
@@ -4,13 +4,19 @@ Modul pentru preprocesarea textului
 Include: tokenizare, eliminare stop words, stemming, vectorizare
 """
 
+import os
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import nltk
 from nltk.corpus import stopwords
 from nltk.stem import PorterStemmer
-from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer, HashingVectorizer, TfidfTransformer
 from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+
+from corpus_cache import load_or_build_corpus
 
 # Descarca resursele NLTK necesare (doar prima data)
 try:
@@ -24,10 +30,36 @@ except LookupError:
     nltk.download('stopwords', quiet=True)
 
 
+# Valori speciale in tabela de tokeni
+TOKEN_DROP = ''  # token eliminat complet (stop word sau stem de un singur caracter)
+TOKEN_OOV = '_oov_'  # token in afara vocabularului; pastreaza granita dintre bigrame
+
+
+class TokenTable:
+    """Tabela persistenta token brut (lowercase) -> stem / TOKEN_DROP / TOKEN_OOV"""
+    
+    def __init__(self, entries, vocabulary_words=None, settings=None):
+        """
+        Initializeaza tabela
+        
+        Args:
+            entries: Dictionar {token_brut: stem sau valoare speciala}
+            vocabulary_words: Multimea cuvintelor care apar in vocabularul vectorizer-ului
+            settings: Setarile preprocesorului cu care a fost construita tabela
+        """
+        self.entries = entries
+        self.vocabulary_words = vocabulary_words
+        self.settings = settings or {}
+    
+    def __len__(self):
+        return len(self.entries)
+
+
 class TextPreprocessor:
     """Clasă pentru preprocesarea textului"""
     
-    def __init__(self, use_stemming=True, use_stopwords=True, language='english'):
+    def __init__(self, use_stemming=True, use_stopwords=True, language='english',
+                 token_table=None, cache_size=50000):
         """
         Initializeaza preprocesorul
         
@@ -35,11 +67,37 @@ class TextPreprocessor:
             use_stemming: Daca sa foloseasca stemming
             use_stopwords: Daca sa elimine stop words
             language: Limba pentru stop words
+            token_table: TokenTable exportat la antrenare (optional, pentru inferenta)
+            cache_size: Numarul maxim de tokeni tinuti in memo-ul local
         """
         self.use_stemming = use_stemming
         self.use_stopwords = use_stopwords
+        self.language = language
         self.stemmer = PorterStemmer() if use_stemming else None
         self.stop_words = set(stopwords.words(language)) if use_stopwords else set()
+        
+        if token_table is not None and token_table.settings and token_table.settings != self.settings():
+            raise ValueError(
+                f"Tabela de tokeni a fost construita cu alte setari: {token_table.settings}"
+            )
+        self.token_table = token_table
+        self.cache_size = cache_size
+        self._token_cache = {}
+        # Acelasi preprocesor este folosit de thread-urile serverului si ale micro-batcher-ului
+        self._cache_lock = threading.Lock()
+    
+    def settings(self):
+        """
+        Setarile care influenteaza rezultatul preprocesarii
+        
+        Returns:
+            Dictionar cu setarile
+        """
+        return {
+            'use_stemming': self.use_stemming,
+            'use_stopwords': self.use_stopwords,
+            'language': self.language
+        }
     
     def clean_text(self, text):
         """
@@ -88,6 +146,15 @@ class TextPreprocessor:
         # Tokenizare simpla (poti folosi si nltk.word_tokenize)
         tokens = text.split()
         
+        # Stop words + stemming printr-o singura cautare per token
+        if self.token_table is not None or self.cache_size:
+            mapped_tokens = []
+            for token in tokens:
+                mapped = self.map_token(token)
+                if mapped:
+                    mapped_tokens.append(mapped)
+            return mapped_tokens
+        
         # Elimina stop words
         if self.use_stopwords:
             tokens = [token for token in tokens if token not in self.stop_words]
@@ -98,6 +165,53 @@ class TextPreprocessor:
         
         return tokens
     
+    def map_token(self, token):
+        """
+        Transforma un token brut in stem (sau TOKEN_DROP / TOKEN_OOV)
+        Cauta intai in tabela exportata, apoi in memo-ul local limitat
+        
+        Args:
+            token: Token brut, deja curatat si lowercase
+            
+        Returns:
+            Stem-ul tokenului, TOKEN_DROP sau TOKEN_OOV
+        """
+        if self.token_table is not None:
+            mapped = self.token_table.entries.get(token)
+            if mapped is not None:
+                return mapped
+        
+        with self._cache_lock:
+            mapped = self._token_cache.get(token)
+        if mapped is not None:
+            return mapped
+        
+        # Stemming-ul (partea costisitoare) ruleaza in afara lock-ului
+        mapped = self._map_token_uncached(token)
+        
+        # Memo limitat: elimina cea mai veche intrare cand este plin
+        if self.cache_size:
+            with self._cache_lock:
+                if token not in self._token_cache:
+                    if len(self._token_cache) >= self.cache_size:
+                        del self._token_cache[next(iter(self._token_cache))]
+                    self._token_cache[token] = mapped
+        
+        return mapped
+    
+    def _map_token_uncached(self, token):
+        """Calculeaza maparea unui token (stop words, stemming, vocabular)"""
+        if self.use_stopwords and token in self.stop_words:
+            return TOKEN_DROP
+        
+        stem = self.stemmer.stem(token) if self.use_stemming and self.stemmer else token
+        
+        if self.token_table is None:
+            return stem
+        
+        # Cu tabela: aceleasi decizii ca la export
+        return _classify_stem(stem, self.token_table.vocabulary_words)
+    
     def preprocess_text(self, text):
         """
         Preproceseaza un text complet
@@ -111,27 +225,213 @@ class TextPreprocessor:
         tokens = self.tokenize(text)
         return ' '.join(tokens)
     
-    def preprocess_dataframe(self, df, text_column='text'):
+    def preprocess_dataframe(self, df, text_column='text', as_tokens=False, n_jobs=1, chunksize=1000):
         """
         Preproceseaza un DataFrame intreg
         
         Args:
             df: DataFrame cu textul
             text_column: Numele coloanei cu textul
+            as_tokens: Daca sa pastreze listele de tokeni (pentru TokenNgramAnalyzer)
+            n_jobs: Numarul de procese (1 = secvential, -1 = toate core-urile)
+            chunksize: Numarul de documente trimise unui proces odata
             
         Returns:
             DataFrame cu textul preprocesat
         """
         df_processed = df.copy()
-        df_processed[f'{text_column}_processed'] = df_processed[text_column].apply(
-            self.preprocess_text
-        )
+        
+        if n_jobs is not None and n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        texts = df_processed[text_column].tolist()
+        
+        if not n_jobs or n_jobs == 1 or len(texts) <= chunksize:
+            df_processed[f'{text_column}_processed'] = df_processed[text_column].apply(
+                self.tokenize if as_tokens else self.preprocess_text
+            )
+            return df_processed
+        
+        # Fiecare worker isi construieste o singura data stemmer-ul si stop words
+        chunks = [(texts[i:i + chunksize], as_tokens) for i in range(0, len(texts), chunksize)]
+        with ProcessPoolExecutor(
+            max_workers=min(n_jobs, len(chunks)),
+            initializer=_init_preprocess_worker,
+            initargs=(self.settings(), self.token_table, self.cache_size)
+        ) as executor:
+            # map pastreaza ordinea chunk-urilor, deci rezultatul este determinist
+            processed = [doc for chunk in executor.map(_preprocess_chunk, chunks) for doc in chunk]
+        
+        df_processed[f'{text_column}_processed'] = pd.Series(processed, index=df_processed.index, dtype=object)
         return df_processed
 
 
+# Preprocesorul procesului worker curent (construit in initializer)
+_worker_preprocessor = None
+
+
+def _init_preprocess_worker(settings, token_table, cache_size):
+    """Initializeaza preprocesorul unui proces worker"""
+    global _worker_preprocessor
+    _worker_preprocessor = TextPreprocessor(token_table=token_table, cache_size=cache_size, **settings)
+
+
+def _preprocess_chunk(args):
+    """Preproceseaza un chunk de texte in procesul worker"""
+    texts, as_tokens = args
+    preprocess = _worker_preprocessor.tokenize if as_tokens else _worker_preprocessor.preprocess_text
+    return [preprocess(text) for text in texts]
+
+
+class TokenNgramAnalyzer:
+    """
+    Analyzer pentru vectorizer care primeste direct lista de tokeni a preprocesorului
+    Evita join-ul in string si re-tokenizarea cu regex din vectorizer
+    """
+    
+    def __init__(self, ngram_range=(1, 2)):
+        """
+        Initializeaza analyzer-ul
+        
+        Args:
+            ngram_range: Intervalul de n-grame (ca la TfidfVectorizer)
+        """
+        self.ngram_range = tuple(ngram_range)
+    
+    def __call__(self, tokens):
+        """
+        Genereaza n-gramele pentru o lista de tokeni
+        
+        Args:
+            tokens: Lista de tokeni (rezultatul TextPreprocessor.tokenize)
+            
+        Returns:
+            Lista de n-grame (aceleasi ca analyzer-ul 'word' pe textul unit)
+        """
+        # Acelasi filtru ca token_pattern-ul implicit: minim 2 caractere
+        tokens = [token for token in tokens if len(token) > 1]
+        
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+        
+        n_tokens = len(tokens)
+        ngrams = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, n_tokens) + 1):
+            for i in range(n_tokens - n + 1):
+                ngrams.append(' '.join(tokens[i:i + n]))
+        
+        return ngrams
+
+
+def uses_token_stream(vectorizer):
+    """Verifica daca vectorizer-ul asteapta liste de tokeni in loc de text"""
+    if isinstance(vectorizer, Pipeline):
+        vectorizer = vectorizer.steps[0][1]
+    return isinstance(getattr(vectorizer, 'analyzer', None), TokenNgramAnalyzer)
+
+
+def build_vectorizer(vectorizer_type='tfidf', max_features=10000, token_stream=False,
+                     n_features=2 ** 18, use_idf=False):
+    """
+    Construieste vectorizer-ul folosit la antrenare
+    
+    Args:
+        vectorizer_type: 'tfidf', 'count' sau 'hashing'
+        max_features: Numarul maxim de features pentru vectorizare (tfidf/count)
+        token_stream: Daca vectorizer-ul primeste direct listele de tokeni
+        n_features: Numarul de features (coloane) pentru 'hashing'
+        use_idf: Daca sa reponde cu IDF features-urile 'hashing'
+        
+    Returns:
+        Vectorizer neantrenat
+    """
+    if token_stream:
+        # n-gramele sunt generate de analyzer, nu de vectorizer
+        ngram_params = {'analyzer': TokenNgramAnalyzer(ngram_range=(1, 2))}
+    else:
+        ngram_params = {'ngram_range': (1, 2)}  # unigrams si bigrams
+    
+    if vectorizer_type == 'hashing':
+        # Fara vocabular: memoria nu creste cu numarul de termeni, transform-ul nu are stare
+        hashing_vectorizer = HashingVectorizer(
+            n_features=n_features,
+            alternate_sign=False,  # valori pozitive, necesare pentru MultinomialNB
+            norm=None if use_idf else 'l2',
+            **ngram_params
+        )
+        if not use_idf:
+            return hashing_vectorizer
+        return Pipeline([
+            ('hashing', hashing_vectorizer),
+            ('tfidf', TfidfTransformer())
+        ])
+    
+    vectorizer_class = TfidfVectorizer if vectorizer_type == 'tfidf' else CountVectorizer
+    return vectorizer_class(
+        max_features=max_features,
+        min_df=2,  # minim 2 aparitii
+        max_df=0.95,  # maxim 95% din documente
+        **ngram_params
+    )
+
+
+def _classify_stem(stem, vocabulary_words):
+    """
+    Decide ce ajunge la vectorizer pentru un stem
+    
+    Args:
+        stem: Stem-ul tokenului
+        vocabulary_words: Cuvintele din vocabular (None = fara filtrare)
+        
+    Returns:
+        Stem-ul, TOKEN_DROP sau TOKEN_OOV
+    """
+    # token_pattern-ul vectorizer-ului ignora tokenii de un caracter
+    if len(stem) < 2:
+        return TOKEN_DROP
+    if vocabulary_words is not None and stem not in vocabulary_words:
+        return TOKEN_OOV
+    return stem
+
+
+def build_token_table(texts, preprocessor, vocabulary=None):
+    """
+    Construieste tabela token brut -> stem din corpusul de antrenare
+    
+    Args:
+        texts: Textele brute de antrenare
+        preprocessor: TextPreprocessor cu setarile folosite la antrenare
+        vocabulary: vectorizer.vocabulary_ (optional; fara el nu se marcheaza OOV)
+        
+    Returns:
+        TokenTable
+    """
+    vocabulary_words = None
+    if vocabulary is not None:
+        # Un cuvant poate aparea doar in bigrame (unigrama eliminata de max_df/max_features)
+        vocabulary_words = set()
+        for term in vocabulary:
+            vocabulary_words.update(term.split(' '))
+    
+    raw_tokens = set()
+    for text in texts:
+        raw_tokens.update(preprocessor.clean_text(text).split())
+    
+    entries = {}
+    for token in raw_tokens:
+        if preprocessor.use_stopwords and token in preprocessor.stop_words:
+            entries[token] = TOKEN_DROP
+            continue
+        stem = preprocessor.stemmer.stem(token) if preprocessor.use_stemming and preprocessor.stemmer else token
+        entries[token] = _classify_stem(stem, vocabulary_words)
+    
+    return TokenTable(entries, vocabulary_words=vocabulary_words, settings=preprocessor.settings())
+
+
 def prepare_data_for_training(df, text_column='text', label_column='category_id', 
                               test_size=0.2, random_state=42, vectorizer_type='tfidf',
-                              max_features=10000):
+                              max_features=10000, token_stream=False, n_jobs=1, chunksize=1000,
+                              dataset_path=None, cache_dir=None, n_features=2 ** 18, use_idf=False):
     """
     Pregateste datele pentru antrenare: preprocesare si vectorizare
     
@@ -141,35 +441,43 @@ def prepare_data_for_training(df, text_column='text', label_column='category_id'
         label_column: Coloana cu etichetele
         test_size: Procentaj pentru test set
         random_state: Seed pentru reproducibilitate
-        vectorizer_type: 'tfidf' sau 'count'
+        vectorizer_type: 'tfidf', 'count' sau 'hashing'
         max_features: Numarul maxim de features pentru vectorizare
+        token_stream: Daca tokenii preprocesorului ajung direct in vectorizer (fara join/re-split)
+        n_jobs: Numarul de procese pentru preprocesare (-1 = toate core-urile)
+        chunksize: Numarul de documente per chunk trimis unui proces
+        dataset_path: Calea fisierului din care provine df (necesara pentru cache)
+        cache_dir: Directorul cache-ului de corpus preprocesat (None = fara cache)
+        n_features: Numarul de features pentru vectorizer_type='hashing'
+        use_idf: Reponderare IDF pentru vectorizer_type='hashing'
         
     Returns:
         X_train, X_test, y_train, y_test, vectorizer
     """
     # Preprocesare
     preprocessor = TextPreprocessor(use_stemming=True, use_stopwords=True)
-    df_processed = preprocessor.preprocess_dataframe(df, text_column)
-    
-    # Vectorizare
-    if vectorizer_type == 'tfidf':
-        vectorizer = TfidfVectorizer(
-            max_features=max_features,
-            ngram_range=(1, 2),  # unigrams si bigrams
-            min_df=2,  # minim 2 aparitii
-            max_df=0.95  # maxim 95% din documente
+    if dataset_path is not None and cache_dir is not None:
+        # Corpusul tokenizat este refolosit intre rulari (cheie: hash dataset + setari)
+        corpus = load_or_build_corpus(
+            dataset_path, df, preprocessor, cache_dir, text_column=text_column,
+            n_jobs=n_jobs, chunksize=chunksize
         )
+        documents = corpus.documents(as_tokens=token_stream)
     else:
-        vectorizer = CountVectorizer(
-            max_features=max_features,
-            ngram_range=(1, 2),
-            min_df=2,
-            max_df=0.95
+        df_processed = preprocessor.preprocess_dataframe(
+            df, text_column, as_tokens=token_stream, n_jobs=n_jobs, chunksize=chunksize
         )
+        documents = df_processed[f'{text_column}_processed']
+    
+    # Vectorizare
+    vectorizer = build_vectorizer(
+        vectorizer_type, max_features, token_stream=token_stream,
+        n_features=n_features, use_idf=use_idf
+    )
     
     # Vectorizare text
-    X = vectorizer.fit_transform(df_processed[f'{text_column}_processed'])
-    y = df_processed[label_column].values
+    X = vectorizer.fit_transform(documents)
+    y = df[label_column].values
     
     # Split train/test
     X_train, X_test, y_train, y_test = train_test_split(
@@ -193,4 +501,3 @@ if __name__ == "__main__":
     
     print("Text original:", sample_text)
     print("Text preprocesat:", processed)
-
@@ -4,14 +4,17 @@ Implementare Random Forest pentru clasificare text
 """
 
 import time
+import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 
+from forest_engine import CompactForest
+
 
 class RandomForestTextClassifier:
     """Clasificator Random Forest pentru text"""
     
-    def __init__(self, n_estimators=100, max_depth=None, random_state=42):
+    def __init__(self, n_estimators=100, max_depth=None, random_state=42, n_jobs=-1, inference_n_jobs=1):
         """
         Initializeaza clasificatorul
         
@@ -19,16 +22,41 @@ class RandomForestTextClassifier:
             n_estimators: Numarul de arbori
             max_depth: Adancimea maxima a arborilor
             random_state: Seed pentru reproducibilitate
+            n_jobs: Numarul de core-uri la antrenare (-1 = toate)
+            inference_n_jobs: Numarul de core-uri la predictie (1 = fara thread pool per cerere)
         """
         self.model = RandomForestClassifier(
             n_estimators=n_estimators,
             max_depth=max_depth,
             random_state=random_state,
-            n_jobs=-1  # foloseste toate core-urile
+            n_jobs=n_jobs
         )
+        self.inference_n_jobs = inference_n_jobs
         self.training_time = None
         self.prediction_time = None
     
+    @classmethod
+    def from_model(cls, model, inference_n_jobs=1):
+        """
+        Construieste wrapper-ul in jurul unui model sklearn deja antrenat (ex: incarcat din .pkl)
+        
+        Args:
+            model: RandomForestClassifier antrenat sau CompactForest
+            inference_n_jobs: Numarul de core-uri la predictie (1 = fara thread pool per cerere)
+            
+        Returns:
+            Instanta wrapper-ului
+        """
+        classifier = cls.__new__(cls)
+        classifier.model = model
+        classifier.inference_n_jobs = inference_n_jobs
+        if hasattr(model, 'set_params'):
+            # Un .pkl vechi poate pastra n_jobs=-1 de la antrenare (thread pool pe toate core-urile)
+            model.set_params(n_jobs=inference_n_jobs)
+        classifier.training_time = None
+        classifier.prediction_time = None
+        return classifier
+    
     def train(self, X_train, y_train):
         """
         Antreneaza modelul
@@ -48,8 +76,20 @@ class RandomForestTextClassifier:
         self.training_time = time.time() - start_time
         print(f"Antrenare completa in {self.training_time:.6f} secunde")
         
+        # Paralelismul de antrenare nu se pastreaza pentru inferenta
+        self.model.set_params(n_jobs=self.inference_n_jobs)
+        
         return self
     
+    def to_compact(self):
+        """
+        Exporta padurea ca vectori NumPy compacti (vezi forest_engine.CompactForest)
+        
+        Returns:
+            CompactForest
+        """
+        return CompactForest.from_sklearn(self.model)
+    
     def predict(self, X_test):
         """
         Face predictii
@@ -66,6 +106,29 @@ class RandomForestTextClassifier:
         
         return predictions
     
+    def predict_with_scores(self, X, return_scores=False):
+        """
+        Eticheta si probabilitatile dintr-o singura evaluare a modelului
+        
+        Args:
+            X: Features
+            return_scores: Ignorat (probabilitatile sunt deja scorurile modelului)
+            
+        Returns:
+            Dictionar cu 'labels', 'probabilities', 'scores' (None) si 'prediction_time' (durata acestui apel)
+        """
+        start_time = time.time()
+        probabilities = self.model.predict_proba(X)
+        labels = self.model.classes_[np.argmax(probabilities, axis=1)]
+        elapsed = time.time() - start_time
+        
+        return {
+            'labels': labels,
+            'probabilities': probabilities,
+            'scores': None,
+            'prediction_time': elapsed
+        }
+    
     def evaluate(self, X_test, y_test):
         """
         Evalueaza modelul
@@ -77,7 +140,9 @@ class RandomForestTextClassifier:
         Returns:
             Dictionar cu metrici
         """
-        predictions = self.predict(X_test)
+        scored = self.predict_with_scores(X_test)
+        self.prediction_time = scored['prediction_time']
+        predictions = scored['labels']
         
         accuracy = accuracy_score(y_test, predictions)
         
@@ -87,6 +152,7 @@ class RandomForestTextClassifier:
             'training_time': self.training_time,
             'prediction_time': self.prediction_time,
             'predictions': predictions,
+            'probabilities': scored['probabilities'],
             'classification_report': classification_report(y_test, predictions, output_dict=True),
             'confusion_matrix': confusion_matrix(y_test, predictions)
         }
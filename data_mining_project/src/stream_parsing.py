@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Citirea incrementala a randurilor din fisiere CSV / JSON / NDJSON primite pe bucati
+Parser-ul primeste bucatile de bytes pe masura ce sosesc (din stream-ul cererii, sincron sau async)
+si intoarce randurile complete; memoria folosita depinde doar de cel mai lung rand, nu de fisier.
+"""
+
+import csv
+import json
+import codecs
+
+
+STREAM_FORMATS = ('csv', 'json', 'ndjson')
+
+# Tipurile de continut recunoscute pentru fiecare format
+FORMAT_MIMETYPES = {
+    'text/csv': 'csv',
+    'application/csv': 'csv',
+    'application/json': 'json',
+    'application/x-ndjson': 'ndjson',
+    'application/ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+}
+
+_json_decoder = json.JSONDecoder()
+_JSON_WHITESPACE = ' \t\r\n'
+
+
+class StreamRow:
+    """Un rand citit din fisier: pozitia, textul, id-ul optional sau eroarea (rand invalid)"""
+
+    __slots__ = ('index', 'text', 'id', 'error')
+
+    def __init__(self, index, text=None, id=None, error=None):
+        self.index = index
+        self.text = text
+        self.id = id
+        self.error = error
+
+
+class RowStreamParser:
+    """Parser incremental: feed(bucata) -> randurile complete, close() -> randurile ramase"""
+
+    def __init__(self, fmt, text_field=None, id_field=None, max_record_bytes=1024 * 1024, encoding='utf-8'):
+        """
+        Initializeaza parser-ul
+
+        Args:
+            fmt: 'csv', 'json' (lista sau {"texts": [...]}) ori 'ndjson'
+            text_field: Coloana / cheia cu textul (implicit 'text'; la CSV fara 'text', prima coloana)
+            id_field: Coloana / cheia cu id-ul randului, intors in rezultate (implicit 'id', daca exista)
+            max_record_bytes: Lungimea maxima a unui rand (un rand neterminat nu poate creste la infinit)
+            encoding: Codificarea fisierului
+        """
+        if fmt not in STREAM_FORMATS:
+            raise ValueError(f"Format necunoscut: {fmt} (permise: {', '.join(STREAM_FORMATS)})")
+        self.fmt = fmt
+        self.text_field = text_field
+        self.id_field = id_field
+        self.max_record_bytes = max_record_bytes
+        if fmt == 'csv' and csv.field_size_limit() < max_record_bytes:
+            # Limita implicita a modulului csv (128KB per camp) ar respinge textele lungi
+            csv.field_size_limit(max_record_bytes)
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._buffer = ''
+        self._scan_pos = 0  # pozitia pana la care bufferul a fost deja cautat
+        self._quotes = 0  # ghilimelele CSV din buffer[:_scan_pos]
+        self._header = None
+        self._text_column = None
+        self._id_column = None
+        self._json_state = 'start'  # start -> [object_key ->] array -> [close_object ->] end
+        self._wrapped = False  # lista este in {"texts": [...]}
+        self.rows = 0  # numarul de randuri intoarse
+
+    def feed(self, chunk):
+        """
+        Adauga o bucata din fisier
+
+        Args:
+            chunk: Bytes (bucata poate taia un rand sau un caracter UTF-8 oriunde)
+
+        Returns:
+            Lista de StreamRow pentru randurile completate de aceasta bucata
+        """
+        self._buffer += self._decoder.decode(chunk)
+        rows = self._parse(final=False)
+        if len(self._buffer) > self.max_record_bytes:
+            raise ValueError(f"Randul {self.rows} depaseste {self.max_record_bytes} bytes "
+                             f"(sau fisierul nu este {self.fmt} valid)")
+        return rows
+
+    def close(self):
+        """
+        Termina fisierul
+
+        Returns:
+            Lista de StreamRow pentru ultimul rand (daca nu se termina cu newline)
+        """
+        self._buffer += self._decoder.decode(b'', final=True)
+        rows = self._parse(final=True)
+        if self.fmt == 'json' and self._json_state not in ('end', 'start'):
+            raise ValueError('JSON incomplet: lista nu este inchisa')
+        if self._buffer.strip(_JSON_WHITESPACE):
+            raise ValueError(f"Continut invalid dupa randul {self.rows}: {self._buffer.strip()[:50]!r}")
+        return rows
+
+    def _parse(self, final):
+        if self.fmt == 'csv':
+            return self._parse_csv(final)
+        if self.fmt == 'ndjson':
+            return self._parse_ndjson(final)
+        return self._parse_json()
+
+    def _make_row(self, text, id=None):
+        if isinstance(text, str) and text.strip():
+            row = StreamRow(self.rows, text=text, id=id)
+        else:
+            row = StreamRow(self.rows, id=id, error='Text gol sau invalid')
+        self.rows += 1
+        return row
+
+    # CSV
+
+    def _complete_lines(self, final, quoted):
+        """Taie din buffer liniile complete (la CSV un newline intre ghilimele nu termina randul)"""
+        lines, start = [], 0
+        buffer = self._buffer
+        while True:
+            newline = buffer.find('\n', self._scan_pos)
+            if newline < 0:
+                break
+            if quoted:
+                self._quotes += buffer.count('"', self._scan_pos, newline)
+            self._scan_pos = newline + 1
+            if self._quotes % 2 == 0:
+                lines.append(buffer[start:newline + 1])
+                start = newline + 1
+                self._quotes = 0
+        if final and start < len(buffer):
+            lines.append(buffer[start:])
+            start = len(buffer)
+        self._buffer = buffer[start:]
+        self._scan_pos -= start
+        if final:
+            self._scan_pos = 0
+        return lines
+
+    def _parse_csv(self, final):
+        rows = []
+        try:
+            for record in csv.reader(self._complete_lines(final, quoted=True)):
+                if not record:
+                    continue  # linie goala
+                if self._header is None:
+                    self._set_header(record)
+                    continue
+                text = record[self._text_column] if self._text_column < len(record) else ''
+                id = record[self._id_column] if self._id_column is not None and self._id_column < len(record) else None
+                rows.append(self._make_row(text, id))
+        except csv.Error as e:
+            raise ValueError(f'CSV invalid dupa randul {self.rows}: {str(e)}')
+        return rows
+
+    def _set_header(self, header):
+        self._header = [name.strip() for name in header]
+        if self.text_field is not None:
+            if self.text_field not in self._header:
+                raise ValueError(f"Coloana '{self.text_field}' nu exista (coloane: {', '.join(self._header)})")
+            self._text_column = self._header.index(self.text_field)
+        else:
+            # Ca la upload-ul obisnuit: prima coloana, daca nu exista una numita 'text'
+            self._text_column = self._header.index('text') if 'text' in self._header else 0
+        id_field = self.id_field or 'id'
+        if id_field in self._header:
+            self._id_column = self._header.index(id_field)
+        elif self.id_field is not None:
+            raise ValueError(f"Coloana '{self.id_field}' nu exista (coloane: {', '.join(self._header)})")
+
+    # JSON
+
+    def _row_from_item(self, item):
+        if isinstance(item, dict):
+            id = item.get(self.id_field or 'id')
+            if id is not None and not isinstance(id, (str, int, float)):
+                id = str(id)
+            return self._make_row(item.get(self.text_field or 'text'), id)
+        return self._make_row(item)
+
+    def _parse_ndjson(self, final):
+        rows = []
+        for line in self._complete_lines(final, quoted=False):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                row = StreamRow(self.rows, error=f'JSON invalid: {str(e)}')
+                self.rows += 1
+                rows.append(row)
+                continue
+            rows.append(self._row_from_item(item))
+        return rows
+
+    def _skip(self, position):
+        while position < len(self._buffer) and self._buffer[position] in _JSON_WHITESPACE:
+            position += 1
+        return position
+
+    def _parse_json(self):
+        """Elementele unei liste JSON ([...] sau {"texts": [...]}), pe masura ce sunt complete"""
+        rows = []
+        buffer, position = self._buffer, self._skip(0)
+        while position < len(buffer):
+            state = self._json_state
+            if state == 'start':
+                if buffer[position] == '[':
+                    self._json_state = 'array'
+                elif buffer[position] == '{':
+                    self._json_state = 'object_key'
+                else:
+                    raise ValueError('JSON-ul trebuie sa fie o lista sau {"texts": [...]}')
+                position = self._skip(position + 1)
+            elif state == 'object_key':
+                # Doar {"texts": [ ... ]}: cheia si ':' trebuie sa fie complete in buffer
+                try:
+                    key, end = _json_decoder.raw_decode(buffer, position)
+                except ValueError:
+                    break
+                end = self._skip(end)
+                if key != 'texts':
+                    raise ValueError('Obiectul JSON trebuie sa inceapa cu cheia "texts"')
+                if end >= len(buffer):
+                    break
+                if buffer[end] != ':':
+                    raise ValueError('JSON invalid dupa cheia "texts"')
+                end = self._skip(end + 1)
+                if end >= len(buffer):
+                    break
+                if buffer[end] != '[':
+                    raise ValueError('Campul "texts" trebuie sa fie o lista')
+                self._json_state = 'array'
+                self._wrapped = True
+                position = self._skip(end + 1)
+            elif state == 'array':
+                if buffer[position] == ']':
+                    position += 1
+                    self._json_state = 'close_object' if self._wrapped else 'end'
+                elif buffer[position] == ',':
+                    position = self._skip(position + 1)
+                else:
+                    if buffer[position] not in '"{':
+                        raise ValueError(f'Elementul {self.rows} trebuie sa fie un text sau un obiect')
+                    try:
+                        item, end = _json_decoder.raw_decode(buffer, position)
+                    except ValueError:
+                        break  # element incomplet: se asteapta urmatoarea bucata
+                    rows.append(self._row_from_item(item))
+                    position = self._skip(end)
+            elif state == 'close_object' or (state == 'end' and self._wrapped):
+                # Restul obiectului dupa lista nu este interpretat; se asteapta doar '}'
+                if '}' in buffer[position:]:
+                    self._json_state = 'end'
+                position = len(buffer)
+            else:
+                break
+            position = self._skip(position)
+        self._buffer = buffer[position:]
+        return rows
+
+
+def detect_format(fmt=None, mimetype=None, filename=None):
+    """
+    Formatul unui fisier trimis in stream
+
+    Args:
+        fmt: Formatul cerut explicit (parametrul format)
+        mimetype: Tipul continutului cererii
+        filename: Numele fisierului (extensia)
+
+    Returns:
+        'csv', 'json' sau 'ndjson'
+    """
+    if fmt:
+        fmt = fmt.lower()
+        if fmt == 'jsonl':
+            fmt = 'ndjson'
+        if fmt not in STREAM_FORMATS:
+            raise ValueError(f"Format necunoscut: {fmt} (permise: {', '.join(STREAM_FORMATS)})")
+        return fmt
+    if mimetype in FORMAT_MIMETYPES:
+        return FORMAT_MIMETYPES[mimetype]
+    if filename and '.' in filename:
+        extension = filename.rsplit('.', 1)[1].lower()
+        if extension in ('csv', 'json', 'ndjson', 'jsonl'):
+            return detect_format(extension)
+    raise ValueError('Formatul nu poate fi determinat: foloseste ?format=csv|json|ndjson sau Content-Type')
+
+
+def iter_stream_rows(chunks, parser):
+    """
+    Randurile dintr-un sir de bucati de bytes (varianta sincrona, ex: stream-ul cererii WSGI)
+
+    Args:
+        chunks: Iterabil de bytes
+        parser: RowStreamParser
+
+    Yields:
+        StreamRow
+    """
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Antrenare out-of-core (streaming) pentru seturi de date care nu incap in memorie
+Citeste CSV-ul pe bucati, vectorizeaza fiecare bucata si antreneaza modele cu partial_fit
+"""
+
+import hashlib
+import time
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.metrics import accuracy_score
+
+
+def is_holdout(text, test_size=0.2, salt='holdout'):
+    """
+    Decide determinist (dupa hash-ul textului) daca un document face parte din setul de test
+
+    Args:
+        text: Textul documentului
+        test_size: Fractiunea de documente pastrate pentru test
+        salt: Sare pentru hash (alta valoare = alt split)
+
+    Returns:
+        True daca documentul este in setul de test
+    """
+    digest = hashlib.md5(f'{salt}:{text}'.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') / 2 ** 64 < test_size
+
+
+def iter_dataset_chunks(dataset_path, chunksize=5000, text_column='text', label_column='category_id',
+                        test_size=0.2):
+    """
+    Citeste dataset-ul pe bucati si separa fiecare bucata in train/test
+
+    Args:
+        dataset_path: Calea catre fisierul CSV
+        chunksize: Numarul de randuri citite odata
+        text_column: Coloana cu textul
+        label_column: Coloana cu etichetele
+        test_size: Fractiunea de documente pastrate pentru test
+
+    Yields:
+        (texte_train, y_train, texte_test, y_test) pentru fiecare bucata
+    """
+    for chunk in pd.read_csv(dataset_path, chunksize=chunksize):
+        texts = chunk[text_column].fillna('').astype(str).tolist()
+        labels = chunk[label_column].values
+        holdout = np.array([is_holdout(text, test_size) for text in texts], dtype=bool)
+
+        train_texts = [text for text, h in zip(texts, holdout) if not h]
+        test_texts = [text for text, h in zip(texts, holdout) if h]
+        yield train_texts, labels[~holdout], test_texts, labels[holdout]
+
+
+def _vectorize(texts, preprocessor, vectorizer, token_stream):
+    """Preproceseaza si vectorizeaza o lista de texte"""
+    if token_stream:
+        documents = [preprocessor.tokenize(text) for text in texts]
+    else:
+        documents = [preprocessor.preprocess_text(text) for text in texts]
+    return vectorizer.transform(documents)
+
+
+def train_streaming(dataset_path, classifiers, vectorizer, preprocessor, classes,
+                    chunksize=5000, test_size=0.2, token_stream=False,
+                    text_column='text', label_column='category_id'):
+    """
+    Antreneaza clasificatorii incremental, bucata cu bucata, si ii evalueaza pe setul de test
+
+    Args:
+        dataset_path: Calea catre fisierul CSV
+        classifiers: Dictionar {nume: wrapper cu partial_fit} (ex: NaiveBayesClassifier)
+        vectorizer: Vectorizer fara stare (HashingVectorizer)
+        preprocessor: TextPreprocessor
+        classes: Toate etichetele posibile
+        chunksize: Numarul de randuri citite odata
+        test_size: Fractiunea de documente pastrate pentru test (split determinist dupa hash)
+        token_stream: Daca vectorizer-ul primeste liste de tokeni
+        text_column: Coloana cu textul
+        label_column: Coloana cu etichetele
+
+    Returns:
+        Dictionar cu statistici: documente train/test, acuratete si timpi per clasificator
+    """
+    if not isinstance(vectorizer, HashingVectorizer):
+        raise ValueError("Antrenarea streaming necesita un vectorizer fara stare (HashingVectorizer)")
+
+    classes = np.asarray(classes)
+    n_train = 0
+    n_test = 0
+    vectorization_time = 0.0
+
+    # Pasul 1: antrenare incrementala
+    for chunk_index, (train_texts, y_train, _, _) in enumerate(
+            iter_dataset_chunks(dataset_path, chunksize, text_column, label_column, test_size)):
+        if not train_texts:
+            continue
+
+        vectorize_start = time.time()
+        X_train = _vectorize(train_texts, preprocessor, vectorizer, token_stream)
+        vectorization_time += time.time() - vectorize_start
+
+        for classifier in classifiers.values():
+            classifier.partial_fit(X_train, y_train, classes=classes)
+
+        n_train += len(train_texts)
+        print(f"   Bucata {chunk_index + 1}: {n_train} documente de antrenare procesate")
+
+    # Pasul 2: evaluare pe setul de test (se tin in memorie doar etichetele)
+    y_true = []
+    y_pred = {name: [] for name in classifiers}
+    for _, _, test_texts, y_test in iter_dataset_chunks(
+            dataset_path, chunksize, text_column, label_column, test_size):
+        if not test_texts:
+            continue
+
+        X_test = _vectorize(test_texts, preprocessor, vectorizer, token_stream)
+        y_true.extend(y_test.tolist())
+        for name, classifier in classifiers.items():
+            y_pred[name].extend(classifier.predict(X_test).tolist())
+        n_test += len(test_texts)
+
+    stats = {
+        'train_documents': n_train,
+        'test_documents': n_test,
+        'vectorization_time': vectorization_time,
+        'algorithms': {}
+    }
+    for name, classifier in classifiers.items():
+        stats['algorithms'][name] = {
+            'accuracy': float(accuracy_score(y_true, y_pred[name])) if n_test else None,
+            'training_time': float(classifier.training_time or 0)
+        }
+
+    return stats
@@ -4,26 +4,74 @@ Implementare SVM (Support Vector Machine) pentru clasificare text
 """
 
 import time
-from sklearn.svm import SVC
+import numpy as np
+from sklearn.svm import SVC, LinearSVC
+from sklearn.linear_model import SGDClassifier
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 
+from linear_scoring import LinearOneVsOneSVM
+
 
 class SVMClassifier:
     """Clasificator SVM pentru text"""
     
-    def __init__(self, kernel='linear', C=1.0, max_iter=1000):
+    def __init__(self, kernel='linear', C=1.0, max_iter=1000, engine='svc', alpha=1e-4):
         """
         Initializeaza clasificatorul
         
         Args:
-            kernel: Tipul de kernel ('linear', 'rbf', 'poly')
+            kernel: Tipul de kernel ('linear', 'rbf', 'poly') pentru engine='svc'
             C: Parametru de regularizare
             max_iter: Numarul maxim de iteratii
+            engine: 'svc' (SVC din libsvm, one-vs-one, solver dual cu kernel),
+                    'linear' (LinearSVC din liblinear, one-vs-rest, solver primal) sau
+                    'sgd' (SVM liniar antrenat cu SGD, suporta partial_fit)
+            alpha: Parametru de regularizare pentru engine='sgd'
         """
-        self.model = SVC(kernel=kernel, C=C, max_iter=max_iter, random_state=42)
+        self.engine = engine
+        if engine == 'linear':
+            # Un singur model liniar per clasa; predictia este un produs X * W
+            self.model = LinearSVC(C=C, dual=False, max_iter=max_iter, random_state=42)
+        elif engine == 'sgd':
+            # hinge loss = SVM liniar; antrenabil incremental pe batch-uri
+            self.model = SGDClassifier(loss='hinge', alpha=alpha, max_iter=max_iter, random_state=42)
+        elif engine == 'svc':
+            self.model = SVC(kernel=kernel, C=C, max_iter=max_iter, random_state=42)
+        else:
+            raise ValueError(f"Engine SVM necunoscut: {engine}")
         self.training_time = None
         self.prediction_time = None
     
+    @classmethod
+    def from_model(cls, model):
+        """
+        Construieste wrapper-ul in jurul unui model sklearn deja antrenat (ex: incarcat din .pkl)
+        
+        Args:
+            model: SVC, LinearSVC, SGDClassifier sau LinearOneVsOneSVM antrenat
+            
+        Returns:
+            Instanta wrapper-ului
+        """
+        classifier = cls.__new__(cls)
+        classifier.model = model
+        if hasattr(model, 'support_vectors_') or isinstance(model, LinearOneVsOneSVM):
+            # SVC din .pkl sau redus la ponderile perechilor (din bundle-ul de modele)
+            classifier.engine = 'svc'
+        elif hasattr(model, 'partial_fit'):
+            classifier.engine = 'sgd'
+        else:
+            classifier.engine = 'linear'
+        classifier.training_time = None
+        classifier.prediction_time = None
+        return classifier
+    
+    def describe(self):
+        """Descriere scurta a configuratiei modelului"""
+        if self.engine == 'svc':
+            return f"kernel={self.model.kernel}"
+        return f"engine={self.engine}"
+    
     def train(self, X_train, y_train):
         """
         Antreneaza modelul
@@ -35,7 +83,7 @@ class SVMClassifier:
         Returns:
             self
         """
-        print(f"Antrenare SVM (kernel={self.model.kernel})...")
+        print(f"Antrenare SVM ({self.describe()})...")
         start_time = time.time()
         
         self.model.fit(X_train, y_train)
@@ -45,6 +93,46 @@ class SVMClassifier:
         
         return self
     
+    def partial_fit(self, X_batch, y_batch, classes=None):
+        """
+        Antreneaza incremental modelul pe un batch (doar engine='sgd')
+        
+        Args:
+            X_batch: Features pentru batch-ul curent
+            y_batch: Etichetele batch-ului curent
+            classes: Toate clasele posibile (obligatoriu la primul apel)
+            
+        Returns:
+            self
+        """
+        if not hasattr(self.model, 'partial_fit'):
+            raise ValueError(f"Antrenarea incrementala nu este suportata pentru engine='{self.engine}'")
+        
+        start_time = time.time()
+        
+        self.model.partial_fit(X_batch, y_batch, classes=classes)
+        
+        self.training_time = (self.training_time or 0) + time.time() - start_time
+        
+        return self
+    
+    def decision_scores(self, X):
+        """
+        Scorurile one-vs-rest ale modelelor liniare: un singur produs matrice rara x ponderi dense
+        
+        Args:
+            X: Features (matrice rara)
+            
+        Returns:
+            Matrice (n_documente, n_clase) cu scoruri
+        """
+        coef = self.model.coef_
+        scores = np.asarray(X @ coef.T) + self.model.intercept_
+        if coef.shape[0] == 1:
+            # Caz binar: un singur hiperplan
+            scores = np.hstack([-scores, scores])
+        return scores
+    
     def predict(self, X_test):
         """
         Face predictii
@@ -56,11 +144,81 @@ class SVMClassifier:
             Predictii
         """
         start_time = time.time()
-        predictions = self.model.predict(X_test)
+        if self.engine == 'svc':
+            predictions = self.model.predict(X_test)
+        else:
+            predictions = self.model.classes_[np.argmax(self.decision_scores(X_test), axis=1)]
         self.prediction_time = time.time() - start_time
         
         return predictions
     
+    def predict_with_scores(self, X, return_scores=False):
+        """
+        Eticheta si probabilitatile dintr-o singura evaluare a modelului
+        
+        Args:
+            X: Features
+            return_scores: Pentru engine='svc' fara probabilitati, eticheta se calculeaza din
+                           decision_function (tot o singura evaluare), iar scorurile sunt returnate;
+                           modelele liniare returneaza mereu scorurile
+            
+        Returns:
+            Dictionar cu 'labels', 'probabilities', 'scores' si 'prediction_time' (durata acestui apel)
+            
+            'probabilities' exista doar pentru SVC antrenat cu probability=True (calibrare Platt).
+            Motoarele liniare si SVC simplu nu sunt calibrate: 'probabilities' este None, iar
+            'scores' sunt distante fata de hiperplane, nu probabilitati
+        """
+        start_time = time.time()
+        probabilities = None
+        scores = None
+        if self.engine != 'svc':
+            scores = self.decision_scores(X)
+            labels = self.model.classes_[np.argmax(scores, axis=1)]
+        elif hasattr(self.model, 'predict_proba'):
+            # SVC cu probability=True: calibrarea Platt poate avea alt argmax decat predict
+            labels = self.model.predict(X)
+            probabilities = self.model.predict_proba(X)
+        elif return_scores and self._labels_follow_scores():
+            scores = self.model.decision_function(X)
+            labels = self._labels_from_decision(scores)
+        else:
+            labels = self.model.predict(X)
+        if scores is None and probabilities is None and return_scores:
+            # Doar pentru SVC cu decision_function_shape='ovo' sau break_ties (eticheta vine din predict)
+            scores = self.model.decision_function(X)
+        elapsed = time.time() - start_time
+        
+        return {
+            'labels': labels,
+            'probabilities': probabilities,
+            'scores': scores,
+            'prediction_time': elapsed
+        }
+    
+    def _labels_follow_scores(self):
+        """Daca eticheta lui predict se poate deduce din decision_function (forma 'ovr', vot libsvm)"""
+        return (getattr(self.model, 'decision_function_shape', 'ovr') == 'ovr'
+                and not getattr(self.model, 'break_ties', False))
+    
+    def _labels_from_decision(self, scores):
+        """
+        Etichetele pe care le-ar da predict, din scorurile decision_function ale unui SVC
+        
+        Args:
+            scores: decision_function (n_documente,) in cazul binar sau (n_documente, n_clase)
+            
+        Returns:
+            Etichete
+        """
+        scores = np.asarray(scores)
+        if scores.ndim == 1:
+            # Caz binar: scor pozitiv = classes_[1]; la 0 libsvm voteaza tot classes_[1]
+            return self.model.classes_[(scores >= 0).astype(int)]
+        # Scorurile 'ovr' sunt voturi intregi + incredere in (-1/3, 1/3): rotunjirea da voturile,
+        # iar argmax alege la egalitate clasa cu indexul mai mic, ca votul din predict
+        return self.model.classes_[np.argmax(np.rint(scores), axis=1)]
+    
     def evaluate(self, X_test, y_test):
         """
         Evalueaza modelul
@@ -72,7 +230,9 @@ class SVMClassifier:
         Returns:
             Dictionar cu metrici
         """
-        predictions = self.predict(X_test)
+        scored = self.predict_with_scores(X_test)
+        self.prediction_time = scored['prediction_time']
+        predictions = scored['labels']
         
         accuracy = accuracy_score(y_test, predictions)
         
@@ -82,6 +242,7 @@ class SVMClassifier:
             'training_time': self.training_time,
             'prediction_time': self.prediction_time,
             'predictions': predictions,
+            'probabilities': scored['probabilities'],
             'classification_report': classification_report(y_test, predictions, output_dict=True),
             'confusion_matrix': confusion_matrix(y_test, predictions)
         }
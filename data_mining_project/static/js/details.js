@@ -52,28 +52,34 @@ function displayTrainingInfo(info) {
     document.getElementById('stemming').textContent = info.preprocessing.use_stemming ? 'Da' : 'Nu';
     document.getElementById('stopwords').textContent = info.preprocessing.use_stopwords ? 'Da' : 'Nu';
     
-    // Algorithms
+    // Algorithms (streaming training has no Random Forest and may have no test set)
+    const formatAccuracy = (algo) => algo.accuracy == null ? '-' : `${(algo.accuracy * 100).toFixed(2)}%`;
+    
     const nb = info.algorithms.naive_bayes;
     document.getElementById('nb-training-time').textContent = nb.training_time_formatted;
-    document.getElementById('nb-accuracy').textContent = `${(nb.accuracy * 100).toFixed(2)}%`;
+    document.getElementById('nb-accuracy').textContent = formatAccuracy(nb);
     document.getElementById('nb-params').textContent = `alpha: ${nb.parameters.alpha}`;
     
     const svm = info.algorithms.svm;
     document.getElementById('svm-training-time').textContent = svm.training_time_formatted;
-    document.getElementById('svm-accuracy').textContent = `${(svm.accuracy * 100).toFixed(2)}%`;
-    document.getElementById('svm-params').textContent = `kernel: ${svm.parameters.kernel}, C: ${svm.parameters.C}`;
+    document.getElementById('svm-accuracy').textContent = formatAccuracy(svm);
+    document.getElementById('svm-params').textContent = svm.parameters.kernel
+        ? `kernel: ${svm.parameters.kernel}, C: ${svm.parameters.C}`
+        : Object.entries(svm.parameters).map(([key, value]) => `${key}: ${value}`).join(', ');
     
     const rf = info.algorithms.random_forest;
-    document.getElementById('rf-training-time').textContent = rf.training_time_formatted;
-    document.getElementById('rf-accuracy').textContent = `${(rf.accuracy * 100).toFixed(2)}%`;
-    document.getElementById('rf-params').textContent = `n_estimators: ${rf.parameters.n_estimators}, max_depth: ${rf.parameters.max_depth || 'None'}`;
+    document.getElementById('rf-training-time').textContent = rf ? rf.training_time_formatted : '-';
+    document.getElementById('rf-accuracy').textContent = rf ? formatAccuracy(rf) : '-';
+    document.getElementById('rf-params').textContent = rf
+        ? `n_estimators: ${rf.parameters.n_estimators}, max_depth: ${rf.parameters.max_depth || 'None'}`
+        : 'Neantrenat';
     
     // Summary
     const bestAlgo = info.algorithms[info.summary.best_accuracy_algorithm];
-    document.getElementById('best-accuracy').textContent = `${bestAlgo.name}: ${(bestAlgo.accuracy * 100).toFixed(2)}%`;
+    document.getElementById('best-accuracy').textContent = bestAlgo ? `${bestAlgo.name}: ${formatAccuracy(bestAlgo)}` : '-';
     
     const fastestAlgo = info.algorithms[info.summary.fastest_training_algorithm];
-    document.getElementById('fastest-training').textContent = `${fastestAlgo.name}: ${fastestAlgo.training_time_formatted}`;
+    document.getElementById('fastest-training').textContent = fastestAlgo ? `${fastestAlgo.name}: ${fastestAlgo.training_time_formatted}` : '-';
     
     // Training date
     const date = new Date(info.training_date);
@@ -86,12 +92,14 @@ function displayTrainingInfo(info) {
 function createTrainingTimeChart(algorithms) {
     const ctx = document.getElementById('training-time-chart').getContext('2d');
     
-    const labels = ['Naive Bayes', 'SVM', 'Random Forest'];
-    const times = [
-        algorithms.naive_bayes.training_time,
-        algorithms.svm.training_time,
-        algorithms.random_forest.training_time
-    ];
+    // Only the algorithms that were trained
+    const trained = [
+        ['naive_bayes', 'Naive Bayes', '102, 126, 234'],
+        ['svm', 'SVM', '118, 75, 162'],
+        ['random_forest', 'Random Forest', '52, 152, 219']
+    ].filter(([key]) => algorithms[key]);
+    const labels = trained.map(([, name]) => name);
+    const times = trained.map(([key]) => algorithms[key].training_time);
     
     new Chart(ctx, {
         type: 'bar',
@@ -100,16 +108,8 @@ function createTrainingTimeChart(algorithms) {
             datasets: [{
                 label: 'Timp Antrenare (secunde)',
                 data: times,
-                backgroundColor: [
-                    'rgba(102, 126, 234, 0.8)',
-                    'rgba(118, 75, 162, 0.8)',
-                    'rgba(52, 152, 219, 0.8)'
-                ],
-                borderColor: [
-                    'rgba(102, 126, 234, 1)',
-                    'rgba(118, 75, 162, 1)',
-                    'rgba(52, 152, 219, 1)'
-                ],
+                backgroundColor: trained.map(([, , color]) => `rgba(${color}, 0.8)`),
+                borderColor: trained.map(([, , color]) => `rgba(${color}, 1)`),
                 borderWidth: 2
             }]
         },
@@ -2,6 +2,45 @@ let currentFile = null;
 let fileText = '';
 let charts = {}; // Store chart instances
 
+// Known algorithms (API key -> display name, card prefix, chart color)
+const ALGORITHMS = {
+    naive_bayes: { name: 'Naive Bayes', prefix: 'nb', color: '102, 126, 234' },
+    svm: { name: 'SVM', prefix: 'svm', color: '118, 75, 162' },
+    random_forest: { name: 'Random Forest', prefix: 'rf', color: '52, 152, 219' }
+};
+const FALLBACK_COLOR = '46, 204, 113';
+
+// Models present in a response (selected models may be a subset)
+function getModelKeys(data) {
+    return data.models || Object.keys(data.results || {});
+}
+
+// Known algorithms first, then any other model from the response
+function getRowKeys(modelKeys) {
+    return [...Object.keys(ALGORITHMS), ...modelKeys.filter(key => !(key in ALGORITHMS))];
+}
+
+function getAlgorithmName(key) {
+    return ALGORITHMS[key]?.name || key;
+}
+
+function getAlgorithmColor(key, alpha) {
+    return `rgba(${ALGORITHMS[key]?.color || FALLBACK_COLOR}, ${alpha})`;
+}
+
+// A model result is shown only if the model actually ran (not absent / skipped by the budget)
+function isScored(result) {
+    return !!result && !result.skipped && result.prediction != null;
+}
+
+function formatPercent(value) {
+    return value == null ? '-' : `${(value * 100).toFixed(2)}%`;
+}
+
+function formatMs(value) {
+    return value == null ? '-' : value.toFixed(3);
+}
+
 // History management
 function saveToHistory(data) {
     // Skip if loading from history
@@ -17,27 +56,18 @@ function saveToHistory(data) {
         results: data.results,
         performance: data.performance,
         categoryNames: data.category_names,
+        models: getModelKeys(data),
         // Extract detailed metrics for easy comparison
-        metrics: {
-            naive_bayes: {
-                prediction: data.results.naive_bayes.prediction,
-                confidence: data.results.naive_bayes.confidence,
-                predictionTime: data.results.naive_bayes.prediction_time_ms,
-                probabilities: data.results.naive_bayes.probabilities
-            },
-            svm: {
-                prediction: data.results.svm.prediction,
-                confidence: data.results.svm.confidence,
-                predictionTime: data.results.svm.prediction_time_ms,
-                probabilities: data.results.svm.probabilities
-            },
-            random_forest: {
-                prediction: data.results.random_forest.prediction,
-                confidence: data.results.random_forest.confidence,
-                predictionTime: data.results.random_forest.prediction_time_ms,
-                probabilities: data.results.random_forest.probabilities
-            }
-        },
+        metrics: Object.fromEntries(getModelKeys(data).map(key => {
+            const result = data.results[key] || {};
+            return [key, {
+                prediction: result.prediction,
+                confidence: result.confidence,
+                predictionTime: result.prediction_time_ms,
+                probabilities: result.probabilities,
+                skipped: !!result.skipped
+            }];
+        })),
         performanceMetrics: {
             preprocessingTime: data.performance.preprocessing_time,
             vectorizationTime: data.performance.vectorization_time,
@@ -70,11 +100,8 @@ function loadHistory() {
     }
     
     historyList.innerHTML = history.map(item => {
-        const metrics = item.metrics || {
-            naive_bayes: item.results.naive_bayes,
-            svm: item.results.svm,
-            random_forest: item.results.random_forest
-        };
+        const metrics = item.metrics || item.results || {};
+        const rowKeys = getRowKeys(Object.keys(metrics));
         
         // Get top 3 probabilities for each algorithm
         const getTopProbs = (probs) => {
@@ -85,15 +112,13 @@ function loadHistory() {
                 .join(', ');
         };
         
-        // Check if algorithms agree
-        const predictions = [
-            metrics.naive_bayes.prediction,
-            metrics.svm.prediction,
-            metrics.random_forest.prediction
-        ];
-        const allAgree = predictions[0] === predictions[1] && predictions[1] === predictions[2];
-        const twoAgree = predictions.filter(p => p === predictions[0]).length === 2 || 
-                         predictions.filter(p => p === predictions[1]).length === 2;
+        // Check if algorithms agree (only models that actually ran)
+        const predictions = rowKeys
+            .filter(key => isScored(metrics[key]))
+            .map(key => metrics[key].prediction);
+        const compared = predictions.length > 1;
+        const allAgree = compared && predictions.every(p => p === predictions[0]);
+        const twoAgree = compared && predictions.some((p, idx) => predictions.indexOf(p) !== idx);
         
         return `
         <div class="history-item" onclick="showHistoryItem(${item.id})">
@@ -102,7 +127,7 @@ function loadHistory() {
                 <div class="history-badges">
                     ${allAgree ? '<span class="history-badge badge-agree"><i class="fas fa-check-circle"></i> Acord total</span>' : ''}
                     ${twoAgree && !allAgree ? '<span class="history-badge badge-partial"><i class="fas fa-exclamation-circle"></i> Acord parțial</span>' : ''}
-                    ${!allAgree && !twoAgree ? '<span class="history-badge badge-disagree"><i class="fas fa-times-circle"></i> Discrepanțe</span>' : ''}
+                    ${compared && !allAgree && !twoAgree ? '<span class="history-badge badge-disagree"><i class="fas fa-times-circle"></i> Discrepanțe</span>' : ''}
                 </div>
                 <button class="delete-history-btn" onclick="deleteHistoryItem(${item.id}, event)" title="Șterge">
                     <i class="fas fa-times"></i>
@@ -126,27 +151,19 @@ function loadHistory() {
                             </tr>
                         </thead>
                         <tbody>
+                            ${rowKeys.map(key => {
+                                const metric = metrics[key];
+                                const result = item.results?.[key];
+                                const scored = isScored(metric);
+                                return `
                             <tr>
-                                <td><strong>Naive Bayes</strong></td>
-                                <td>${metrics.naive_bayes.prediction}</td>
-                                <td>${(metrics.naive_bayes.confidence * 100).toFixed(2)}%</td>
-                                <td>${metrics.naive_bayes.predictionTime?.toFixed(3) || (item.results?.naive_bayes?.prediction_time_ms?.toFixed(3) || '-')}</td>
-                                <td class="history-probs">${getTopProbs(metrics.naive_bayes.probabilities || item.results?.naive_bayes?.probabilities || {})}</td>
-                            </tr>
-                            <tr>
-                                <td><strong>SVM</strong></td>
-                                <td>${metrics.svm.prediction}</td>
-                                <td>${(metrics.svm.confidence * 100).toFixed(2)}%</td>
-                                <td>${metrics.svm.predictionTime?.toFixed(3) || (item.results?.svm?.prediction_time_ms?.toFixed(3) || '-')}</td>
-                                <td class="history-probs">${getTopProbs(metrics.svm.probabilities || item.results?.svm?.probabilities || {})}</td>
-                            </tr>
-                            <tr>
-                                <td><strong>Random Forest</strong></td>
-                                <td>${metrics.random_forest.prediction}</td>
-                                <td>${(metrics.random_forest.confidence * 100).toFixed(2)}%</td>
-                                <td>${metrics.random_forest.predictionTime?.toFixed(3) || (item.results?.random_forest?.prediction_time_ms?.toFixed(3) || '-')}</td>
-                                <td class="history-probs">${getTopProbs(metrics.random_forest.probabilities || item.results?.random_forest?.probabilities || {})}</td>
-                            </tr>
+                                <td><strong>${getAlgorithmName(key)}</strong></td>
+                                <td>${scored ? metric.prediction : '-'}</td>
+                                <td>${scored ? formatPercent(metric.confidence) : '-'}</td>
+                                <td>${scored ? formatMs(metric.predictionTime ?? result?.prediction_time_ms) : '-'}</td>
+                                <td class="history-probs">${scored ? getTopProbs(metric.probabilities || result?.probabilities) : '-'}</td>
+                            </tr>`;
+                            }).join('')}
                         </tbody>
                     </table>
                 </div>
@@ -337,7 +354,7 @@ function displayResults(data) {
         textPreview.classList.add('hidden');
     }
     
-    const results = data.results;
+    const results = data.results || {};
     const categoryNames = data.category_names || [];
     const performance = data.performance || {};
     
@@ -347,9 +364,9 @@ function displayResults(data) {
     }
     
     // Display results for each algorithm
-    displayAlgorithmResult('naive_bayes', 'nb', results.naive_bayes, categoryNames);
-    displayAlgorithmResult('svm', 'svm', results.svm, categoryNames);
-    displayAlgorithmResult('random_forest', 'rf', results.random_forest, categoryNames);
+    Object.entries(ALGORITHMS).forEach(([key, algorithm]) => {
+        displayAlgorithmResult(key, algorithm.prefix, results[key], categoryNames);
+    });
     
     // Display comparison table
     displayComparison(results, categoryNames);
@@ -366,6 +383,19 @@ function displayResults(data) {
 
 // Display algorithm result
 function displayAlgorithmResult(algorithmName, prefix, result, categoryNames) {
+    const probabilitiesDiv = document.getElementById(`${prefix}-probabilities`);
+    
+    // Model not selected or skipped by the latency budget
+    if (!isScored(result)) {
+        document.getElementById(`${prefix}-prediction`).textContent = '-';
+        document.getElementById(`${prefix}-confidence`).style.width = '0%';
+        document.getElementById(`${prefix}-confidence-text`).textContent = '-';
+        probabilitiesDiv.innerHTML = result?.skipped
+            ? '<div style="font-size: 0.85em; color: #888;">Sărit (buget de latență)</div>'
+            : '';
+        return;
+    }
+    
     // Prediction
     document.getElementById(`${prefix}-prediction`).textContent = result.prediction;
     
@@ -375,7 +405,6 @@ function displayAlgorithmResult(algorithmName, prefix, result, categoryNames) {
     document.getElementById(`${prefix}-confidence-text`).textContent = `${confidence}%`;
     
     // Probabilities
-    const probabilitiesDiv = document.getElementById(`${prefix}-probabilities`);
     probabilitiesDiv.innerHTML = '<div style="font-size: 0.85em; color: #888; margin-bottom: 8px;">Probabilități:</div>';
     
     // Sort probabilities
@@ -409,24 +438,17 @@ function displayComparison(results, categoryNames) {
             </tr>
         </thead>
         <tbody>
+            ${getRowKeys(Object.keys(results)).map(key => {
+                const result = results[key];
+                const scored = isScored(result);
+                return `
             <tr>
-                <td><strong>Naive Bayes</strong></td>
-                <td>${results.naive_bayes.prediction}</td>
-                <td>${(results.naive_bayes.confidence * 100).toFixed(2)}%</td>
-                <td>${results.naive_bayes.prediction_time_ms.toFixed(3)} ms</td>
-            </tr>
-            <tr>
-                <td><strong>SVM</strong></td>
-                <td>${results.svm.prediction}</td>
-                <td>${(results.svm.confidence * 100).toFixed(2)}%</td>
-                <td>${results.svm.prediction_time_ms.toFixed(3)} ms</td>
-            </tr>
-            <tr>
-                <td><strong>Random Forest</strong></td>
-                <td>${results.random_forest.prediction}</td>
-                <td>${(results.random_forest.confidence * 100).toFixed(2)}%</td>
-                <td>${results.random_forest.prediction_time_ms.toFixed(3)} ms</td>
-            </tr>
+                <td><strong>${getAlgorithmName(key)}</strong></td>
+                <td>${scored ? result.prediction : '-'}</td>
+                <td>${scored ? formatPercent(result.confidence) : '-'}</td>
+                <td>${scored ? `${formatMs(result.prediction_time_ms)} ms` : '-'}</td>
+            </tr>`;
+            }).join('')}
         </tbody>
     `;
     
@@ -461,13 +483,9 @@ function createCharts(results, performance) {
     });
     charts = {};
     
-    const algorithmNames = ['Naive Bayes', 'SVM', 'Random Forest'];
-    const algorithmKeys = ['naive_bayes', 'svm', 'random_forest'];
-    const colors = {
-        'naive_bayes': 'rgba(102, 126, 234, 0.8)',
-        'svm': 'rgba(118, 75, 162, 0.8)',
-        'random_forest': 'rgba(52, 152, 219, 0.8)'
-    };
+    // Only models that actually ran
+    const algorithmKeys = Object.keys(results).filter(key => isScored(results[key]));
+    const algorithmNames = algorithmKeys.map(getAlgorithmName);
     
     // Speed Chart
     const speedCtx = document.getElementById('speed-chart').getContext('2d');
@@ -482,16 +500,8 @@ function createCharts(results, performance) {
             datasets: [{
                 label: 'Timp Predicție (ms)',
                 data: speedData,
-                backgroundColor: [
-                    colors.naive_bayes,
-                    colors.svm,
-                    colors.random_forest
-                ],
-                borderColor: [
-                    'rgba(102, 126, 234, 1)',
-                    'rgba(118, 75, 162, 1)',
-                    'rgba(52, 152, 219, 1)'
-                ],
+                backgroundColor: algorithmKeys.map(key => getAlgorithmColor(key, 0.8)),
+                borderColor: algorithmKeys.map(key => getAlgorithmColor(key, 1)),
                 borderWidth: 2
             }]
         },
@@ -533,16 +543,8 @@ function createCharts(results, performance) {
             datasets: [{
                 label: 'Încredere (%)',
                 data: confidenceData,
-                backgroundColor: [
-                    colors.naive_bayes,
-                    colors.svm,
-                    colors.random_forest
-                ],
-                borderColor: [
-                    'rgba(102, 126, 234, 1)',
-                    'rgba(118, 75, 162, 1)',
-                    'rgba(52, 152, 219, 1)'
-                ],
+                backgroundColor: algorithmKeys.map(key => getAlgorithmColor(key, 0.8)),
+                borderColor: algorithmKeys.map(key => getAlgorithmColor(key, 1)),
                 borderWidth: 2
             }]
         },
@@ -638,8 +640,8 @@ function createCharts(results, performance) {
                         parseFloat(confidenceData[idx]),
                         parseFloat(confidenceData[idx]) // Using confidence as precision proxy
                     ],
-                    backgroundColor: Object.values(colors)[idx].replace('0.8', '0.2'),
-                    borderColor: Object.values(colors)[idx].replace('0.8', '1'),
+                    backgroundColor: getAlgorithmColor(key, 0.2),
+                    borderColor: getAlgorithmColor(key, 1),
                     borderWidth: 2
                 };
             })
@@ -662,33 +664,28 @@ function displayDetailedStats(results, performance) {
     const statsDiv = document.getElementById('detailed-stats');
     statsDiv.innerHTML = '';
     
-    const algorithmNames = {
-        'naive_bayes': 'Naive Bayes',
-        'svm': 'SVM',
-        'random_forest': 'Random Forest'
-    };
-    
     Object.entries(results).forEach(([key, result]) => {
         const statCard = document.createElement('div');
         statCard.className = 'stat-card';
+        const scored = isScored(result);
         
-        const topProbs = Object.entries(result.probabilities)
+        const topProbs = Object.entries(scored ? result.probabilities || {} : {})
             .sort((a, b) => b[1] - a[1])
             .slice(0, 3);
         
         statCard.innerHTML = `
-            <h4>${algorithmNames[key]}</h4>
+            <h4>${getAlgorithmName(key)}</h4>
             <div class="stat-item">
                 <span class="stat-item-label">Categorie Prezisă:</span>
-                <span class="stat-item-value">${result.prediction}</span>
+                <span class="stat-item-value">${scored ? result.prediction : '-'}</span>
             </div>
             <div class="stat-item">
                 <span class="stat-item-label">Încredere:</span>
-                <span class="stat-item-value">${(result.confidence * 100).toFixed(2)}%</span>
+                <span class="stat-item-value">${scored ? formatPercent(result.confidence) : '-'}</span>
             </div>
             <div class="stat-item">
                 <span class="stat-item-label">Timp Predicție:</span>
-                <span class="stat-item-value">${result.prediction_time_ms.toFixed(3)} ms</span>
+                <span class="stat-item-value">${scored ? `${formatMs(result.prediction_time_ms)} ms` : '-'}</span>
             </div>
             <div class="stat-item">
                 <span class="stat-item-label">Top 3 Probabilități:</span>
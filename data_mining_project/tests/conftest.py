@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Modulele din src/ se importa dupa nume, ca in app.py si train_models.py
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [PROJECT_DIR, os.path.join(PROJECT_DIR, 'src')]
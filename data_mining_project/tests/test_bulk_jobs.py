@@ -0,0 +1,175 @@
+"""
+Joburi de clasificare in masa: reluare de la checkpoint, rezultate, oprire si stergerea joburilor vechi
+"""
+
+import csv
+import io
+import json
+import os
+import tarfile
+import time
+import zipfile
+
+import pytest
+
+from bulk_jobs import (JobRunner, RESULTS_FILE, UPLOADS_DIR, cancel_job, create_job, iter_job_results, job_status,
+                       list_jobs, new_upload_path, prune_jobs)
+
+
+TEXTS = {f'docs/{i:04d}.txt': f'text {i}' for i in range(1000)}
+TEXTS['docs/big.txt'] = 'x' * 200
+
+
+def fake_batch(members, models):
+    """Clasificare falsa: predictia este textul cu majuscule"""
+    results = []
+    for index, name, data in members:
+        if data is None:
+            results.append({'index': index, 'name': name, 'error': 'Document prea mare'})
+        else:
+            text = data.decode('utf-8')
+            results.append({'index': index, 'name': name, 'results': {
+                model: {'prediction': text.upper(), 'confidence': 1.0} for model in models}})
+    return results, 'v1'
+
+
+class Interrupt(BaseException):
+    """Simuleaza oprirea procesului in mijlocul unui job"""
+
+
+def write_archive(jobs_dir, fmt, texts):
+    upload_path = new_upload_path(jobs_dir)
+    if fmt == 'zip':
+        with zipfile.ZipFile(upload_path, 'w') as archive:
+            for name, text in texts.items():
+                archive.writestr(name, text)
+            archive.writestr('__MACOSX/._0001.txt', 'x')
+            archive.writestr('docs/image.png', 'x')
+    else:
+        with tarfile.open(upload_path, 'w:gz') as archive:
+            for name, text in texts.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(text)
+                archive.addfile(info, io.BytesIO(text.encode('utf-8')))
+    return upload_path
+
+
+def submit(jobs_dir, texts, fmt='zip'):
+    return create_job(jobs_dir, write_archive(jobs_dir, fmt, texts), f'docs.{fmt}', ['nb'], {'txt'},
+                      max_member_bytes=100)
+
+
+def archive_files(jobs_dir, job_id):
+    return [name for name in os.listdir(os.path.join(jobs_dir, job_id)) if name.startswith('archive.')]
+
+
+@pytest.fixture
+def jobs_dir(tmp_path):
+    path = tmp_path / 'jobs'
+    path.mkdir()
+    return str(path)
+
+
+@pytest.mark.parametrize('fmt', ['zip', 'tar'])
+def test_interrupted_job_resumes_from_checkpoint(jobs_dir, fmt):
+    job = submit(jobs_dir, TEXTS, fmt)
+    assert job['status'] == 'queued' and job['total'] == 1001
+
+    # Oprire dupa 3 batch-uri, cu un batch scris pe jumatate dupa ultimul checkpoint
+    calls = []
+
+    def crashing_batch(members, models):
+        calls.append(1)
+        if len(calls) > 3:
+            with open(os.path.join(jobs_dir, job['id'], RESULTS_FILE), 'ab') as f:
+                f.write(b'{"index": 99')
+            raise Interrupt()
+        return fake_batch(members, models)
+
+    with pytest.raises(Interrupt):
+        JobRunner(jobs_dir, crashing_batch, workers=1, batch_size=100).run_job(job['id'])
+    status = job_status(jobs_dir, job['id'])
+    assert status['status'] == 'running' and 0 < status['processed'] < 1001
+    assert archive_files(jobs_dir, job['id'])
+
+    JobRunner(jobs_dir, fake_batch, workers=2, batch_size=64).run_pending()
+    status = job_status(jobs_dir, job['id'])
+    assert status['status'] == 'completed'
+    assert status['processed'] == 1001 and status['errors'] == 1
+
+    items = [json.loads(line) for line in ''.join(iter_job_results(jobs_dir, job['id'])).splitlines()]
+    assert [item['index'] for item in items] == list(range(1001))
+    assert [item['name'] for item in items] == list(TEXTS)
+    csv_rows = list(csv.reader(io.StringIO(''.join(iter_job_results(jobs_dir, job['id'], 'csv')))))
+    assert csv_rows[0] == ['index', 'name', 'nb_prediction', 'nb_confidence', 'error']
+    assert len(csv_rows) == 1002
+    assert csv_rows[-1][-1] == 'Document prea mare'
+
+    # Arhiva nu mai este necesara, rezultatele raman
+    assert archive_files(jobs_dir, job['id']) == []
+
+
+def test_invalid_archive_is_rejected(jobs_dir):
+    bad_path = new_upload_path(jobs_dir)
+    with open(bad_path, 'wb') as f:
+        f.write(b'not an archive')
+    with pytest.raises(ValueError):
+        create_job(jobs_dir, bad_path, 'bad.zip', ['nb'], {'txt'}, 100)
+    assert not os.path.exists(bad_path)
+    assert list_jobs(jobs_dir) == []
+
+
+def test_cancelled_job_removes_archive(jobs_dir):
+    job = submit(jobs_dir, {'a.txt': 'text'})
+    cancel_job(jobs_dir, job['id'])
+    JobRunner(jobs_dir, fake_batch).run_pending()
+    status = job_status(jobs_dir, job['id'])
+    assert status['status'] == 'cancelled' and status['processed'] == 0
+    assert archive_files(jobs_dir, job['id']) == []
+
+
+def test_failed_job_removes_archive(jobs_dir):
+    def failing_batch(members, models):
+        raise RuntimeError('modele indisponibile')
+
+    job = submit(jobs_dir, {'a.txt': 'text'})
+    JobRunner(jobs_dir, failing_batch).run_pending()
+    status = job_status(jobs_dir, job['id'])
+    assert status['status'] == 'failed' and status['error'] == 'modele indisponibile'
+    assert archive_files(jobs_dir, job['id']) == []
+
+
+def test_prune_removes_only_expired_finished_jobs(jobs_dir):
+    old_job = submit(jobs_dir, {'a.txt': 'text'})
+    queued_job = submit(jobs_dir, {'b.txt': 'text'})
+    JobRunner(jobs_dir, fake_batch).run_job(old_job['id'])
+    abandoned_upload = new_upload_path(jobs_dir)
+    open(abandoned_upload, 'wb').close()
+
+    # Nimic nu a expirat inca
+    assert prune_jobs(jobs_dir, retention_seconds=3600) == 0
+    assert len(list_jobs(jobs_dir)) == 2
+
+    expired = time.time() - 7200
+    os.utime(abandoned_upload, (expired, expired))
+    job_path = os.path.join(jobs_dir, old_job['id'], 'job.json')
+    with open(job_path, 'r', encoding='utf-8') as f:
+        job = json.load(f)
+    job['finished_at'] = expired
+    with open(job_path, 'w', encoding='utf-8') as f:
+        json.dump(job, f)
+
+    assert prune_jobs(jobs_dir, retention_seconds=3600) == 1
+    assert job_status(jobs_dir, old_job['id']) is None
+    assert [job['id'] for job in list_jobs(jobs_dir)] == [queued_job['id']]
+    assert os.listdir(os.path.join(jobs_dir, UPLOADS_DIR)) == []
+    assert not os.path.exists(os.path.join(jobs_dir, old_job['id']))
+
+
+def test_runner_prunes_with_retention(jobs_dir):
+    job = submit(jobs_dir, {'a.txt': 'text'})
+    JobRunner(jobs_dir, fake_batch, retention_seconds=3600).run_pending()
+    assert job_status(jobs_dir, job['id'])['status'] == 'completed'
+
+    JobRunner(jobs_dir, fake_batch, retention_seconds=0).run_pending()
+    assert list_jobs(jobs_dir) == []
@@ -0,0 +1,88 @@
+"""
+Modelele incarcate la prima folosire: erori de incarcare, reincercare si raspunsul aplicatiei
+"""
+
+import pytest
+from sklearn.naive_bayes import MultinomialNB
+
+import app as web_app
+import inference_pipeline
+from inference_pipeline import InferencePipeline, ModelsUnavailableError
+from prediction_cache import PredictionCache
+from preprocessing import TextPreprocessor, build_vectorizer
+
+
+CATEGORY_NAMES = ['sci.space', 'rec.sport.hockey']
+TEXTS = ['rocket orbit launch mission', 'hockey goal players season',
+         'rocket shuttle orbit astronauts', 'hockey skating goal playoffs']
+
+
+class FlakyLoader:
+    """Loader care esueaza de `failures` ori (ex: disc indisponibil), apoi intoarce modelul"""
+
+    def __init__(self, model, failures):
+        self.model = model
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise OSError('disc indisponibil')
+        return self.model
+
+
+def build_pipeline(failures):
+    preprocessor = TextPreprocessor()
+    vectorizer = build_vectorizer('count', max_features=100, token_stream=True)
+    vectorizer.min_df = 1
+    X = vectorizer.fit_transform([preprocessor.tokenize(text) for text in TEXTS])
+    loader = FlakyLoader(MultinomialNB().fit(X, [0, 1, 0, 1]), failures)
+    pipeline = InferencePipeline(vectorizer, {}, CATEGORY_NAMES, preprocessor=preprocessor,
+                                 version='test', model_loaders={'naive_bayes': loader})
+    return pipeline, loader
+
+
+def test_predict_raises_when_no_requested_model_loads():
+    pipeline, _ = build_pipeline(failures=1)
+    with pytest.raises(ModelsUnavailableError, match='disc indisponibil'):
+        pipeline.predict('rocket orbit', models=['naive_bayes'])
+    with pytest.raises(ModelsUnavailableError):
+        pipeline.predict_cascade('rocket orbit')
+    # Modelul ramane selectabil pentru cererile urmatoare
+    assert pipeline.available_models == ['naive_bayes']
+
+
+def test_failed_load_is_retried_after_interval(monkeypatch):
+    pipeline, loader = build_pipeline(failures=1)
+    with pytest.raises(ModelsUnavailableError):
+        pipeline.predict('rocket orbit')
+    # In intervalul de reincercare loader-ul nu este apelat din nou
+    with pytest.raises(ModelsUnavailableError):
+        pipeline.predict('rocket orbit')
+    assert loader.calls == 1
+
+    monkeypatch.setattr(inference_pipeline, 'LOAD_RETRY_INTERVAL', 0.0)
+    results, _ = pipeline.predict('rocket orbit')
+    assert results['naive_bayes']['prediction_original'] == 'sci.space'
+    assert loader.calls == 2
+    assert pipeline.load_errors == {}
+
+
+def test_predict_response_is_503_and_not_cached(monkeypatch):
+    pipeline, loader = build_pipeline(failures=1)
+    monkeypatch.setattr(web_app, 'pipeline', pipeline)
+    monkeypatch.setattr(web_app, 'micro_batcher', None)
+    monkeypatch.setattr(web_app, 'prediction_cache', PredictionCache())
+    monkeypatch.setitem(web_app.app.config, 'PREDICTION_BUDGET_MS', None)
+    request = {'text': 'rocket orbit', 'models': ['naive_bayes']}
+
+    payload, status = web_app.predict_response(request)
+    assert status == 503
+    assert 'success' not in payload
+
+    monkeypatch.setattr(inference_pipeline, 'LOAD_RETRY_INTERVAL', 0.0)
+    payload, status = web_app.predict_response(request)
+    assert status == 200
+    assert payload['models'] == ['naive_bayes']
+    assert payload['performance']['cache'] == 'miss'
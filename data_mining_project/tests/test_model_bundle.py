@@ -0,0 +1,69 @@
+"""
+Versiunile bundle-urilor si stergerea celor vechi (fara a afecta procesele care inca incarca modele din ele)
+"""
+
+import gc
+import os
+
+from sklearn.naive_bayes import MultinomialNB
+
+from preprocessing import TextPreprocessor, build_vectorizer
+from model_bundle import KEEP_BUNDLES, current_bundle_dir, load_bundle, read_manifest, write_bundle
+
+
+CATEGORY_NAMES = ['sci.space', 'rec.sport.hockey']
+
+
+def write_version(bundles_dir, seed, metadata=None):
+    """Un bundle mic; seed-ul schimba datele, deci si versiunea"""
+    preprocessor = TextPreprocessor()
+    texts = [f'rocket orbit launch topic{seed} mission', f'hockey goal players topic{seed} season',
+             f'rocket shuttle orbit topic{seed}', f'hockey skating goal topic{seed}']
+    vectorizer = build_vectorizer('count', max_features=100, token_stream=True)
+    vectorizer.min_df = 1
+    X = vectorizer.fit_transform([preprocessor.tokenize(text) for text in texts])
+    model = MultinomialNB().fit(X, [0, 1, 0, 1])
+    return write_bundle(bundles_dir, vectorizer, {'naive_bayes': model}, CATEGORY_NAMES,
+                        metadata=metadata, preprocessor_settings=preprocessor.settings(),
+                        stop_words=preprocessor.stop_words)
+
+
+def test_same_content_gives_same_version(tmp_path):
+    bundles_dir = str(tmp_path)
+    assert write_version(bundles_dir, seed=0) == write_version(bundles_dir, seed=0)
+
+
+def test_new_metadata_gives_new_version(tmp_path):
+    bundles_dir = str(tmp_path)
+    # Acelasi antrenament determinist, dar praguri reglate diferit
+    first_dir = write_version(bundles_dir, seed=0, metadata={'cascade_thresholds': {'naive_bayes': 0.5}})
+    second_dir = write_version(bundles_dir, seed=0, metadata={'cascade_thresholds': {'naive_bayes': 0.7}})
+    assert second_dir != first_dir
+    assert current_bundle_dir(bundles_dir) == second_dir
+    assert read_manifest(second_dir)['metadata']['cascade_thresholds'] == {'naive_bayes': 0.7}
+
+
+def test_prune_keeps_bundle_with_pending_lazy_loads(tmp_path):
+    bundles_dir = str(tmp_path)
+    old_dir = write_version(bundles_dir, seed=0)
+    # Ca build_pipeline: modelele se incarca abia la prima folosire
+    bundle = load_bundle(old_dir, mmap=True, verify=True, models=[])
+
+    for seed in range(1, KEEP_BUNDLES + 2):
+        write_version(bundles_dir, seed)
+    assert current_bundle_dir(bundles_dir) != old_dir
+    assert os.path.isdir(old_dir)
+    assert bundle.load_model('naive_bayes') is not None
+
+    # Fara referinte, bundle-ul este sters la urmatoarea scriere
+    del bundle
+    gc.collect()
+    write_version(bundles_dir, KEEP_BUNDLES + 2)
+    assert not os.path.isdir(old_dir)
+
+
+def test_prune_keeps_only_recent_unused_bundles(tmp_path):
+    bundles_dir = str(tmp_path)
+    written = [write_version(bundles_dir, seed) for seed in range(KEEP_BUNDLES + 2)]
+    remaining = [path for path in written if os.path.isdir(path)]
+    assert remaining == written[-KEEP_BUNDLES:]
@@ -0,0 +1,172 @@
+"""
+Paritate intre runtime-ul doar NumPy (numpy_runtime.py) si InferencePipeline (sklearn),
+pe bundle-uri mici antrenate pe date sintetice
+"""
+
+import random
+
+import pytest
+from nltk.stem import PorterStemmer
+
+from preprocessing import TextPreprocessor, build_vectorizer, build_token_table
+from naive_bayes import NaiveBayesClassifier
+from svm_classifier import SVMClassifier
+from random_forest import RandomForestTextClassifier
+from model_bundle import write_bundle, load_bundle
+from inference_pipeline import InferencePipeline
+from numpy_runtime import NumpyRuntime
+from porter_stemmer import porter_stem
+
+
+CATEGORY_NAMES = ['sci.space', 'rec.sport.hockey', 'sci.med']
+TOPIC_WORDS = [
+    'rocket rockets launched launching orbit orbital shuttle astronauts nasa satellites mission planets'.split(),
+    'hockey players skated skating goal goals scored season playoffs teams coach penalty'.split(),
+    'doctors patients medicine treatment treated disease clinical symptoms diagnosis hospitals drugs'.split(),
+]
+COMMON_WORDS = 'the and a of is was were this that with new many people running years 2024 3d'.split()
+
+# Texte goale, fara tokeni utili, in afara vocabularului sau amestecate
+EDGE_TEXTS = [
+    '',
+    '   ',
+    '!!! ??? ...',
+    'the and a of',
+    'Zyxwvut qqqq unseen tokens everywhere, runners ran',
+    'The rocket players met the doctors; a goal was scored in orbit!',
+]
+
+# (vectorizer, use_idf, svm_engine, n_classes)
+BUNDLE_CONFIGS = [
+    ('tfidf', False, 'svc', 3),
+    ('tfidf', False, 'linear', 3),
+    ('hashing', False, 'svc', 3),
+    ('hashing', True, 'linear', 3),
+    # Cazul binar: SVC are un singur hiperplan, cu semnul inversat fata de conventia libsvm
+    ('tfidf', False, 'svc', 2),
+]
+
+
+def make_corpus(n_per_class, seed, n_classes=len(TOPIC_WORDS)):
+    """Documente sintetice: cuvinte specifice categoriei plus cuvinte comune"""
+    rng = random.Random(seed)
+    texts, labels = [], []
+    for label, words in enumerate(TOPIC_WORDS[:n_classes]):
+        for _ in range(n_per_class):
+            tokens = rng.choices(words, k=12) + rng.choices(COMMON_WORDS, k=6)
+            rng.shuffle(tokens)
+            texts.append(' '.join(tokens).capitalize() + '.')
+            labels.append(label)
+    return texts, labels
+
+
+def train_bundle(bundles_dir, vectorizer_type, use_idf, svm_engine, n_classes):
+    """Antreneaza NB, SVM si RF pe corpusul sintetic si scrie bundle-ul (ca train_models.py)"""
+    texts, labels = make_corpus(n_per_class=30, seed=0, n_classes=n_classes)
+    preprocessor = TextPreprocessor(use_stemming=True, use_stopwords=True)
+    vectorizer = build_vectorizer(vectorizer_type, max_features=500, token_stream=True,
+                                  n_features=2 ** 12, use_idf=use_idf)
+    X = vectorizer.fit_transform([preprocessor.tokenize(text) for text in texts])
+
+    nb_classifier = NaiveBayesClassifier(alpha=1.0)
+    nb_classifier.train(X, labels)
+    svm_classifier = SVMClassifier(kernel='linear', C=1.0, max_iter=2000, engine=svm_engine)
+    svm_classifier.train(X, labels)
+    rf_classifier = RandomForestTextClassifier(n_estimators=10, max_depth=None, random_state=42)
+    rf_classifier.train(X, labels)
+
+    token_table = build_token_table(texts, preprocessor, vocabulary=getattr(vectorizer, 'vocabulary_', None))
+    return write_bundle(
+        bundles_dir,
+        vectorizer,
+        {
+            'naive_bayes': nb_classifier.model,
+            'svm': svm_classifier.model,
+            'random_forest': rf_classifier.to_compact()
+        },
+        CATEGORY_NAMES[:n_classes],
+        token_table=token_table,
+        preprocessor_settings=preprocessor.settings(),
+        stop_words=preprocessor.stop_words
+    )
+
+
+@pytest.fixture(scope='module', params=BUNDLE_CONFIGS, ids=['-'.join(map(str, c)) for c in BUNDLE_CONFIGS])
+def bundle_pair(request, tmp_path_factory):
+    """(InferencePipeline, NumpyRuntime) incarcate din acelasi bundle"""
+    bundle_dir = train_bundle(str(tmp_path_factory.mktemp('bundles')), *request.param)
+    bundle = load_bundle(bundle_dir, mmap=True, verify=True)
+    pipeline = InferencePipeline(
+        bundle.vectorizer,
+        bundle.models,
+        bundle.category_names,
+        preprocessor=TextPreprocessor(use_stemming=True, use_stopwords=True, token_table=bundle.token_table),
+        version=bundle.version
+    )
+    runtime = NumpyRuntime.from_bundle(bundle_dir, mmap=True, verify=True)
+    return pipeline, runtime, request.param[-1]
+
+
+def assert_same_results(expected, actual):
+    """Aceleasi modele, predictii si probabilitati (timpii difera)"""
+    assert list(actual) == list(expected)
+    for name, expected_result in expected.items():
+        actual_result = actual[name]
+        for key in ('prediction', 'prediction_original', 'prediction_id'):
+            assert actual_result[key] == expected_result[key], (name, key)
+        assert actual_result['probabilities'].keys() == expected_result['probabilities'].keys(), name
+        for category, probability in expected_result['probabilities'].items():
+            assert actual_result['probabilities'][category] == pytest.approx(probability, abs=1e-12), name
+        assert actual_result['confidence'] == pytest.approx(expected_result['confidence'], abs=1e-12), name
+
+
+@pytest.mark.parametrize('text', EDGE_TEXTS)
+def test_predict_matches_pipeline_on_edge_texts(bundle_pair, text):
+    pipeline, runtime, _ = bundle_pair
+    expected, _ = pipeline.predict(text)
+    actual, _ = runtime.predict(text)
+    assert_same_results(expected, actual)
+
+
+def test_predict_matches_pipeline_on_unseen_documents(bundle_pair):
+    pipeline, runtime, n_classes = bundle_pair
+    texts, labels = make_corpus(n_per_class=10, seed=1, n_classes=n_classes)
+    for text, label in zip(texts, labels):
+        expected, _ = pipeline.predict(text)
+        actual, _ = runtime.predict(text)
+        assert_same_results(expected, actual)
+        # Pe corpusul sintetic fiecare model trebuie sa gaseasca categoria corecta
+        for name, result in expected.items():
+            assert result['prediction_id'] == label, (name, text)
+
+
+def test_preprocess_matches_pipeline(bundle_pair):
+    pipeline, runtime, _ = bundle_pair
+    for text in EDGE_TEXTS + make_corpus(n_per_class=2, seed=2)[0]:
+        assert runtime.preprocess(text) == pipeline.preprocessor.tokenize(text)
+
+
+def test_predict_model_selection(bundle_pair):
+    pipeline, runtime, _ = bundle_pair
+    text = EDGE_TEXTS[-1]
+    expected, _ = pipeline.predict(text)
+    actual, _ = runtime.predict(text, models=['random_forest', 'naive_bayes'])
+    assert list(actual) == ['naive_bayes', 'random_forest']
+    assert_same_results({name: expected[name] for name in actual}, actual)
+
+
+def test_porter_stem_matches_nltk():
+    rng = random.Random(0)
+    words = {word for topic in TOPIC_WORDS for word in topic} | set(COMMON_WORDS)
+    words |= set('''caresses ponies ties cats agreed plastered motoring sing conflated sized hopping
+        tanned falling fizzed failing filing happy sky skies dying relational conditional valenci
+        digitizer radicalli vietnamization operator feudalism decisiveness hopefulness formaliti
+        sensibiliti triplicate electrical allowance adjustable irritant adoption homologou communism
+        bowdlerize controll generously spied enjoyment as is by yyyy syzygy innings news succeeded'''.split())
+    # Cuvinte aleatoare (inclusiv cu 'y' si consoane duble)
+    words |= {''.join(rng.choices('aeiouybcdlnrstz', k=rng.randint(1, 12))) for _ in range(5000)}
+
+    stemmer = PorterStemmer()
+    mismatches = [(word, porter_stem(word), stemmer.stem(word)) for word in sorted(words)
+                  if porter_stem(word) != stemmer.stem(word)]
+    assert not mismatches, mismatches[:20]
@@ -0,0 +1,49 @@
+"""
+Echivalenta intre vectorizarea pe tokeni (token_stream=True) si vectorizarea textului unit
+"""
+
+import numpy as np
+import pytest
+
+from preprocessing import TextPreprocessor, build_vectorizer
+
+
+SAMPLE_CORPUS = [
+    "Space rockets are launched into orbit by the agency.",
+    "The hockey players skated; a goal was scored in overtime!",
+    "Rockets, orbit and launch windows: the agency plans a new mission.",
+    "Doctors treat patients; the medicine works in 2 weeks.",
+    "The players and the doctors met at the hockey arena.",
+    "A x y z 1 2 3 graphics cards render 3D images quickly.",
+    "Graphics rendering uses the cards' memory and 3D pipelines.",
+]
+
+
+@pytest.fixture(scope='module')
+def preprocessor():
+    return TextPreprocessor()
+
+
+@pytest.mark.parametrize('vectorizer_type', ['tfidf', 'count'])
+def test_token_stream_matches_string_path(preprocessor, vectorizer_type):
+    string_vectorizer = build_vectorizer(vectorizer_type, max_features=50, token_stream=False)
+    token_vectorizer = build_vectorizer(vectorizer_type, max_features=50, token_stream=True)
+
+    X_string = string_vectorizer.fit_transform([preprocessor.preprocess_text(t) for t in SAMPLE_CORPUS])
+    X_tokens = token_vectorizer.fit_transform([preprocessor.tokenize(t) for t in SAMPLE_CORPUS])
+
+    assert token_vectorizer.vocabulary_ == string_vectorizer.vocabulary_
+    assert X_tokens.shape == X_string.shape
+    np.testing.assert_array_equal(X_tokens.toarray(), X_string.toarray())
+
+    # Textele noi (cu tokeni necunoscuti) sunt transformate la fel
+    unseen = ["Unseen words: zyxwvut rockets and doctors", ""]
+    np.testing.assert_array_equal(
+        token_vectorizer.transform([preprocessor.tokenize(t) for t in unseen]).toarray(),
+        string_vectorizer.transform([preprocessor.preprocess_text(t) for t in unseen]).toarray()
+    )
+
+
+def test_preprocess_text_joins_tokens(preprocessor):
+    for text in SAMPLE_CORPUS:
+        assert preprocessor.preprocess_text(text) == ' '.join(preprocessor.tokenize(text))
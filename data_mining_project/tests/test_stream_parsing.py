@@ -0,0 +1,68 @@
+"""
+Parsarea incrementala a fisierelor CSV / JSON / NDJSON: rezultatul nu depinde de unde sunt taiate bucatile
+"""
+
+import json
+
+import pytest
+
+from stream_parsing import RowStreamParser, detect_format, iter_stream_rows
+
+
+CSV_DATA = 'id,text,label\r\n1,"Rocket, launch ""today""",sci\r\n\r\n2,"multi\nline ș text",x\n3,,y\n4,last'.encode('utf-8')
+EXPECTED_CSV = [(0, 'Rocket, launch "today"', '1', None), (1, 'multi\nline ș text', '2', None),
+                (2, None, '3', 'Text gol sau invalid'), (3, 'last', '4', None)]
+
+JSON_ITEMS = ['plain text', {'id': 7, 'text': 'obiect {cu} "ghilimele" ]'}, {'text': ''}, 'ș']
+EXPECTED_JSON = [(0, 'plain text', None, None), (1, 'obiect {cu} "ghilimele" ]', 7, None),
+                 (2, None, None, 'Text gol sau invalid'), (3, 'ș', None, None)]
+
+
+def parse_all(data, fmt, chunk_size, **kwargs):
+    parser = RowStreamParser(fmt, **kwargs)
+    chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+    return [(row.index, row.text, row.id, row.error) for row in iter_stream_rows(chunks, parser)]
+
+
+def test_csv_rows_for_every_chunk_size():
+    for size in range(1, len(CSV_DATA) + 1):
+        assert parse_all(CSV_DATA, 'csv', size) == EXPECTED_CSV, size
+
+
+def test_csv_first_column_is_the_text_by_default():
+    assert parse_all(b'body\nfirst\nsecond\n', 'csv', 3) == [(0, 'first', None, None), (1, 'second', None, None)]
+
+
+@pytest.mark.parametrize('data', [json.dumps(JSON_ITEMS).encode('utf-8'),
+                                  json.dumps({'texts': JSON_ITEMS}, indent=2).encode('utf-8')],
+                         ids=['list', 'texts-object'])
+def test_json_rows_for_every_chunk_size(data):
+    for size in range(1, len(data) + 1):
+        assert parse_all(data, 'json', size) == EXPECTED_JSON, size
+
+
+def test_ndjson_invalid_line_becomes_row_error():
+    data = ('\n'.join(json.dumps(item) for item in JSON_ITEMS) + '\n{broken\n').encode('utf-8')
+    for size in range(1, len(data) + 1):
+        rows = parse_all(data, 'ndjson', size)
+        assert rows[:4] == EXPECTED_JSON, size
+        assert rows[4][3].startswith('JSON invalid'), size
+
+
+@pytest.mark.parametrize('data', [b'[1, 2]', b'"text"', b'["unterminated', b'{"other": []}'])
+def test_invalid_json_document_raises(data):
+    with pytest.raises(ValueError):
+        parse_all(data, 'json', 4)
+
+
+def test_record_size_is_limited():
+    with pytest.raises(ValueError):
+        parse_all(b'text\n"' + b'x' * 100, 'csv', 7, max_record_bytes=50)
+
+
+def test_detect_format():
+    assert detect_format(mimetype='text/csv') == 'csv'
+    assert detect_format('jsonl') == 'ndjson'
+    assert detect_format(filename='rows.json') == 'json'
+    with pytest.raises(ValueError):
+        detect_format('xml')
@@ -5,22 +5,84 @@ Script pentru antrenarea si salvarea modelelor pentru UI
 
 import os
 import sys
+import argparse
 import json
 import pickle
+import shutil
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from sklearn.model_selection import train_test_split
 
 # Adauga directorul src la path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from preprocessing import prepare_data_for_training
+from preprocessing import TextPreprocessor, prepare_data_for_training, build_token_table, build_vectorizer
+from streaming import train_streaming
 from naive_bayes import NaiveBayesClassifier
 from svm_classifier import SVMClassifier
 from random_forest import RandomForestTextClassifier
+from cascade import collect_stage_outputs, simulate_cascade, tune_cascade_thresholds
+from evaluation import measure_prediction_latency
+from model_bundle import write_bundle
 
 
-def train_and_save_models():
-    """Antreneaza si salveaza modelele"""
+# Etichete afisate in training_info pentru fiecare tip de vectorizer
+VECTORIZER_LABELS = {
+    'tfidf': 'TF-IDF',
+    'count': 'Count',
+    'hashing': 'Hashing'
+}
+
+
+def save_model_bundle(models_dir, vectorizer, models, preprocessor, token_table=None, metadata=None):
+    """
+    Scrie bundle-ul versionat (manifest + vectori .npy) citit de UI
+    
+    Args:
+        models_dir: Directorul cu modele
+        vectorizer: Vectorizer-ul antrenat
+        models: Dictionar {nume_algoritm: model antrenat}
+        preprocessor: TextPreprocessor-ul folosit la antrenare (setari si stop words)
+        token_table: TokenTable (optional)
+        metadata: Informatii suplimentare pentru manifest
+        
+    Returns:
+        Calea catre bundle
+    """
+    mapping_path = os.path.join(os.path.dirname(__file__), 'data', 'processed', 'category_mapping.json')
+    with open(mapping_path, 'r', encoding='utf-8') as f:
+        category_mapping = json.load(f)
+    id_to_name = {v: k for k, v in category_mapping.items()}
+    category_names = [id_to_name[i] for i in sorted(id_to_name.keys())]
+    
+    bundle_dir = write_bundle(
+        os.path.join(models_dir, 'bundles'),
+        vectorizer,
+        models,
+        category_names,
+        token_table=token_table,
+        metadata=metadata,
+        preprocessor_settings=preprocessor.settings(),
+        stop_words=preprocessor.stop_words if preprocessor.use_stopwords else None
+    )
+    print(f"Bundle de modele salvat: {bundle_dir}")
+    return bundle_dir
+
+
+def train_and_save_models(vectorizer_type='tfidf', max_features=10000, n_features=2 ** 18, use_idf=False,
+                          svm_engine='svc', validation_size=0.1):
+    """
+    Antreneaza si salveaza modelele
+    
+    Args:
+        vectorizer_type: 'tfidf', 'count' sau 'hashing'
+        max_features: Numarul maxim de features (tfidf/count)
+        n_features: Numarul de features pentru 'hashing'
+        use_idf: Reponderare IDF pentru 'hashing'
+        svm_engine: 'svc' (SVC kernel liniar, one-vs-one) sau 'linear' (LinearSVC primal, one-vs-rest)
+        validation_size: Fractiunea din datele de antrenare pastrata pentru pragurile cascadei
+    """
     print("="*80)
     print("ANTRENARE MODELE PENTRU UI")
     print("="*80)
@@ -52,9 +114,22 @@ def train_and_save_models():
         label_column='category_id',
         test_size=0.2,
         random_state=42,
-        vectorizer_type='tfidf',
-        max_features=10000
+        vectorizer_type=vectorizer_type,
+        max_features=max_features,
+        token_stream=True,
+        n_jobs=-1,  # preprocesare in paralel pe toate core-urile
+        dataset_path=dataset_path,
+        cache_dir=os.path.join(base_dir, 'data', 'cache'),
+        n_features=n_features,
+        use_idf=use_idf
+    )
+    
+    # Pragurile cascadei se aleg pe o parte separata din datele de antrenare: alese pe setul de test,
+    # acuratetea raportata pentru cascada ar fi optimista
+    X_train, X_val, y_train, y_val = train_test_split(
+        X_train, y_train, test_size=validation_size, random_state=42, stratify=y_train
     )
+    print(f"Antrenare: {X_train.shape[0]} documente, validare (praguri cascada): {X_val.shape[0]}")
     
     # Antreneaza modelele
     print("\n" + "="*80)
@@ -70,7 +145,7 @@ def train_and_save_models():
     
     # 2. SVM
     print("\n2. SVM...")
-    svm_classifier = SVMClassifier(kernel='linear', C=1.0, max_iter=2000)
+    svm_classifier = SVMClassifier(kernel='linear', C=1.0, max_iter=2000, engine=svm_engine)
     svm_classifier.train(X_train, y_train)
     svm_accuracy = svm_classifier.model.score(X_test, y_test)
     print(f"   Accuracy: {svm_accuracy:.4f}")
@@ -93,6 +168,18 @@ def train_and_save_models():
         pickle.dump(vectorizer, f)
     print(f"Vectorizer salvat: {vectorizer_path}")
     
+    # Salveaza tabela token brut -> stem (evita stemming-ul la inferenta)
+    preprocessor = TextPreprocessor(use_stemming=True, use_stopwords=True)
+    token_table = build_token_table(
+        df['text'],
+        preprocessor,
+        vocabulary=getattr(vectorizer, 'vocabulary_', None)  # vectorizer-ul hashing nu are vocabular
+    )
+    token_table_path = os.path.join(models_dir, 'token_table.pkl')
+    with open(token_table_path, 'wb') as f:
+        pickle.dump(token_table, f)
+    print(f"Tabela de tokeni salvata: {token_table_path} ({len(token_table)} tokeni)")
+    
     # Salveaza Naive Bayes
     nb_path = os.path.join(models_dir, 'naive_bayes.pkl')
     with open(nb_path, 'wb') as f:
@@ -111,6 +198,28 @@ def train_and_save_models():
         pickle.dump(rf_classifier.model, f)
     print(f"Random Forest salvat: {rf_path}")
     
+    # Exporta Random Forest in format compact (vectori .npy, memory-mappable)
+    rf_compact_dir = os.path.join(models_dir, 'random_forest_compact')
+    rf_classifier.to_compact().save(rf_compact_dir)
+    print(f"Random Forest compact salvat: {rf_compact_dir}")
+    
+    # Ajusteaza pragurile cascadei (NB -> SVM -> RF) pe setul de validare, le evalueaza pe setul de test
+    print("\n" + "="*80)
+    print("CASCADA: ACURATETE VS. LATENTA")
+    print("="*80)
+    cascade_info = tune_cascade(
+        {
+            'naive_bayes': nb_classifier,
+            'svm': svm_classifier,
+            # Latenta RF se masoara pe motorul compact, cel folosit de UI
+            'random_forest': RandomForestTextClassifier.from_model(rf_classifier.to_compact())
+        },
+        X_val,
+        y_val,
+        X_test,
+        y_test
+    )
+    
     # Salveaza informatii despre antrenare
     training_info = {
         'training_date': datetime.now().isoformat(),
@@ -119,14 +228,15 @@ def train_and_save_models():
             'path': dataset_path,
             'total_documents': len(df),
             'train_documents': X_train.shape[0],
+            'validation_documents': X_val.shape[0],
             'test_documents': X_test.shape[0],
             'categories': sorted(df['category_name'].unique().tolist()),
             'num_categories': len(df['category_name'].unique()),
             'features': X_train.shape[1]
         },
         'preprocessing': {
-            'vectorizer_type': 'TF-IDF',
-            'max_features': 10000,
+            'vectorizer_type': VECTORIZER_LABELS[vectorizer_type] + (' + IDF' if vectorizer_type == 'hashing' and use_idf else ''),
+            'max_features': n_features if vectorizer_type == 'hashing' else max_features,
             'ngram_range': '(1, 2)',
             'use_stemming': True,
             'use_stopwords': True
@@ -141,8 +251,8 @@ def train_and_save_models():
                 'test_accuracy': float(nb_classifier.model.score(X_test, y_test))
             },
             'svm': {
-                'name': 'Support Vector Machine (SVM)',
-                'parameters': {'kernel': 'linear', 'C': 1.0, 'max_iter': 2000},
+                'name': 'Support Vector Machine (SVM)' if svm_engine == 'svc' else 'Linear SVM (one-vs-rest)',
+                'parameters': {'engine': svm_engine, 'kernel': 'linear', 'C': 1.0, 'max_iter': 2000},
                 'training_time': float(svm_classifier.training_time),
                 'training_time_formatted': f"{svm_classifier.training_time:.6f}s",
                 'accuracy': float(svm_accuracy),
@@ -150,7 +260,7 @@ def train_and_save_models():
             },
             'random_forest': {
                 'name': 'Random Forest',
-                'parameters': {'n_estimators': 100, 'max_depth': None, 'random_state': 42},
+                'parameters': {'n_estimators': 100, 'max_depth': None, 'random_state': 42, 'inference_n_jobs': 1},
                 'training_time': float(rf_classifier.training_time),
                 'training_time_formatted': f"{rf_classifier.training_time:.6f}s",
                 'accuracy': float(rf_accuracy),
@@ -160,7 +270,8 @@ def train_and_save_models():
         'summary': {
             'best_accuracy_algorithm': 'naive_bayes' if nb_accuracy >= max(svm_accuracy, rf_accuracy) else ('svm' if svm_accuracy >= rf_accuracy else 'random_forest'),
             'fastest_training_algorithm': 'naive_bayes' if nb_classifier.training_time <= min(svm_classifier.training_time, rf_classifier.training_time) else ('svm' if svm_classifier.training_time <= rf_classifier.training_time else 'random_forest')
-        }
+        },
+        'cascade': cascade_info
     }
     
     info_path = os.path.join(models_dir, 'training_info.json')
@@ -168,6 +279,26 @@ def train_and_save_models():
         json.dump(training_info, f, indent=2, ensure_ascii=False)
     print(f"Informatii antrenare salvate: {info_path}")
     
+    # Bundle versionat: acelasi continut, fara pickle, incarcat cu memory mapping de UI.
+    # Scris ultimul: comutarea CURRENT anunta serverele (reincarcare automata) ca setul este complet
+    save_model_bundle(
+        models_dir,
+        vectorizer,
+        {
+            'naive_bayes': nb_classifier.model,
+            'svm': svm_classifier.model,
+            'random_forest': rf_classifier.to_compact()
+        },
+        preprocessor,
+        token_table=token_table,
+        metadata={
+            'training_mode': 'batch',
+            'vectorizer_type': vectorizer_type,
+            'svm_engine': svm_engine,
+            'cascade_thresholds': cascade_info['thresholds']
+        }
+    )
+    
     print("\n" + "="*80)
     print("MODELE ANTRENATE SI SALVATE CU SUCCES!")
     print("="*80)
@@ -178,6 +309,231 @@ def train_and_save_models():
     return True
 
 
+def tune_cascade(classifiers, X_val, y_val, X_test, y_test, tolerance=0.005):
+    """
+    Alege pragurile cascadei pe setul de validare, le evalueaza pe setul de test
+    si afiseaza compromisul acuratete/latenta
+    
+    Args:
+        classifiers: Dictionar {nume: wrapper antrenat}, in ordinea cascadei
+        X_val: Features de validare (nefolosite la antrenare)
+        y_val: Etichete de validare
+        X_test: Features de test
+        y_test: Etichete de test
+        tolerance: Pierderea de acuratete acceptata fata de cea mai buna configuratie
+        
+    Returns:
+        Dictionar pentru training_info['cascade']
+    """
+    # Latenta per document (predictie individuala, ca in UI)
+    stage_latency_ms = {
+        name: measure_prediction_latency(classifier, X_val, n_single=50)['single_document_ms']
+        for name, classifier in classifiers.items()
+    }
+    stage_outputs = collect_stage_outputs(classifiers, X_val)
+    tuning = tune_cascade_thresholds(stage_outputs, y_val, stage_latency_ms, tolerance=tolerance)
+    
+    # Acuratetea raportata vine din documente nefolosite nici la antrenare, nici la alegerea pragurilor
+    test_labels, test_latency, test_fractions = simulate_cascade(
+        collect_stage_outputs(classifiers, X_test), tuning['thresholds'], stage_latency_ms
+    )
+    test_accuracy = float((test_labels == np.asarray(y_test)).mean())
+    
+    all_models_latency = sum(stage_latency_ms.values())
+    print("Compromisuri pe setul de validare:")
+    print(f"{'Praguri (NB / SVM)':<24} {'Accuracy':>10} {'Latenta (ms)':>14} {'Ajung la SVM':>14} {'Ajung la RF':>13}")
+    for tradeoff in tuning['pareto_frontier']:
+        thresholds = tradeoff['thresholds']
+        fractions = tradeoff['stage_fractions']
+        print(f"{thresholds.get('naive_bayes', 0):>10.4f} / {thresholds.get('svm', 0):<11.4f} "
+              f"{tradeoff['accuracy']:>10.4f} {tradeoff['expected_latency_ms']:>14.3f} "
+              f"{fractions.get('svm', 0):>13.1%} {fractions.get('random_forest', 0):>13.1%}")
+    print(f"\nToate modelele: {all_models_latency:.3f}ms per document")
+    print(f"Praguri alese: {tuning['thresholds']} -> accuracy pe validare {tuning['accuracy']:.4f} "
+          f"(cea mai buna: {tuning['best_accuracy']:.4f}), {tuning['expected_latency_ms']:.3f}ms per document")
+    print(f"Pe setul de test: accuracy {test_accuracy:.4f}, {test_latency:.3f}ms per document")
+    
+    return {
+        'thresholds': tuning['thresholds'],
+        'accuracy': test_accuracy,
+        'expected_latency_ms': test_latency,
+        'stage_fractions': test_fractions,
+        'validation_accuracy': tuning['accuracy'],
+        'best_accuracy': tuning['best_accuracy'],
+        'tolerance': tolerance,
+        'validation_expected_latency_ms': tuning['expected_latency_ms'],
+        'all_models_latency_ms': all_models_latency,
+        'stage_latency_ms': stage_latency_ms,
+        'validation_stage_fractions': tuning['stage_fractions'],
+        'pareto_frontier': tuning['pareto_frontier']
+    }
+
+
+def train_and_save_models_streaming(n_features=2 ** 18, chunksize=5000, alpha=1e-4):
+    """
+    Antreneaza si salveaza modelele citind dataset-ul pe bucati (out-of-core)
+    Foloseste vectorizer hashing (fara stare) si modele cu partial_fit: Naive Bayes si SVM liniar (SGD)
+    
+    Args:
+        n_features: Numarul de features pentru vectorizer-ul hashing
+        chunksize: Numarul de randuri citite odata din CSV
+        alpha: Parametru de regularizare pentru SVM-ul SGD
+    """
+    print("="*80)
+    print("ANTRENARE STREAMING (OUT-OF-CORE)")
+    print("="*80)
+    
+    base_dir = os.path.dirname(__file__)
+    dataset_path = os.path.join(base_dir, 'data', 'processed', 'selected_6categories_dataset.csv')
+    mapping_path = os.path.join(base_dir, 'data', 'processed', 'category_mapping.json')
+    models_dir = os.path.join(base_dir, 'models')
+    
+    if not os.path.exists(dataset_path) or not os.path.exists(mapping_path):
+        print(f"Eroare: Dataset-ul sau mapping-ul categoriilor nu exista in {os.path.dirname(dataset_path)}")
+        print("\nRuleaza mai intai:")
+        print("   python3 scripts/select_categories.py")
+        return False
+    
+    os.makedirs(models_dir, exist_ok=True)
+    
+    # Clasele trebuie cunoscute dinainte pentru partial_fit
+    with open(mapping_path, 'r', encoding='utf-8') as f:
+        category_mapping = json.load(f)
+    classes = sorted(category_mapping.values())
+    
+    preprocessor = TextPreprocessor(use_stemming=True, use_stopwords=True)
+    vectorizer = build_vectorizer('hashing', token_stream=True, n_features=n_features)
+    nb_classifier = NaiveBayesClassifier(alpha=1.0)
+    svm_classifier = SVMClassifier(engine='sgd', alpha=alpha)
+    
+    print(f"\nAntrenare pe bucati de {chunksize} documente...")
+    stats = train_streaming(
+        dataset_path,
+        {'naive_bayes': nb_classifier, 'svm': svm_classifier},
+        vectorizer,
+        preprocessor,
+        classes,
+        chunksize=chunksize,
+        test_size=0.2,
+        token_stream=True
+    )
+    
+    for name, algo_stats in stats['algorithms'].items():
+        # Fara documente de test (dataset foarte mic) acuratetea este None
+        accuracy = algo_stats['accuracy']
+        accuracy_text = f"{accuracy:.4f}" if accuracy is not None else 'n/a (fara set de test)'
+        print(f"   {name}: accuracy {accuracy_text}, antrenare {algo_stats['training_time']:.6f}s")
+    
+    # Salveaza modelele
+    for filename, obj in (('vectorizer.pkl', vectorizer),
+                          ('naive_bayes.pkl', nb_classifier.model),
+                          ('svm.pkl', svm_classifier.model)):
+        path = os.path.join(models_dir, filename)
+        with open(path, 'wb') as f:
+            pickle.dump(obj, f)
+        print(f"Salvat: {path}")
+    
+    # Random Forest nu suporta antrenare incrementala; artefactele vechi nu mai corespund vectorizer-ului
+    for stale_file in ('random_forest.pkl', 'token_table.pkl', 'random_forest_compact'):
+        stale_path = os.path.join(models_dir, stale_file)
+        if os.path.isdir(stale_path):
+            shutil.rmtree(stale_path)
+            print(f"Sters (incompatibil cu noul vectorizer): {stale_path}")
+        elif os.path.exists(stale_path):
+            os.remove(stale_path)
+            print(f"Sters (incompatibil cu noul vectorizer): {stale_path}")
+    
+    nb_stats = stats['algorithms']['naive_bayes']
+    svm_stats = stats['algorithms']['svm']
+    accuracies = {name: algo_stats['accuracy'] for name, algo_stats in stats['algorithms'].items()
+                  if algo_stats['accuracy'] is not None}
+    training_info = {
+        'training_date': datetime.now().isoformat(),
+        'training_mode': 'streaming',
+        'dataset': {
+            'name': '20 Newsgroups (Selected Categories)',
+            'path': dataset_path,
+            'total_documents': stats['train_documents'] + stats['test_documents'],
+            'train_documents': stats['train_documents'],
+            'test_documents': stats['test_documents'],
+            'categories': sorted(category_mapping.keys()),
+            'num_categories': len(category_mapping),
+            'features': n_features
+        },
+        'preprocessing': {
+            'vectorizer_type': VECTORIZER_LABELS['hashing'],
+            'max_features': n_features,
+            'ngram_range': '(1, 2)',
+            'use_stemming': True,
+            'use_stopwords': True,
+            'chunksize': chunksize
+        },
+        'algorithms': {
+            'naive_bayes': {
+                'name': 'Naive Bayes (MultinomialNB, partial_fit)',
+                'parameters': {'alpha': 1.0},
+                'training_time': nb_stats['training_time'],
+                'training_time_formatted': f"{nb_stats['training_time']:.6f}s",
+                'accuracy': nb_stats['accuracy'],
+                'test_accuracy': nb_stats['accuracy']
+            },
+            'svm': {
+                'name': 'SVM liniar (SGD, partial_fit)',
+                'parameters': {'engine': 'sgd', 'loss': 'hinge', 'alpha': alpha},
+                'training_time': svm_stats['training_time'],
+                'training_time_formatted': f"{svm_stats['training_time']:.6f}s",
+                'accuracy': svm_stats['accuracy'],
+                'test_accuracy': svm_stats['accuracy']
+            }
+        },
+        'summary': {
+            'best_accuracy_algorithm': max(accuracies, key=accuracies.get) if accuracies else None,
+            'fastest_training_algorithm': 'naive_bayes' if nb_stats['training_time'] <= svm_stats['training_time'] else 'svm'
+        }
+    }
+    
+    info_path = os.path.join(models_dir, 'training_info.json')
+    with open(info_path, 'w', encoding='utf-8') as f:
+        json.dump(training_info, f, indent=2, ensure_ascii=False)
+    print(f"Informatii antrenare salvate: {info_path}")
+    
+    save_model_bundle(
+        models_dir,
+        vectorizer,
+        {'naive_bayes': nb_classifier.model, 'svm': svm_classifier.model},
+        preprocessor,
+        metadata={'training_mode': 'streaming', 'vectorizer_type': 'hashing', 'svm_engine': 'sgd'}
+    )
+    
+    return True
+
+
 if __name__ == "__main__":
-    train_and_save_models()
+    parser = argparse.ArgumentParser(description='Antreneaza si salveaza modelele pentru UI')
+    parser.add_argument('--vectorizer', choices=sorted(VECTORIZER_LABELS), default='tfidf',
+                        help='Tipul de vectorizer (implicit: tfidf)')
+    parser.add_argument('--max-features', type=int, default=10000,
+                        help='Numarul maxim de features pentru tfidf/count')
+    parser.add_argument('--n-features', type=int, default=2 ** 18,
+                        help='Numarul de features pentru vectorizer-ul hashing')
+    parser.add_argument('--hashing-idf', action='store_true',
+                        help='Reponderare IDF peste features-urile hashing')
+    parser.add_argument('--svm-engine', choices=['svc', 'linear'], default='svc',
+                        help='svc = SVC kernel liniar (one-vs-one); linear = LinearSVC primal (one-vs-rest)')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Antrenare out-of-core: CSV citit pe bucati, vectorizer hashing, modele cu partial_fit')
+    parser.add_argument('--chunksize', type=int, default=5000,
+                        help='Numarul de randuri citite odata in modul streaming')
+    args = parser.parse_args()
+    
+    if args.streaming:
+        train_and_save_models_streaming(n_features=args.n_features, chunksize=args.chunksize)
+    else:
+        train_and_save_models(
+            vectorizer_type=args.vectorizer,
+            max_features=args.max_features,
+            n_features=args.n_features,
+            use_idf=args.hashing_idf,
+            svm_engine=args.svm_engine
+        )
 